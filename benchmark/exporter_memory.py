@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Peak memory benchmark for the records exporter.
+
+Builds a ``records-json.tar.gz`` archive from synthetic records the same way
+``zenodo_rdm.exporter.tasks.export_records`` does, once into an in-memory
+``BytesIO`` buffer and once into a ``SpooledTemporaryFile``. Every run happens in
+a fresh process so that the reported peak RSS is not polluted by previous runs.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/exporter_memory.py --records 10000 50000 100000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import string
+import sys
+import tarfile
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+
+def _synthetic_record(idx, rand):
+    # Random text keeps gzip from compressing the payload down to nothing.
+    description = "".join(rand.choices(string.ascii_letters + " ", k=4000))
+    return {
+        "id": f"{idx:08d}",
+        "pids": {"doi": {"identifier": f"10.5281/zenodo.{idx}"}},
+        "metadata": {"title": f"Record {idx}", "description": description},
+    }
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def _run(mode, num_records, queue):
+    rand = random.Random(42)
+    if mode == "bytesio":
+        stream = BytesIO()
+    else:
+        stream = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    with tarfile.open(fileobj=stream, mode="w|gz") as records_file:
+        for idx in range(num_records):
+            content_bytes = json.dumps(_synthetic_record(idx, rand)).encode()
+            tar_info = tarfile.TarInfo(f"{idx:08d}.json")
+            tar_info.size = len(content_bytes)
+            records_file.addfile(tar_info, fileobj=BytesIO(content_bytes))
+
+    size = stream.seek(0, os.SEEK_END)
+    stream.close()
+    queue.put((size, _peak_rss_mb()))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[10_000, 50_000, 100_000]
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["bytesio", "spooled"],
+        default=["bytesio", "spooled"],
+    )
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'mode':<10}{'records':>10}{'archive MB':>14}{'peak RSS MB':>14}")
+    for mode in args.modes:
+        for num_records in args.records:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run, args=(mode, num_records, queue))
+            proc.start()
+            size, peak = queue.get()
+            proc.join()
+            print(f"{mode:<10}{num_records:>10}{size / 1024**2:>14.1f}{peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
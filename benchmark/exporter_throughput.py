@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Serialization throughput benchmark for the records exporter.
+
+Feeds synthetic record dumps through the exporter's serialization stage and
+writes them to a ``tar.gz`` archive, reporting records/s for each format and
+number of serialization workers. XML serialization needs the vocabularies of a
+local instance, so run it where ``invenio_app`` can create an application.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/exporter_throughput.py --records 5000 --workers 0 4 8
+"""
+
+import argparse
+import tarfile
+import time
+from io import BytesIO
+from tempfile import TemporaryFile
+
+from invenio_app.factory import create_api
+
+from zenodo_rdm.exporter.tasks import _iter_serialized
+
+
+def _synthetic_record(idx):
+    return {
+        "id": f"bench-{idx:08d}",
+        "created": "2025-01-01T00:00:00+00:00",
+        "updated": "2025-01-01T00:00:00+00:00",
+        "pids": {
+            "doi": {
+                "identifier": f"10.5281/zenodo.{idx}",
+                "provider": "datacite",
+                "client": "datacite",
+            },
+        },
+        "parent": {"id": f"bench-parent-{idx:08d}"},
+        "metadata": {
+            "resource_type": {"id": "publication-article"},
+            "title": f"Benchmark record {idx}",
+            "description": "Lorem ipsum dolor sit amet. " * 50,
+            "publication_date": "2025-01-01",
+            "publisher": "Zenodo",
+            "creators": [
+                {
+                    "person_or_org": {
+                        "type": "personal",
+                        "name": f"Doe, Jane {n}",
+                        "given_name": f"Jane {n}",
+                        "family_name": "Doe",
+                    },
+                }
+                for n in range(10)
+            ],
+            "subjects": [{"subject": f"keyword {n}"} for n in range(10)],
+        },
+        "access": {"record": "public", "files": "public"},
+    }
+
+
+def _run(format, num_records):
+    records = (_synthetic_record(idx) for idx in range(num_records))
+    start = time.perf_counter()
+    with (
+        TemporaryFile() as stream,
+        tarfile.open(fileobj=stream, mode="w|gz") as records_file,
+    ):
+        for record_id, content_bytes in _iter_serialized(format, records):
+            if content_bytes is None:
+                continue
+            tar_info = tarfile.TarInfo(f"{record_id}.{format}")
+            tar_info.size = len(content_bytes)
+            records_file.addfile(tar_info, fileobj=BytesIO(content_bytes))
+    return num_records / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5_000)
+    parser.add_argument("--formats", nargs="+", default=["json", "xml"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4, 8])
+    args = parser.parse_args()
+
+    app = create_api()
+    print(f"{'format':<8}{'workers':>8}{'records/s':>12}")
+    with app.app_context():
+        for format in args.formats:
+            # The worker count only applies to XML serialization
+            for workers in args.workers if format == "xml" else [0]:
+                app.config["EXPORTER_SERIALIZATION_WORKERS"] = workers
+                throughput = _run(format, args.records)
+                print(f"{format:<8}{workers:>8}{throughput:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Offline benchmark suite of the IIIF serving path.
+
+Measures the latency and throughput of the IIIF endpoints of a local instance,
+on a record of synthetic images, so that runs of different releases can be
+compared. It has three steps:
+
+``setup``
+    Generates synthetic pyramidal TIFFs, publishes them in a record of the local
+    instance, waits for their tiles and saves the record's IIIF manifest in a
+    fixture file (and, with ``--manifest``, in a file for the ``iiif.py`` locust
+    file, e.g. ``benchmark/manifest.json``).
+
+``run``
+    Requests tiles, thumbnails, ``info.json``, the manifest and the simple
+    previewer of the fixture's images from a pool of threads, and writes the
+    p50/p95/p99 latencies and throughput of each kind of URL to a JSON file.
+
+``compare``
+    Compares two results files, and fails if a p95 latency regressed by more
+    than a threshold.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/iiif_suite.py setup --sizes 2000 8000
+    python benchmark/iiif_suite.py run --output results-v13.json
+    python benchmark/iiif_suite.py compare results-v12.json results-v13.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+import requests
+import urllib3
+
+CUR_DIR = Path(__file__).parent
+DEFAULT_FIXTURE = CUR_DIR / "iiif_fixture.json"
+DEFAULT_BASE_URL = "https://127.0.0.1:5000"
+
+SCENARIOS = ["tile", "thumbnail", "info_json", "manifest", "previewer"]
+
+
+#
+# Setup
+#
+def _generate_images(directory, sizes, seed):
+    """Generate one pyramidal TIFF per size, returning their paths and sizes."""
+    import pyvips
+
+    images = []
+    for i, size in enumerate(sizes):
+        # Noise is the worst case for the JPEG compression of the tiles
+        image = pyvips.Image.gaussnoise(size, size, mean=128, sigma=40, seed=seed + i)
+        image = image.cast("uchar")
+        image = image.bandjoin([image, image]).copy(interpretation="srgb")
+        path = Path(directory) / f"benchmark-{size}.tif"
+        image.tiffsave(str(path), tile=True, pyramid=True, compression="jpeg", Q=90)
+        images.append({"key": path.name, "path": str(path), "size": size})
+    return images
+
+
+def _publish_record(images):
+    """Publish a public record with the images, as the system identity."""
+    from invenio_access.permissions import system_identity
+    from invenio_rdm_records.proxies import current_rdm_records_service as service
+
+    data = {
+        "access": {"record": "public", "files": "public"},
+        "files": {"enabled": True},
+        "metadata": {
+            "title": "IIIF benchmark images",
+            "resource_type": {"id": "image-photo"},
+            "publication_date": "2025-01-01",
+            "publisher": "Zenodo",
+            "creators": [
+                {
+                    "person_or_org": {
+                        "type": "personal",
+                        "given_name": "IIIF",
+                        "family_name": "Benchmark",
+                    }
+                }
+            ],
+        },
+    }
+    draft = service.create(system_identity, data)
+    files_service = service.draft_files
+    files_service.init_files(
+        system_identity, draft.id, [{"key": image["key"]} for image in images]
+    )
+    for image in images:
+        with open(image["path"], "rb") as fp:
+            files_service.set_file_content(system_identity, draft.id, image["key"], fp)
+        files_service.commit_file(system_identity, draft.id, image["key"])
+    return service.publish(system_identity, draft.id)
+
+
+def _wait_for_tiles(recid, keys, timeout):
+    """Wait until the ``.ptif`` media files of the record are finished."""
+    from invenio_db import db
+    from invenio_rdm_records.proxies import current_rdm_records_service as service
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        record = service.record_cls.pid.resolve(recid)
+        statuses = {
+            key: (record.media_files.get(f"{key}.ptif") or {})
+            .get("processor", {})
+            .get("status")
+            for key in keys
+        }
+        if all(status == "finished" for status in statuses.values()):
+            return
+        if any(status == "failed" for status in statuses.values()):
+            raise SystemExit(f"Tiles generation failed: {statuses}")
+        time.sleep(2)
+    raise SystemExit("Timed out waiting for the tiles, is a Celery worker running?")
+
+
+def setup(args):
+    """Create the benchmark record and fixture."""
+    from invenio_app.factory import create_api
+
+    app = create_api()
+    with tempfile.TemporaryDirectory() as directory, app.app_context():
+        images = _generate_images(directory, args.sizes, args.seed)
+        record = _publish_record(images)
+        recid = record.id
+        keys = [image["key"] for image in images]
+        print(f"Published record {recid}, waiting for the tiles...")
+        _wait_for_tiles(recid, keys, args.timeout)
+
+    res = requests.get(
+        f"{args.base_url}/api/iiif/record:{recid}/manifest", verify=False, timeout=60
+    )
+    res.raise_for_status()
+    manifest = res.json()
+
+    fixture = {
+        "base_url": args.base_url,
+        "recid": recid,
+        "files": [{"key": image["key"], "size": image["size"]} for image in images],
+        "manifest": manifest,
+    }
+    args.fixture.write_text(json.dumps(fixture, indent=2))
+    if args.manifest:
+        args.manifest.write_text(json.dumps(manifest, indent=2))
+        print(f"Manifest written to {args.manifest}")
+    print(f"Fixture written to {args.fixture}")
+
+
+#
+# Run
+#
+def _canvases(manifest):
+    return [c for c in manifest["sequences"][0]["canvases"] if "height" in c]
+
+
+def _build_urls(fixture, base_url, num_requests, seed):
+    """Build the URLs of each scenario, deterministically for a seed."""
+    rng = random.Random(seed)
+    canvases = _canvases(fixture["manifest"])
+    recid = fixture["recid"]
+
+    def image_service(canvas):
+        return canvas["images"][0]["resource"]["service"]["@id"]
+
+    def tile():
+        canvas = rng.choice(canvases)
+        scale = 2 ** rng.randint(0, 3)
+        size = 256 * scale
+        x = rng.randrange(0, max(canvas["width"] - size, 1), size)
+        y = rng.randrange(0, max(canvas["height"] - size, 1), size)
+        return f"{image_service(canvas)}/{x},{y},{size},{size}/256,/0/default.jpg"
+
+    def thumbnail():
+        return f"{image_service(rng.choice(canvases))}/full/^250,/0/default.jpg"
+
+    def info_json():
+        return f"{image_service(rng.choice(canvases))}/info.json"
+
+    def manifest():
+        return f"{base_url}/api/iiif/record:{recid}/manifest"
+
+    def previewer():
+        key = rng.choice(fixture["files"])["key"]
+        return f"{base_url}/records/{recid}/preview/{quote(key)}"
+
+    builders = {
+        "tile": tile,
+        "thumbnail": thumbnail,
+        "info_json": info_json,
+        "manifest": manifest,
+        "previewer": previewer,
+    }
+    return {
+        name: [builders[name]() for _ in range(num_requests)] for name in SCENARIOS
+    }
+
+
+def _percentile(quantiles, p):
+    return round(quantiles[p - 1] * 1000, 2)
+
+
+def _run_scenario(urls, concurrency, timeout):
+    """Request the URLs from a pool of threads, returning the statistics."""
+    local = threading.local()
+
+    def fetch(url):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.verify = False
+        start = time.perf_counter()
+        try:
+            res = local.session.get(url, timeout=timeout)
+            ok = res.ok
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, ok in results if ok]
+    stats = {
+        "requests": len(results),
+        "errors": sum(1 for _, ok in results if not ok),
+        "throughput_rps": round(len(results) / elapsed, 2),
+    }
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        stats.update(
+            {
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+                "p50_ms": _percentile(quantiles, 50),
+                "p95_ms": _percentile(quantiles, 95),
+                "p99_ms": _percentile(quantiles, 99),
+            }
+        )
+    return stats
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=CUR_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """Run the scenarios and write the results file."""
+    fixture = json.loads(args.fixture.read_text())
+    base_url = args.base_url or fixture["base_url"]
+    urls = _build_urls(fixture, base_url, args.requests, args.seed)
+    scenarios = args.scenarios or SCENARIOS
+
+    results = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "base_url": base_url,
+            "recid": fixture["recid"],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    print(f"{'scenario':<12}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'err':>6}")
+    for name in scenarios:
+        # Warm up the connections and the server caches
+        _run_scenario(urls[name][: args.concurrency], args.concurrency, args.timeout)
+        stats = _run_scenario(urls[name], args.concurrency, args.timeout)
+        results["results"][name] = stats
+        print(
+            f"{name:<12}{stats['throughput_rps']:>10}{stats.get('p50_ms', '-'):>10}"
+            f"{stats.get('p95_ms', '-'):>10}{stats.get('p99_ms', '-'):>10}"
+            f"{stats['errors']:>6}"
+        )
+
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {args.output}")
+
+
+#
+# Compare
+#
+def compare(args):
+    """Compare the p95 latencies of two results files."""
+    baseline = json.loads(args.baseline.read_text())["results"]
+    current = json.loads(args.current.read_text())["results"]
+    regressions = []
+    print(f"{'scenario':<12}{'p95 before':>12}{'p95 after':>12}{'change':>10}")
+    for name, stats in current.items():
+        before = baseline.get(name, {}).get("p95_ms")
+        after = stats.get("p95_ms")
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100
+        print(f"{name:<12}{before:>12}{after:>12}{change:>+9.1f}%")
+        if change > args.threshold:
+            regressions.append(name)
+    if regressions:
+        print(f"p95 regressed by more than {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def main():
+    """Parse the arguments and run a step."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="step", required=True)
+
+    setup_parser = subparsers.add_parser("setup", help="Create the benchmark record.")
+    setup_parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 8000])
+    setup_parser.add_argument("--timeout", type=int, default=600)
+    setup_parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    setup_parser.add_argument(
+        "--manifest", type=Path, help="Also write the manifest to this file."
+    )
+    setup_parser.set_defaults(func=setup)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark scenarios.")
+    run_parser.add_argument("--requests", type=int, default=500)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--timeout", type=int, default=60)
+    run_parser.add_argument("--base-url")
+    run_parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS)
+    run_parser.add_argument(
+        "--output", type=Path, default=Path("iiif-benchmark-results.json")
+    )
+    run_parser.set_defaults(func=run)
+
+    for subparser in (setup_parser, run_parser):
+        subparser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+        subparser.add_argument("--seed", type=int, default=42)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two results.")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=10.0)
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    # Local instances use a self-signed certificate
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
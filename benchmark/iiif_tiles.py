@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Throughput of the IIIF tiles generation on sample images.
+
+Generates synthetic images with pyvips and saves their tiles with the tiles
+storage and converter used by ``generate_tiles``, in a pool of worker processes.
+The records are stand-ins serving the images from disk, so this measures the
+conversion and the storage of the tiles, without the database. Reports images/s
+and tiles/s, which bounds the throughput of the ``generate_iiif_tiles`` job per
+worker.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/iiif_tiles.py --images 20 --size 4000 --workers 1 4
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pyvips
+from invenio_rdm_records.services.iiif.converter import PyVIPSImageConverter
+from invenio_rdm_records.services.iiif.storage import LocalTilesStorage
+
+TILE_SIZE = PyVIPSImageConverter.default_params["tile_width"]
+
+
+class _File:
+    """Record file served from disk."""
+
+    def __init__(self, path):
+        """Constructor."""
+        self.path = path
+
+    def open_stream(self, mode):
+        return open(self.path, mode)
+
+
+def _record(recid, path):
+    """Stand-in for a public record with a single image file."""
+    return SimpleNamespace(
+        id=recid,
+        pid=SimpleNamespace(pid_value=recid),
+        access=SimpleNamespace(protection=SimpleNamespace(files="public")),
+        files={os.path.basename(path): _File(path)},
+    )
+
+
+def _generate_images(directory, num_images, size):
+    paths = []
+    for i in range(num_images):
+        # Noise is the worst case for the JPEG compression of the tiles
+        image = pyvips.Image.gaussnoise(size, size, mean=128, sigma=40).cast("uchar")
+        image = image.bandjoin([image, image]).copy(interpretation="srgb")
+        path = os.path.join(directory, f"sample-{i}.png")
+        image.write_to_file(path)
+        paths.append(path)
+    return paths
+
+
+def _num_tiles(width, height):
+    tiles = 0
+    while True:
+        tiles += math.ceil(width / TILE_SIZE) * math.ceil(height / TILE_SIZE)
+        if width <= TILE_SIZE and height <= TILE_SIZE:
+            return tiles
+        width, height = math.ceil(width / 2), math.ceil(height / 2)
+
+
+def _save_tiles(args):
+    recid, path, base_path = args
+    storage = LocalTilesStorage(
+        base_path=base_path,
+        converter=PyVIPSImageConverter(params=PyVIPSImageConverter.default_params),
+    )
+    if not storage.save(_record(recid, path), os.path.basename(path), "files"):
+        raise RuntimeError(f"Tiles generation failed for {path}.")
+    image = pyvips.Image.new_from_file(path)
+    return _num_tiles(image.width, image.height)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--size", type=int, default=4000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count()])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _generate_images(directory, args.images, args.size)
+        print(f"{'workers':>8}{'images/s':>12}{'tiles/s':>12}")
+        for workers in args.workers:
+            base_path = tempfile.mkdtemp(dir=directory)
+            jobs = [(str(1000 + i), path, base_path) for i, path in enumerate(paths)]
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tiles = sum(executor.map(_save_tiles, jobs))
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8}{len(paths) / elapsed:>12.2f}{tiles / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
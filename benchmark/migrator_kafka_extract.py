@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Throughput of the migrator Kafka extract, with the offset commits.
+
+Replays the recorded Kafka stream of the migrator tests through ``KafkaExtract``,
+with consumers whose commits take a simulated broker round trip. Reports the
+consumed messages/s and the number of commits, either committing once per batch
+of yielded transactions, as the extract does, or after every consumed message.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/migrator_kafka_extract.py --commit-latency 2 --rounds 5
+"""
+
+import argparse
+import gzip
+import time
+from pathlib import Path
+
+import jsonlines
+from kafka.consumer.fetcher import ConsumerRecord
+
+from zenodo_rdm_migrator.extract import KafkaExtract, KafkaExtractEnd
+
+TESTDATA_DIR = (
+    Path(__file__).parent.parent / "migrator" / "tests" / "extract" / "testdata"
+)
+
+
+class _Consumer:
+    """Consumer of recorded messages, with commits taking a round trip."""
+
+    def __init__(self, messages, commit_latency, per_message):
+        """Constructor."""
+        self.messages = messages
+        self.commit_latency = commit_latency
+        self.per_message = per_message
+        self.commits = 0
+
+    def __iter__(self):
+        for message in self.messages:
+            yield message
+            if self.per_message:
+                self.commit()
+
+    def commit(self):
+        time.sleep(self.commit_latency)
+        self.commits += 1
+
+
+class RecordedExtract(KafkaExtract):
+    """Kafka extract replaying the recorded messages once."""
+
+    def __init__(self, consumers, **kwargs):
+        """Constructor."""
+        super().__init__(ops_topic="ops", tx_topic="tx", **kwargs)
+        self._batches = {name: [consumer] for name, consumer in consumers.items()}
+
+    def _next_batch(self, name):
+        if not self._batches[name]:
+            raise KafkaExtractEnd
+        return self._batches[name].pop()
+
+    @property
+    def _tx_consumer(self):
+        return self._next_batch("tx")
+
+    @property
+    def _ops_consumer(self):
+        return self._next_batch("ops")
+
+
+def _load_messages(fpath):
+    with gzip.open(fpath) as fp, jsonlines.Reader(fp) as json_lines:
+        return [ConsumerRecord(**d) for d in json_lines]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commit-latency", type=float, default=2, help="Commit round trip, in ms."
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    tx_info = _load_messages(TESTDATA_DIR / "tx_info.jsonl.gz")
+    ops = _load_messages(TESTDATA_DIR / "ops.jsonl.gz")
+    messages = len(tx_info) + len(ops)
+
+    for mode, per_message in (("per-batch", False), ("per-message", True)):
+        elapsed = 0
+        commits = 0
+        for _ in range(args.rounds):
+            consumers = {
+                "tx": _Consumer(tx_info, args.commit_latency / 1000, per_message),
+                "ops": _Consumer(ops, args.commit_latency / 1000, per_message),
+            }
+            # The first transaction of the recording is incomplete
+            extract = RecordedExtract(consumers, last_tx=563388795)
+            start = time.perf_counter()
+            for _ in extract.run():
+                pass
+            elapsed += time.perf_counter() - start
+            commits += sum(c.commits for c in consumers.values())
+        rate = messages * args.rounds / elapsed
+        print(f"{mode:<12} {rate:>10.1f} msg/s {commits // args.rounds:>6} commits")
+
+    print(f"messages: {messages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Throughput of the records stream transform of the migrator per worker count.
+
+Writes a synthetic JSONL dump of legacy Zenodo records, and transforms it with
+``ZenodoRecordTransform`` reading from ``JSONLExtract``, as the records stream
+does, with an increasing number of worker processes. Reports records/s, after
+checking that every worker count yields the same records in the same order.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/migrator_parallel_transform.py --records 20000 --workers 1 4 8
+"""
+
+import argparse
+import copy
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from invenio_rdm_migrator.extract import JSONLExtract
+
+from zenodo_rdm_migrator.transform import ZenodoRecordTransform
+
+RECORD = {
+    "created": "2023-01-01 12:00:00.00000",
+    "updated": "2023-01-31 12:00:00.00000",
+    "json": {
+        "_oai": {
+            "id": "oai:zenodo.org:10452",
+            "sets": ["openaire_data", "user-zenodo"],
+            "updated": "2020-01-24T19:25:21Z",
+        },
+        "access_right": "open",
+        "resource_type": {"type": "image", "subtype": "photo"},
+        "publication_date": "2023-01-01",
+        "title": "Migration benchmark photo",
+        "owners": [1234],
+        "$schema": "https://zenodo.org/schemas/records/record-v1.0.0.json",
+        "license": {"$ref": "http://dx.zenodo.org/licenses/cc-zero"},
+        "creators": [
+            {
+                "name": "Doe, John",
+                "orcid": "0000-0001-6759-6273",
+                "familyname": "Doe",
+                "givennames": "John",
+                "affiliation": "CERN",
+            }
+        ],
+        "contributors": [
+            {
+                "name": "Else, Someone",
+                "orcid": "0000-0001-6759-6273",
+                "type": "ContactPerson",
+                "affiliation": "CERN",
+            },
+        ],
+        "dates": [
+            {
+                "start": "2018-03-21",
+                "end": "2018-03-25",
+                "type": "Collected",
+                "description": "A collection period.",
+            },
+        ],
+        "grants": [
+            {"$ref": "https://dx.zenodo.org/grants/10.13039/501100000780::278850"}
+        ],
+        "locations": [{"lat": 34.02577, "lon": -118.7804, "place": "Los Angeles"}],
+        "notes": "A note",
+        "language": "eng",
+        "related_identifiers": [
+            {
+                "identifier": "10.13039/901100010730",
+                "relation": "isCitedBy",
+                "resource_type": {"subtype": "article", "type": "publication"},
+                "scheme": "doi",
+            }
+        ],
+        "references": [{"raw_reference": "Benchmark reference"}],
+        "keywords": ["migration", "benchmark", "Zenodo", "RDM"],
+        "communities": ["zenodo", "migration"],
+        "description": "A synthetic Zenodo record to benchmark the migration.",
+        "journal": {"title": "Benchmark journal", "volume": "20", "pages": "35-40"},
+        "imprint": {"place": "Geneva", "publisher": "CERN's Publishing"},
+    },
+    "version_id": 1,
+}
+
+
+def _write_dump(path, num_records):
+    with open(path, "w") as fp:
+        for i in range(num_records):
+            record = copy.deepcopy(RECORD)
+            recid, conceptrecid = str(100000 + 2 * i + 1), str(100000 + 2 * i)
+            record["id"] = f"00000000-0000-4000-8000-{i:012d}"
+            record["json"].update(
+                {
+                    "recid": recid,
+                    "conceptrecid": conceptrecid,
+                    "doi": f"10.5281/zenodo.{recid}",
+                    "conceptdoi": f"10.5281/zenodo.{conceptrecid}",
+                    "_deposit": {
+                        "id": recid,
+                        "pid": {"type": "recid", "value": recid},
+                        "owners": [1234],
+                        "status": "published",
+                        "created_by": 1234,
+                    },
+                    "_files": [
+                        {
+                            "key": f"file-{i}.txt",
+                            "size": 100,
+                            "bucket": f"00000000-0000-4000-9000-{i:012d}",
+                            "file_id": f"00000000-0000-4000-a000-{i:012d}",
+                            "checksum": "md5:e6e3ba3ecbf1c6169c98e24dd7104fbd",
+                            "version_id": f"00000000-0000-4000-b000-{i:012d}",
+                        }
+                    ],
+                }
+            )
+            fp.write(json.dumps(record) + "\n")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        dump = Path(directory) / "records.jsonl"
+        _write_dump(dump, args.records)
+
+        reference = None
+        print(f"{'workers':>8}{'records/s':>12}")
+        for workers in args.workers:
+            transform = ZenodoRecordTransform(
+                workers=workers, chunk_size=args.chunk_size
+            )
+            start = time.perf_counter()
+            result = list(transform.run(JSONLExtract(filepath=dump).run()))
+            elapsed = time.perf_counter() - start
+            assert len(result) == args.records, "Records failed to transform"
+            if reference is None:
+                reference = result
+            assert result == reference, "Records differ between worker counts"
+            print(f"{workers:>8}{len(result) / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
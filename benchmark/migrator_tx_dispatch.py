@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Throughput of the action dispatch of the migrator transactions transform.
+
+Extracts the transactions of the recorded Kafka stream of the migrator tests, and
+matches each of them against the actions of ``ZenodoTxTransform``, either checking
+every action in turn or only the candidates of the action index. Reports matched
+transactions/s for both.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/migrator_tx_dispatch.py --rounds 50
+"""
+
+import argparse
+import copy
+import gzip
+import time
+from pathlib import Path
+
+import jsonlines
+from kafka.consumer.fetcher import ConsumerRecord
+
+from zenodo_rdm_migrator.extract import KafkaExtract, KafkaExtractEnd
+from zenodo_rdm_migrator.transform.transactions import ActionIndex, ZenodoTxTransform
+
+TESTDATA_DIR = (
+    Path(__file__).parent.parent / "migrator" / "tests" / "extract" / "testdata"
+)
+
+
+class _Consumer(list):
+    def commit(self):
+        pass
+
+
+class RecordedExtract(KafkaExtract):
+    """Kafka extract replaying the recorded messages once."""
+
+    def __init__(self, tx_info, ops, **kwargs):
+        """Constructor."""
+        super().__init__(ops_topic="ops", tx_topic="tx", **kwargs)
+        self._batches = {"tx": [_Consumer(tx_info)], "ops": [_Consumer(ops)]}
+
+    def _next_batch(self, name):
+        if not self._batches[name]:
+            raise KafkaExtractEnd
+        return self._batches[name].pop()
+
+    @property
+    def _tx_consumer(self):
+        return self._next_batch("tx")
+
+    @property
+    def _ops_consumer(self):
+        return self._next_batch("ops")
+
+
+def _load_messages(fpath):
+    with gzip.open(fpath) as fp, jsonlines.Reader(fp) as json_lines:
+        return [ConsumerRecord(**d) for d in json_lines]
+
+
+def _match(transactions, actions_for):
+    """Match the transactions, returning the matched action names and the time."""
+    start = time.perf_counter()
+    matched = [
+        [a.name for a in actions_for(tx) if a.matches_action(tx)] for tx in transactions
+    ]
+    return matched, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    extract = RecordedExtract(
+        _load_messages(TESTDATA_DIR / "tx_info.jsonl.gz"),
+        _load_messages(TESTDATA_DIR / "ops.jsonl.gz"),
+        # The first transaction of the recording is incomplete
+        last_tx=563388795,
+    )
+    transactions = list(extract.run())
+    actions = ZenodoTxTransform.actions
+    index = ActionIndex(actions)
+
+    for mode, actions_for in (
+        ("linear", lambda tx: actions),
+        ("indexed", index.candidates),
+    ):
+        elapsed = 0
+        for _ in range(args.rounds):
+            # Some actions parse the JSON fields of the operations in place
+            _, round_elapsed = _match(copy.deepcopy(transactions), actions_for)
+            elapsed += round_elapsed
+        rate = len(transactions) * args.rounds / elapsed
+        print(f"{mode:<8} {rate:>10.1f} tx/s")
+
+    print(f"transactions: {len(transactions)} ({len(actions)} actions)")
+    print(f"signatures:   {len(index._candidates)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Microbenchmark of the record moderation handler on spam-like payloads.
+
+Runs ``RecordModerationHandler`` on synthetic records with a growing number of
+links, emojis and header tags, and reports runs/s. Link domains are looked up in
+the database of a local instance. The percolator rule needs a record indexed in
+OpenSearch, so it is left out unless ``--with-percolator`` is passed.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/moderation_rules.py --links 10 100 1000 --runs 50
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from invenio_app.factory import create_api
+
+from zenodo_rdm.moderation.handlers import RecordModerationHandler
+
+
+def _spam_record(num_links):
+    links = " ".join(
+        f'<a href="https://spam-{i}.example.com/page">cheap {i} \U0001f600</a>'
+        for i in range(num_links)
+    )
+    description = "<h1>Buy now</h1>" * 10 + links
+    return SimpleNamespace(
+        metadata={
+            "title": "Best offer \U0001f525\U0001f525\U0001f525\U0001f525",
+            "description": description,
+            "additional_descriptions": [{"description": links}],
+            "references": [
+                {"reference": f"www.ref-{i}.example.org"} for i in range(num_links)
+            ],
+        },
+        parent=SimpleNamespace(is_verified=False),
+        files=SimpleNamespace(count=1, total_bytes=1_000, entries={"spam.pdf": {}}),
+        pid=SimpleNamespace(pid_value="1"),
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--with-percolator", action="store_true")
+    args = parser.parse_args()
+
+    app = create_api()
+    if not args.with_percolator:
+        rules = dict(app.config["MODERATION_RECORD_SCORE_RULES"])
+        rules.pop("match_query_rule", None)
+        app.config["MODERATION_RECORD_SCORE_RULES"] = rules
+    app.config["MODERATION_APPLY_ACTIONS"] = False
+
+    handler = RecordModerationHandler()
+    user = SimpleNamespace(id=-1, verified=False)
+
+    print(f"{'links':>8}{'runs/s':>12}{'ms/run':>10}")
+    with app.app_context():
+        for num_links in args.links:
+            record = _spam_record(num_links)
+            # Warm up the link domains lookup
+            handler.run(None, record=record, user=user, uow=None)
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                handler.run(None, record=record, user=user, uow=None)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{num_links:>8}{args.runs / elapsed:>12.1f}"
+                f"{elapsed / args.runs * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Count the vocabulary and community service calls of the OpenAIRE serializer.
+
+Serializes published records of a local instance with ``OpenAIREV1Serializer``
+and reports the number of ``vocab_service.read`` and
+``comm_service.read_many`` calls per record, as well as records/s. Pass
+``--no-vocabulary-cache`` to disable the process-wide resource type cache and
+compare.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/openaire_service_calls.py --records 500
+"""
+
+import argparse
+import time
+from unittest.mock import patch
+
+from invenio_access.permissions import system_identity
+from invenio_app.factory import create_api
+from invenio_communities.proxies import current_communities
+from invenio_rdm_records.proxies import current_rdm_records_service
+from invenio_vocabularies.proxies import current_service as vocab_service
+
+from zenodo_rdm.openaire.serializers import OpenAIREV1Serializer
+
+
+class CallCounter:
+    """Wrap a method and count its calls."""
+
+    def __init__(self, func):
+        """Constructor."""
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        """Call the wrapped method."""
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--no-vocabulary-cache", action="store_true")
+    args = parser.parse_args()
+
+    app = create_api()
+    if args.no_vocabulary_cache:
+        app.config["OPENAIRE_VOCABULARY_CACHE_TTL"] = 0
+
+    with app.app_context():
+        records = [
+            hit
+            for _, hit in zip(
+                range(args.records),
+                current_rdm_records_service.scan(system_identity).hits,
+            )
+        ]
+        serializer = OpenAIREV1Serializer()
+        comm_service = current_communities.service
+        vocab_read = CallCounter(vocab_service.read)
+        comm_read_many = CallCounter(comm_service.read_many)
+
+        with (
+            patch.object(vocab_service, "read", vocab_read),
+            patch.object(comm_service, "read_many", comm_read_many),
+        ):
+            start = time.perf_counter()
+            for record in records:
+                serializer.dump_obj(record)
+            elapsed = time.perf_counter() - start
+
+    num_records = len(records) or 1
+    print(f"records:                 {len(records)}")
+    print(f"vocabulary reads/record: {vocab_read.calls / num_records:.2f}")
+    print(f"community reads/record:  {comm_read_many.calls / num_records:.2f}")
+    print(f"records/s:               {num_records / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
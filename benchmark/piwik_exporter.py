@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Throughput of the Piwik stats exporter on a synthetic event stream.
+
+Builds the Piwik query strings of synthetic view and download events for
+records of a local instance, without sending them, and reports events/s. Pass
+``--cold`` to drop the resolved records after every chunk, i.e. to measure one
+bulk record query per chunk.
+
+Usage:
+
+.. code-block:: shell
+
+    python benchmark/piwik_exporter.py --events 100000 --recids 5000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from invenio_app.factory import create_api
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from opensearch_dsl.utils import AttrDict
+
+from zenodo_rdm.stats.exporters import PiwikExporter
+from zenodo_rdm.stats.utils import chunkify
+
+
+def _events(recids, num_events, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(num_events):
+        event = {
+            "recid": rng.choice(recids),
+            "visitor_id": f"{rng.getrandbits(128):032x}",
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "referrer": "https://www.google.com/search?q=zenodo",
+            "country": "CH",
+        }
+        if rng.random() < 0.3:
+            event["file_key"] = f"data {rng.randint(1, 5)}.csv"
+        yield AttrDict(event)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--recids", type=int, default=5_000)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--cold", action="store_true")
+    args = parser.parse_args()
+
+    app = create_api()
+    with app.app_context():
+        recids = [
+            pid.pid_value
+            for pid in PersistentIdentifier.query.filter_by(
+                pid_type="recid", status=PIDStatus.REGISTERED, object_type="rec"
+            ).limit(args.recids)
+        ]
+        if not recids:
+            raise SystemExit("No records found, create some records first.")
+
+        exporter = PiwikExporter()
+        num_events = 0
+        start = time.perf_counter()
+        for chunk in chunkify(_events(recids, args.events), args.chunk_size):
+            num_events += len(exporter._build_query_strings(chunk))
+            if args.cold:
+                exporter._records_cache.clear()
+        elapsed = time.perf_counter() - start
+
+    print(f"events:   {args.events} ({num_events} exported)")
+    print(f"records:  {len(recids)}")
+    print(f"events/s: {args.events / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -52,8 +52,9 @@ pv dumps/files_files.bin | psql $DB_URI -c "COPY files_files (id, created, updat
 pv dumps/files_bucket.bin | psql $DB_URI -c "COPY files_bucket (id, created, updated, default_location, default_storage_class, size, quota_size, max_file_size, locked, deleted) FROM STDIN (FORMAT binary);"
 pv dumps/files_object.bin | psql $DB_URI -c "COPY files_object (version_id, created, updated, key, bucket_id, file_id, _mimetype, is_head) FROM STDIN (FORMAT binary);"
 
-# Run migration
-python -m zenodo_rdm_migrator "streams-prod.yaml"
+# Run migration, discarding the checkpoints of previous runs as the DB was recreated.
+# To resume a failed run, only run `python -m zenodo_rdm_migrator "streams-prod.yaml"`
+python -m zenodo_rdm_migrator "streams-prod.yaml" --restart
 
 # Restore FK/PK/unique constraints and indices
 psql $DB_URI -f scripts/create_constraints.sql
@@ -13,6 +13,7 @@ from invenio_rdm_migrator.extract import Tx
 from invenio_rdm_migrator.load.postgresql.transactions.operations import OperationType
 
 from zenodo_rdm_migrator.extract import KafkaExtract, KafkaExtractEnd
+from zenodo_rdm_migrator.extract.kafka import _TxState
 
 
 def _random_chunks(li, min_chunk=1, max_chunk=50):
@@ -32,6 +33,18 @@ class MockConsumer(list):
         pass
 
 
+class CountingConsumer(MockConsumer):
+    """Mock Kafka consumer counting its commits."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super().__init__(*args, **kwargs)
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
 def _patch_consumers(mocker, tx_info, ops):
     """Helper for patching consumers of ``KafkaExtract``."""
     mocker.patch.object(
@@ -116,6 +129,33 @@ def _assert_result(
         _assert_op_counts(tx_dict[tx_id], op_counts)
 
 
+def test_tx_state_complete():
+    """Test that the completeness follows the ops received before and after info."""
+
+    def _op(table, lsn):
+        return {"op": "c", "source": {"schema": "public", "table": table, "lsn": lsn}}
+
+    tx_state = _TxState(1)
+    tx_state.append(_op("files_bucket", 1))
+    assert not tx_state.complete
+
+    tx_state.info = {
+        "data_collections": [
+            {"data_collection": "public.files_bucket", "event_count": 1},
+            {"data_collection": "public.files_object", "event_count": 2},
+        ]
+    }
+    assert not tx_state.complete
+    tx_state.append(_op("files_object", 3))
+    tx_state.append(_op("files_object", 2))
+    assert tx_state.complete
+    assert [o["source"]["lsn"] for o in tx_state.ops] == [1, 2, 3]
+
+    # An unexpected extra operation makes it incomplete again
+    tx_state.append(_op("files_object", 4))
+    assert not tx_state.complete
+
+
 def test_kafka_data(kafka_data):
     """Test sample data basic attributes."""
     assert len(kafka_data.ops) == 1820
@@ -254,3 +294,78 @@ def test_later_last_tx(mocker, kafka_data):
         ),
         tx_op_counts=dict([MIDDLE_TX_OP_COUNTS, LAST_TX_OP_COUNTS]),
     )
+
+
+def test_extract_commits_per_batch(mocker, kafka_data):
+    """Test that offsets are committed once per batch of yielded transactions.
+
+    Committing after every message would take a broker round trip for each of the
+    ~2100 messages of the stream, see ``benchmark/migrator_kafka_extract.py``.
+    """
+    tx_consumer = CountingConsumer(kafka_data.tx_info)
+    ops_consumer = CountingConsumer(kafka_data.ops)
+    _patch_consumers(mocker, [tx_consumer], [ops_consumer])
+
+    extract = KafkaExtract(
+        ops_topic="test_topic",
+        tx_topic="test_topic",
+        last_tx=563388795,
+    )
+    result = list(extract.run())
+
+    assert len(result) == 140
+    assert extract._last_yielded_tx[0] == 563390849
+    # A single batch of transactions was yielded
+    assert tx_consumer.commits == 1
+    assert ops_consumer.commits == 1
+
+
+class FakeKafkaConsumer:
+    """Fake Kafka consumer, resuming from its position on every iteration."""
+
+    def __init__(self, messages, max_iterations=10):
+        """Constructor."""
+        self.messages = iter(messages)
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.closed = False
+
+    def __iter__(self):
+        self.iterations += 1
+        if self.iterations > self.max_iterations:
+            raise KafkaExtractEnd
+        return self.messages
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_extract_reuses_consumers(mocker, kafka_data):
+    """Test that each consumer is created once, and closed at the end."""
+    consumers = {
+        "zenodo_migration_tx": FakeKafkaConsumer(kafka_data.tx_info),
+        "zenodo_migration_ops": FakeKafkaConsumer(kafka_data.ops),
+    }
+    consumer_cls = mocker.patch(
+        "zenodo_rdm_migrator.extract.kafka.KafkaConsumer",
+        side_effect=lambda group_id, **kwargs: consumers[group_id],
+    )
+    mocker.patch.object(KafkaExtract, "_seek_offsets", return_value={})
+
+    extract = KafkaExtract(
+        ops_topic="test_topic",
+        tx_topic="test_topic",
+        last_tx=563388795,
+    )
+    result = list(extract.run())
+
+    assert len(result) == 140
+    assert consumer_cls.call_count == 2
+    # The same consumers were iterated in every loop of the extract
+    assert consumers["zenodo_migration_tx"].iterations > 1
+    assert consumers["zenodo_migration_ops"].iterations > 1
+    assert all(consumer.closed for consumer in consumers.values())
+    assert extract._consumers == {}
@@ -0,0 +1,342 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test the checkpointed migrator streams."""
+
+import json
+import multiprocessing
+import os
+import signal
+import uuid
+from pathlib import Path
+
+import pytest
+import yaml
+from invenio_rdm_migrator.state import STATE
+from invenio_rdm_migrator.streams import StreamDefinition
+
+from zenodo_rdm_migrator.checkpoints import (
+    CheckpointedRunner,
+    CheckpointedStream,
+    InterruptedLoadError,
+    StreamCheckpoint,
+)
+from zenodo_rdm_migrator.extract import CheckpointedJSONLExtract
+from zenodo_rdm_migrator.transform import parallel
+from zenodo_rdm_migrator.transform.parallel import ParallelTransformMixin
+
+
+def _kill():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+class FileLoad:
+    """Load appending the entries to a file, once per run."""
+
+    def __init__(self, filepath, kill_at_run=None, kill_while_writing=False):
+        """Constructor."""
+        self.filepath = filepath
+        self.kill_at_run = kill_at_run
+        self.kill_while_writing = kill_while_writing
+        self.runs = 0
+
+    def run(self, entries, cleanup=False):
+        """Load the entries."""
+        self.runs += 1
+        kill = self.runs == self.kill_at_run
+        rows = []
+        for entry in entries:
+            if kill and not self.kill_while_writing and len(rows) == 5:
+                # killed while reading the batch, before writing it
+                _kill()
+            rows.append(json.dumps(entry) + "\n")
+        with open(self.filepath, "a") as fp:
+            for idx, row in enumerate(rows):
+                if kill and idx == 5:
+                    # killed with the batch partly written
+                    fp.flush()
+                    _kill()
+                fp.write(row)
+
+
+class IdentityTransform:
+    """Transform marking the entries as transformed."""
+
+    def run(self, entries):
+        """Transform the entries."""
+        for entry in entries:
+            yield {**entry, "transformed": True}
+
+
+class ParallelIdentityTransform(ParallelTransformMixin, IdentityTransform):
+    """Identity transform, in a pool of worker processes."""
+
+    def _transform(self, entry):
+        return {**entry, "transformed": True}
+
+
+class Stream:
+    """Minimal stream, with the interface of the migrator streams."""
+
+    def __init__(self, name, extract, load):
+        """Constructor."""
+        self.name = name
+        self.extract = extract
+        self.transform = IdentityTransform()
+        self.load = load
+
+    def run(self):
+        """Run the stream."""
+        self.load.run(self.transform.run(self.extract.run()))
+
+
+@pytest.fixture(scope="function")
+def jsonl_dump(tmp_dir):
+    """JSONL dump of 95 entries."""
+    filepath = Path(tmp_dir.name) / "records.jsonl"
+    with open(filepath, "w") as fp:
+        for i in range(95):
+            fp.write(json.dumps({"id": i, "title": f"Record {i}"}) + "\n")
+    return filepath
+
+
+def _run_stream(dump, output, state_dir, batch_size=10, **kwargs):
+    stream = Stream(
+        "records",
+        CheckpointedJSONLExtract(dump, batch_size=batch_size),
+        FileLoad(output, **kwargs),
+    )
+    CheckpointedStream(stream, StreamCheckpoint(state_dir, "records")).run()
+    return stream
+
+
+def _run_killed(target, *args, **kwargs):
+    """Run a function in a process, expecting it to be killed."""
+    process = multiprocessing.get_context("fork").Process(
+        target=target, args=args, kwargs=kwargs
+    )
+    process.start()
+    process.join()
+    assert process.exitcode == -signal.SIGKILL
+
+
+def test_kill_and_resume(tmp_dir, jsonl_dump):
+    tmp_path = Path(tmp_dir.name)
+    _run_stream(jsonl_dump, tmp_path / "expected.jsonl", tmp_path / "expected")
+
+    # killed while reading the 4th batch
+    _run_killed(
+        _run_stream,
+        jsonl_dump,
+        tmp_path / "output.jsonl",
+        tmp_path / "state",
+        kill_at_run=4,
+    )
+    checkpoint = StreamCheckpoint(tmp_path / "state", "records")
+    assert checkpoint.batch == 3
+    assert not checkpoint.loading
+    assert not checkpoint.completed
+
+    stream = _run_stream(jsonl_dump, tmp_path / "output.jsonl", tmp_path / "state")
+    # resumed from the 4th batch
+    assert stream.load.runs == 7
+    assert StreamCheckpoint(tmp_path / "state", "records").completed
+    assert (tmp_path / "output.jsonl").read_text() == (
+        tmp_path / "expected.jsonl"
+    ).read_text()
+
+    # completed streams are skipped
+    stream = _run_stream(jsonl_dump, tmp_path / "output.jsonl", tmp_path / "state")
+    assert stream.load.runs == 0
+
+
+def test_resume_interrupted_load(tmp_dir, jsonl_dump):
+    tmp_path = Path(tmp_dir.name)
+
+    # killed with the 4th batch partly written
+    _run_killed(
+        _run_stream,
+        jsonl_dump,
+        tmp_path / "output.jsonl",
+        tmp_path / "state",
+        kill_at_run=4,
+        kill_while_writing=True,
+    )
+    checkpoint = StreamCheckpoint(tmp_path / "state", "records")
+    assert checkpoint.batch == 3
+    assert checkpoint.loading
+    assert len((tmp_path / "output.jsonl").read_text().splitlines()) == 35
+
+    with pytest.raises(InterruptedLoadError):
+        _run_stream(jsonl_dump, tmp_path / "output.jsonl", tmp_path / "state")
+    assert len((tmp_path / "output.jsonl").read_text().splitlines()) == 35
+
+
+def test_unbatched_stream(tmp_dir, jsonl_dump):
+    tmp_path = Path(tmp_dir.name)
+    stream = _run_stream(
+        jsonl_dump, tmp_path / "output.jsonl", tmp_path / "state", batch_size=None
+    )
+
+    assert stream.load.runs == 1
+    assert len((tmp_path / "output.jsonl").read_text().splitlines()) == 95
+    assert StreamCheckpoint(tmp_path / "state", "records").completed
+
+
+def test_batches_share_worker_pool(tmp_dir, jsonl_dump, monkeypatch):
+    tmp_path = Path(tmp_dir.name)
+    pools = []
+
+    class RecordedPool(parallel.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", RecordedPool)
+    stream = Stream(
+        "records",
+        CheckpointedJSONLExtract(jsonl_dump, batch_size=10),
+        FileLoad(tmp_path / "output.jsonl"),
+    )
+    stream.transform = ParallelIdentityTransform(workers=2, chunk_size=3)
+    CheckpointedStream(stream, StreamCheckpoint(tmp_path / "state", "records")).run()
+
+    assert stream.load.runs == 10
+    assert len(pools) == 1
+    _run_stream(jsonl_dump, tmp_path / "expected.jsonl", tmp_path / "expected")
+    assert (tmp_path / "output.jsonl").read_text() == (
+        tmp_path / "expected.jsonl"
+    ).read_text()
+
+
+#
+# Runner, with the migration state
+#
+
+
+class ParentsLoad:
+    """Load writing the records, and their parents the first time they are seen.
+
+    The parents are deduplicated through the state, as in the records stream.
+    """
+
+    def __init__(self, output, kill_at_run=None, **kwargs):
+        """Constructor."""
+        self.output = output
+        self.kill_at_run = kill_at_run
+        self.runs = 0
+
+    def run(self, entries, cleanup=False):
+        """Load the entries."""
+        self.runs += 1
+        rows = []
+        for idx, entry in enumerate(entries):
+            if self.runs == self.kill_at_run and idx == 5:
+                # killed while reading the batch, with the state partly updated
+                _kill()
+            parent = entry["parent"]
+            if not STATE.PARENTS.get(parent):
+                parent_id = str(uuid.uuid5(uuid.NAMESPACE_URL, parent))
+                STATE.PARENTS.add(
+                    parent,
+                    {"id": parent_id, "latest_id": parent_id, "latest_index": 1},
+                )
+                rows.append({"parent": parent})
+            rows.append({"record": entry["id"]})
+        with open(self.output, "a") as fp:
+            fp.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+class DraftsLoad(ParentsLoad):
+    """Load writing the drafts, with the id of their parent from the state."""
+
+    def run(self, entries, cleanup=False):
+        """Load the entries."""
+        self.runs += 1
+        rows = []
+        for idx, entry in enumerate(entries):
+            if self.runs == self.kill_at_run and idx == 5:
+                _kill()
+            parent_id = STATE.PARENTS.get(entry["parent"])["id"]
+            rows.append({"draft": entry["id"], "parent_id": parent_id})
+        with open(self.output, "a") as fp:
+            fp.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+STREAM_DEFINITIONS = [
+    StreamDefinition("records", CheckpointedJSONLExtract, None, ParentsLoad),
+    StreamDefinition("drafts", CheckpointedJSONLExtract, None, DraftsLoad),
+]
+
+
+def _run_runner(tmp_path, output_dir, kill_records_at=None, kill_drafts_at=None):
+    """Run the records and drafts streams."""
+    # The state is saved through a backup file in the working directory
+    os.chdir(tmp_path)
+    config = {
+        "data_dir": str(tmp_path / "data"),
+        "tmp_dir": str(tmp_path / "tmp"),
+        "state_dir": str(output_dir / "state"),
+        "log_dir": str(output_dir / "log"),
+        "db_uri": None,
+        "old_secret_key": "old",
+        "new_secret_key": "new",
+        "records": {
+            "extract": {"filepath": str(tmp_path / "records.jsonl"), "batch_size": 10},
+            "load": {
+                "output": str(output_dir / "records.jsonl"),
+                "kill_at_run": kill_records_at,
+            },
+        },
+        "drafts": {
+            "extract": {"filepath": str(tmp_path / "drafts.jsonl")},
+            "load": {
+                "output": str(output_dir / "drafts.jsonl"),
+                "kill_at_run": kill_drafts_at,
+            },
+        },
+    }
+    config_filepath = output_dir / "streams.yaml"
+    config_filepath.write_text(yaml.safe_dump(config))
+    CheckpointedRunner(STREAM_DEFINITIONS, config_filepath).run()
+
+
+def _run_runner_process(*args, **kwargs):
+    """Run the streams in a process, with its own global state."""
+    process = multiprocessing.get_context("fork").Process(
+        target=_run_runner, args=args, kwargs=kwargs
+    )
+    process.start()
+    process.join()
+    return process.exitcode
+
+
+def test_runner_resumes_state(tmp_dir):
+    tmp_path = Path(tmp_dir.name)
+    with open(tmp_path / "records.jsonl", "w") as fp:
+        for i in range(95):
+            # parents spanning consecutive batches
+            fp.write(json.dumps({"id": i, "parent": f"parent-{i // 4}"}) + "\n")
+    with open(tmp_path / "drafts.jsonl", "w") as fp:
+        for i in range(0, 95, 5):
+            fp.write(json.dumps({"id": i, "parent": f"parent-{i // 4}"}) + "\n")
+    expected_dir = tmp_path / "expected"
+    output_dir = tmp_path / "output"
+    expected_dir.mkdir()
+    output_dir.mkdir()
+
+    assert _run_runner_process(tmp_path, expected_dir) == 0
+    # killed while loading the 4th batch of records
+    exitcode = _run_runner_process(tmp_path, output_dir, kill_records_at=4)
+    assert exitcode == -signal.SIGKILL
+    # records resumed from the state of the 3rd batch, killed while loading drafts
+    exitcode = _run_runner_process(tmp_path, output_dir, kill_drafts_at=1)
+    assert exitcode == -signal.SIGKILL
+    records_checkpoint = StreamCheckpoint(output_dir / "state/checkpoints", "records")
+    assert records_checkpoint.completed
+    # records skipped, drafts with the parents from the state of records
+    assert _run_runner_process(tmp_path, output_dir) == 0
+
+    for output in ("records.jsonl", "drafts.jsonl"):
+        expected = (expected_dir / output).read_text()
+        assert (output_dir / output).read_text() == expected
+    assert len((expected_dir / "drafts.jsonl").read_text().splitlines()) == 19
@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test the parallel transform of the migrator streams."""
+
+import pytest
+
+from zenodo_rdm_migrator.transform import parallel
+from zenodo_rdm_migrator.transform.parallel import ParallelTransformMixin
+
+
+class SerialTransform:
+    """Transform recording the entries whose errors it handled."""
+
+    def __init__(self):
+        """Constructor."""
+        self.errors = []
+
+    def _transform(self, entry):
+        if entry % 7 == 0:
+            raise ValueError(entry)
+        return {"id": entry, "square": entry * entry}
+
+    def run(self, entries):
+        """Transform the entries, skipping the failed ones."""
+        for entry in entries:
+            try:
+                yield self._transform(entry)
+            except ValueError:
+                self.errors.append(entry)
+
+
+class ParallelTransform(ParallelTransformMixin, SerialTransform):
+    """Parallel transform."""
+
+
+@pytest.mark.parametrize("workers", [None, 1, 3])
+def test_parallel_transform_order(workers):
+    entries = range(1, 1000)
+    transform = ParallelTransform(workers=workers, chunk_size=10)
+
+    result = list(transform.run(iter(entries)))
+
+    assert result == list(SerialTransform().run(entries))
+    # errors are handled per entry, by the serial run
+    assert transform.errors == [e for e in entries if e % 7 == 0]
+
+
+def test_parallel_transform_empty():
+    assert list(ParallelTransform(workers=2).run(iter([]))) == []
+
+
+def test_parallel_transform_worker_pool(monkeypatch):
+    pools = []
+
+    class RecordedPool(parallel.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", RecordedPool)
+    transform = ParallelTransform(workers=2, chunk_size=10)
+
+    with transform.worker_pool():
+        first = list(transform.run(iter(range(1, 100))))
+        second = list(transform.run(iter(range(100, 200))))
+
+    assert len(pools) == 1
+    assert first + second == list(SerialTransform().run(range(1, 200)))
+    # runs outside of the context start their own pool
+    list(transform.run(iter(range(1, 100))))
+    assert len(pools) == 2
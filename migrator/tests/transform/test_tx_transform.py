@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test the action dispatch of the transactions transform."""
+
+import copy
+from pathlib import Path
+
+import jsonlines
+import pytest
+from invenio_rdm_migrator.extract import Tx
+from invenio_rdm_migrator.load.postgresql.transactions.operations import OperationType
+
+from zenodo_rdm_migrator.actions.transform.files import (
+    FileUploadAction,
+    MediaFileUploadAction,
+)
+from zenodo_rdm_migrator.actions.transform.github import (
+    HookEventCreateAction,
+    ReleaseReceiveAction,
+    RepoCreateAction,
+)
+from zenodo_rdm_migrator.actions.transform.users import UserEditAction
+from zenodo_rdm_migrator.transform.transactions import ActionIndex, ZenodoTxTransform
+
+ACTIONS_TESTS_DIR = Path(__file__).parent.parent / "actions"
+
+
+def _tx(*ops):
+    return Tx(
+        id=1,
+        operations=[
+            {"op": op_type, "source": {"table": table}, "after": {}, "before": {}}
+            for table, op_type in ops
+        ],
+    )
+
+
+def test_candidates_ops_signature():
+    """Test that the candidates are the actions allowing all the tx operations."""
+    index = ActionIndex(ZenodoTxTransform.actions)
+    ops = [
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.INSERT),
+        ("files_files", OperationType.INSERT),
+        ("files_object", OperationType.UPDATE),
+        ("files_files", OperationType.UPDATE),
+        ("files_bucket", OperationType.UPDATE),
+    ]
+    tx = _tx(*ops)
+    candidates = index.candidates(tx)
+
+    assert FileUploadAction in candidates
+    assert MediaFileUploadAction in candidates
+    assert UserEditAction not in candidates
+    assert candidates == [a for a in ZenodoTxTransform.actions if a in candidates]
+    assert [a for a in candidates if a.matches_action(tx)] == [FileUploadAction]
+    # The same excluded table keeps the same candidates
+    token_tx = _tx(("oauth2server_token", OperationType.UPDATE), *ops)
+    assert FileUploadAction in index.candidates(token_tx)
+    # Candidates are computed once per signature
+    assert index.candidates(_tx(*reversed(ops))) is candidates
+
+
+def test_candidates_ops_required():
+    """Test that actions with required operations are candidates if all are there."""
+    index = ActionIndex(ZenodoTxTransform.actions)
+    tx = _tx(
+        ("webhooks_events", OperationType.INSERT),
+        ("github_repositories", OperationType.UPDATE),
+    )
+    candidates = index.candidates(tx)
+
+    assert HookEventCreateAction in candidates
+    assert RepoCreateAction not in candidates
+    assert ReleaseReceiveAction not in candidates
+    assert [a for a in candidates if a.matches_action(tx)] == [HookEventCreateAction]
+
+
+def _load_tx(tx_path):
+    """Load a recorded transaction, as extracted in the action tests."""
+    with jsonlines.open(tx_path) as reader:
+        operations = [
+            {"key": op["key"], **op["value"]} for op in reader.iter(skip_empty=True)
+        ]
+    # convert "op" to OperationType enum and pop Debezium internals
+    for op in operations:
+        op["op"] = OperationType(op["op"].upper())
+        op["key"].pop("__dbz__physicalTableIdentifier", None)
+    return Tx(id=operations[0]["source"]["txId"], operations=operations)
+
+
+@pytest.mark.parametrize(
+    "tx_path",
+    sorted(ACTIONS_TESTS_DIR.glob("*/testdata/**/*.jsonl")),
+    ids=lambda p: str(p.relative_to(ACTIONS_TESTS_DIR)),
+)
+def test_candidates_match_every_action(tx_path):
+    """Test that the candidates match the same actions as checking every action."""
+    tx = _load_tx(tx_path)
+    index = ActionIndex(ZenodoTxTransform.actions)
+
+    # Some actions parse the JSON fields of the operations in place
+    linear = [
+        a for a in ZenodoTxTransform.actions if a.matches_action(copy.deepcopy(tx))
+    ]
+    indexed = [a for a in index.candidates(tx) if a.matches_action(copy.deepcopy(tx))]
+
+    assert linear == indexed
+    assert len(linear) == 1
+    assert ZenodoTxTransform()._detect_action(copy.deepcopy(tx)) is linear[0]
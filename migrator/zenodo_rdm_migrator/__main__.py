@@ -4,8 +4,7 @@
 
 import sys
 
-from invenio_rdm_migrator.streams import Runner
-
+from .checkpoints import CheckpointedRunner
 from .stream import (
     ActionStreamDefinition,
     AffiliationsStreamDefinition,
@@ -30,10 +29,11 @@ from .stream import (
 
 if __name__ == "__main__":
     if len(sys.argv) == 1 or sys.argv[1].lower() in ("--help", "-h"):
-        print(f"Usage: {sys.argv[0]} CONFIG_FILE")
+        print(f"Usage: {sys.argv[0]} CONFIG_FILE [--restart]")
         exit(0)
 
-    runner = Runner(
+    # Completed streams are skipped and partial ones resumed, unless restarting
+    runner = CheckpointedRunner(
         stream_definitions=[
             ActionStreamDefinition,
             FundersStreamDefinition,
@@ -56,6 +56,7 @@ if __name__ == "__main__":
             GitHubRepositoriesStreamDefinition,
         ],
         config_filepath=sys.argv[1],
+        restart="--restart" in sys.argv[2:],
     )
 
     # Now we run the rest of the streams
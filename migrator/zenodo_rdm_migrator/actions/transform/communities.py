@@ -20,6 +20,17 @@ class CommunityCreateAction(TransformAction):
     name = "community-create"
     load_cls = load.CommunityCreateAction
 
+    ops_signature = (
+        ("communities_community", OperationType.INSERT),
+        ("communities_community", OperationType.UPDATE),
+        ("oaiserver_set", OperationType.INSERT),
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.INSERT),
+        ("files_object", OperationType.UPDATE),
+        ("files_files", OperationType.INSERT),
+        ("files_files", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -90,6 +101,15 @@ class CommunityUpdateAction(TransformAction):
     name = "community-update"
     load_cls = load.CommunityUpdateAction
 
+    ops_signature = (
+        ("communities_community", OperationType.UPDATE),
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.INSERT),
+        ("files_object", OperationType.UPDATE),
+        ("files_files", OperationType.INSERT),
+        ("files_files", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -165,6 +185,8 @@ class CommunityDeleteAction(TransformAction):
     name = "community-delete"
     load_cls = load.CommunityDeleteAction
 
+    ops_signature = (("communities_community", OperationType.DELETE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -31,6 +31,16 @@ class DraftCreateAction(TransformAction, DraftTransformMixin):
     name = "create-zenodo-draft"
     load_cls = load.DraftCreateAction
 
+    ops_required = (
+        ("pidstore_recid", OperationType.INSERT),
+        ("pidstore_pid", OperationType.INSERT),
+        ("files_bucket", OperationType.INSERT),
+        ("records_metadata", OperationType.INSERT),
+        ("records_buckets", OperationType.INSERT),
+        ("pidrelations_pidrelation", OperationType.INSERT),
+        ("pidrelations_pidrelation", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -93,6 +103,11 @@ class DraftEditAction(TransformAction, DraftTransformMixin):
     name = "edit-zenodo-draft"
     load_cls = load.DraftEditAction
 
+    ops_signature = (
+        ("records_metadata", OperationType.UPDATE),
+        ("files_bucket", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -214,6 +229,8 @@ class DraftPublishNewAction(TransformAction, DraftTransformMixin):
     name = "publish-new-draft"
     load_cls = load.DraftPublishNewAction
 
+    ops_required = (("records_metadata", None),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -326,6 +343,8 @@ class DraftPublishEditAction(TransformAction, DraftTransformMixin):
     name = "publish-edit-draft"
     load_cls = load.DraftPublishEditAction
 
+    ops_required = (("records_metadata", None),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
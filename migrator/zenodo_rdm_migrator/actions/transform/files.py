@@ -14,6 +14,15 @@ class FileUploadAction(TransformAction):
     name = "file-upload"
     load_cls = load.FileUploadAction
 
+    ops_signature = (
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.INSERT),
+        ("files_object", OperationType.UPDATE),
+        ("files_files", OperationType.INSERT),
+        ("files_files", OperationType.UPDATE),
+        ("oauth2server_token", None),  # excluded from the match
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -90,6 +99,14 @@ class FileDeleteAction(TransformAction):
     name = "file-delete"
     load_cls = load.FileDeleteAction
 
+    ops_signature = (
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.INSERT),
+        ("files_object", OperationType.UPDATE),
+        ("files_object", OperationType.DELETE),
+        ("oauth2server_token", None),  # excluded from the match
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -145,6 +162,15 @@ class MediaFileUploadAction(TransformAction):
     name = "media-file-upload"
     load_cls = load.MediaFileUploadAction
 
+    ops_signature = (
+        ("oauth2server_token", OperationType.UPDATE),
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.INSERT),
+        ("files_object", OperationType.UPDATE),
+        ("files_files", OperationType.INSERT),
+        ("files_files", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -222,6 +248,15 @@ class MediaFileDeleteAction(TransformAction):
     name = "media-file-delete"
     load_cls = load.MediaFileDeleteAction
 
+    ops_signature = (
+        ("files_bucket", OperationType.UPDATE),
+        ("files_object", OperationType.UPDATE),
+        ("files_object", OperationType.DELETE),
+        ("files_files", OperationType.INSERT),
+        ("files_files", OperationType.UPDATE),
+        ("oauth2server_token", None),  # excluded from the match
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
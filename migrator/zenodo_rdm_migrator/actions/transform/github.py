@@ -28,6 +28,11 @@ class RepoCreateAction(TransformAction):
     name = "gh-repo-create"
     load_cls = load.RepoCreateAction
 
+    ops_required = (
+        ("github_repositories", OperationType.INSERT),
+        ("github_repositories", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -69,6 +74,8 @@ class RepoUpdateAction(TransformAction):
     name = "gh-hook-repo-update"
     load_cls = load.RepoUpdateAction
 
+    ops_signature = (("github_repositories", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -103,6 +110,8 @@ class HookEventCreateAction(TransformAction, JSONTransformMixin):
     name = "gh-hook-event-create"
     load_cls = load.HookEventCreateAction
 
+    ops_required = (("webhooks_events", OperationType.INSERT),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -141,6 +150,8 @@ class HookEventUpdateAction(TransformAction, JSONTransformMixin):
     name = "gh-hook-event-update"
     load_cls = load.HookEventUpdateAction
 
+    ops_signature = (("webhooks_events", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -176,6 +187,11 @@ class ReleaseReceiveAction(TransformAction, JSONTransformMixin):
     name = "gh-release-receive"
     load_cls = load.ReleaseReceiveAction
 
+    ops_signature = (
+        ("github_repositories", OperationType.UPDATE),
+        ("github_releases", OperationType.INSERT),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -221,6 +237,8 @@ class ReleaseUpdateAction(TransformAction, JSONTransformMixin):
     name = "gh-release-update"
     load_cls = load.ReleaseUpdateAction
 
+    ops_signature = (("github_releases", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -25,6 +25,8 @@ class FileChecksumAction(IgnoredTransformAction):
 
     name = "file-checksum"
 
+    ops_signature = (("files_files", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks for a single file instance update."""
@@ -40,6 +42,11 @@ class UserSessionAction(IgnoredTransformAction):
 
     name = "user-session"
 
+    ops_signature = (
+        ("accounts_user", OperationType.UPDATE),
+        ("accounts_user_session_activity", None),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks for a user login."""
@@ -68,6 +75,8 @@ class GitHubSyncAction(IgnoredTransformAction):
 
     name = "gh-sync"
 
+    ops_signature = (("oauthclient_remoteaccount", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks for a single OAuth client remote account update op."""
@@ -81,6 +90,8 @@ class GitHubPingAction(IgnoredTransformAction):
 
     name = "gh-ping"
 
+    ops_signature = (("github_repositories", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks for a single GitHub repo update to the `ping` column."""
@@ -96,6 +107,11 @@ class OAuthReLoginAction(IgnoredTransformAction):
 
     name = "oauth-relogin"
 
+    ops_signature = (
+        ("accounts_user", OperationType.UPDATE),
+        ("oauthclient_remotetoken", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks for an OAuth login."""
@@ -110,6 +126,8 @@ class DataCiteDOIRegistration(IgnoredTransformAction):
 
     name = "doi-registration"
 
+    ops_signature = (("pidstore_pid", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks for a single Zenodo DOI update to registered status."""
@@ -18,6 +18,11 @@ class OAuthServerTokenCreateAction(TransformAction):
     name = "oauth-server-token-create"
     load_cls = load.OAuthServerTokenCreateAction
 
+    ops_signature = (
+        ("oauth2server_client", OperationType.INSERT),
+        ("oauth2server_token", OperationType.INSERT),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -64,6 +69,11 @@ class OAuthServerTokenUpdateAction(TransformAction):
     name = "oauth-server-token-update"
     load_cls = load.OAuthServerTokenUpdateAction
 
+    ops_signature = (
+        ("oauth2server_client", OperationType.UPDATE),
+        ("oauth2server_token", OperationType.UPDATE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -113,6 +123,8 @@ class OAuthServerTokenDeleteAction(TransformAction):
     name = "oauth-server-token-delete"
     load_cls = load.OAuthServerTokenDeleteAction
 
+    ops_signature = (("oauth2server_token", OperationType.DELETE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -140,6 +152,8 @@ class OAuthApplicationCreateAction(TransformAction):
     name = "oauth-application-create"
     load_cls = load.OAuthApplicationCreateAction
 
+    ops_signature = (("oauth2server_client", OperationType.INSERT),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -166,6 +180,8 @@ class OAuthApplicationUpdateAction(TransformAction):
     name = "oauth-application-update"
     load_cls = load.OAuthApplicationUpdateAction
 
+    ops_signature = (("oauth2server_client", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -195,6 +211,8 @@ class OAuthApplicationDeleteAction(TransformAction):
     name = "oauth-application-delete"
     load_cls = load.OAuthApplicationDeleteAction
 
+    ops_signature = (("oauth2server_client", OperationType.DELETE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -221,6 +239,15 @@ class OAuthLinkedAccountConnectAction(TransformAction, JSONTransformMixin):
     name = "oauth-application-connect"
     load_cls = load.OAuthLinkedAccountConnectAction
 
+    ops_signature = (
+        ("oauthclient_remoteaccount", OperationType.INSERT),
+        ("oauthclient_remoteaccount", OperationType.UPDATE),
+        ("oauthclient_remotetoken", OperationType.INSERT),
+        ("oauthclient_useridentity", OperationType.INSERT),
+        ("oauth2server_client", OperationType.INSERT),
+        ("oauth2server_token", OperationType.INSERT),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -311,6 +338,12 @@ class OAuthLinkedAccountDisconnectAction(TransformAction, JSONTransformMixin):
     name = "oauth-application-disconnect"
     load_cls = load.OAuthLinkedAccountDisconnectAction
 
+    ops_signature = (
+        ("oauthclient_remoteaccount", OperationType.DELETE),
+        ("oauthclient_remotetoken", OperationType.DELETE),
+        ("oauthclient_useridentity", OperationType.DELETE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -374,6 +407,11 @@ class OAuthGHDisconnectToken(TransformAction):
     name = "oauth-gh-application-disconnect"
     load_cls = load.OAuthGHDisconnectToken
 
+    ops_signature = (
+        ("oauthclient_useridentity", OperationType.DELETE),
+        ("oauth2server_token", OperationType.DELETE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -16,6 +16,11 @@ class UserRegistrationAction(TransformAction):
     name = "register-user"
     load_cls = load.UserRegistrationAction
 
+    ops_signature = (
+        ("userprofiles_userprofile", OperationType.INSERT),
+        ("accounts_user", OperationType.INSERT),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -63,6 +68,8 @@ class UserEditAction(TransformAction):
     name = "edit-user"
     load_cls = load.UserEditAction
 
+    ops_signature = (("accounts_user", OperationType.UPDATE),)
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -104,6 +111,11 @@ class UserDeactivationAction(TransformAction):
     name = "deactivate-user"
     load_cls = load.UserDeactivationAction
 
+    ops_signature = (
+        ("accounts_user", OperationType.UPDATE),
+        ("accounts_user_session_activity", OperationType.DELETE),
+    )
+
     @classmethod
     def matches_action(cls, tx):
         """Checks if the data corresponds with that required by the action."""
@@ -0,0 +1,281 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Checkpointed, resumable migrator streams."""
+
+import json
+import os
+import shutil
+from contextlib import nullcontext
+from pathlib import Path
+
+from invenio_rdm_migrator.extract import Extract
+from invenio_rdm_migrator.logging import Logger
+from invenio_rdm_migrator.state import STATE, StateDB
+from invenio_rdm_migrator.streams import Runner
+
+from .extract import KafkaExtract
+
+
+class InterruptedLoadError(Exception):
+    """The load of a batch was interrupted, its rows may be partly loaded."""
+
+    def __init__(self, checkpoint):
+        """Constructor."""
+        super().__init__(
+            f"The load of batch {checkpoint.batch + 1} was interrupted, its rows may "
+            "be partly in the database. Delete them and set `loading` to false in "
+            f"{checkpoint.path} to load the batch again, or run with --restart."
+        )
+
+
+class StreamCheckpoint:
+    """Progress of a stream, stored in ``<state_dir>/checkpoints/<stream>.json``.
+
+    Stores the byte offset of the extract following the last loaded batch, the
+    number of that batch, whether the following batch is being loaded and whether
+    the stream completed.
+    """
+
+    def __init__(self, checkpoints_dir, name):
+        """Constructor."""
+        self.path = Path(checkpoints_dir) / f"{name}.json"
+        self.offset = 0
+        self.batch = 0
+        self.loading = False
+        self.completed = False
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            self.offset = state["offset"]
+            self.batch = state["batch"]
+            self.loading = state.get("loading", False)
+            self.completed = state["completed"]
+
+    def _write(self):
+        """Write the checkpoint, replacing the previous one atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "offset": self.offset,
+            "batch": self.batch,
+            "loading": self.loading,
+            "completed": self.completed,
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump(state, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self.path)
+
+    def start_loading(self):
+        """Record that the rows of the following batch are being loaded."""
+        self.loading = True
+        self._write()
+
+    def save(self, offset, batch):
+        """Record a loaded batch."""
+        self.offset = offset
+        self.batch = batch
+        self.loading = False
+        self._write()
+
+    def complete(self):
+        """Record the completion of the stream."""
+        self.loading = False
+        self.completed = True
+        self._write()
+
+
+class StateCheckpoint:
+    """Migration state as of the last checkpoint, in ``<checkpoints_dir>/state.db``.
+
+    The state is shared by the streams, e.g. the records stream stores the parents
+    of the records it loads and the drafts stream reads them.
+    """
+
+    def __init__(self, checkpoints_dir, state):
+        """Constructor."""
+        self.path = Path(checkpoints_dir) / "state.db"
+        self.state = state
+
+    def save(self):
+        """Flush and save the state, replacing the previous one atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        STATE.flush_cache()
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        self.state.save(filepath=tmp_path)
+        os.replace(tmp_path, self.path)
+
+
+class _BatchExtract(Extract):
+    """Extract of a batch of entries."""
+
+    def __init__(self, entries):
+        """Constructor."""
+        self.entries = entries
+
+    def run(self):
+        """Yield the entries."""
+        yield from self.entries
+
+
+class _LoadingTransform:
+    """Transform calling ``on_end`` once the load has read all the entries."""
+
+    def __init__(self, transform, on_end):
+        """Constructor."""
+        self.transform = transform
+        self.on_end = on_end
+
+    def run(self, entries):
+        """Yield the transformed entries."""
+        yield from self.transform.run(entries)
+        # The load writes its rows after reading the last entry
+        self.on_end()
+
+
+class CheckpointedStream:
+    """Stream recording its progress in a checkpoint.
+
+    Streams with a ``CheckpointedJSONLExtract`` with a ``batch_size`` are run once
+    per batch, each transforming and loading the batch, and the checkpoint is saved
+    after each batch is loaded. A resumed stream starts after the last loaded
+    batch. Other streams are run as a whole. Completed streams are skipped.
+
+    With a ``state_checkpoint``, the state is saved with each checkpoint, and a
+    resumed stream starts from the state of its last loaded batch.
+
+    Once the load has read all the entries of a batch, the batch is marked as
+    loading until it is checkpointed. The rows of an interrupted batch may be partly
+    loaded, and loading it again would duplicate them, so resuming from it raises
+    an ``InterruptedLoadError``.
+    """
+
+    def __init__(self, stream, checkpoint, state_checkpoint=None):
+        """Constructor."""
+        self.stream = stream
+        self.checkpoint = checkpoint
+        self.state_checkpoint = state_checkpoint
+        self.logger = Logger.get_logger()
+
+    @property
+    def name(self):
+        """Name of the stream."""
+        return self.stream.name
+
+    def _run(self, extract, *args, **kwargs):
+        """Run the stream on an extract, and save the state once loaded."""
+        stream_extract, transform = self.stream.extract, self.stream.transform
+        self.stream.extract = extract
+        self.stream.transform = _LoadingTransform(
+            transform, self.checkpoint.start_loading
+        )
+        try:
+            self.stream.run(*args, **kwargs)
+        finally:
+            self.stream.extract, self.stream.transform = stream_extract, transform
+        if self.state_checkpoint:
+            self.state_checkpoint.save()
+
+    def _run_batches(self, extract, *args, **kwargs):
+        batches = extract.iter_batches(self.checkpoint.offset)
+        # The batches are transformed by the same pool of workers
+        worker_pool = getattr(self.stream.transform, "worker_pool", nullcontext)
+        with worker_pool():
+            for batch, (entries, offset) in enumerate(
+                batches, self.checkpoint.batch + 1
+            ):
+                self._run(_BatchExtract(entries), *args, **kwargs)
+                self.checkpoint.save(offset, batch)
+                self.logger.info(
+                    f"Stream {self.name}: loaded batch {batch} ({offset=})"
+                )
+
+    def run(self, *args, **kwargs):
+        """Run the stream, from its checkpoint."""
+        if self.checkpoint.completed:
+            self.logger.info(f"Stream {self.name} already completed, skipping.")
+            return
+        if self.checkpoint.loading:
+            raise InterruptedLoadError(self.checkpoint)
+
+        extract = self.stream.extract
+        if getattr(extract, "batch_size", None):
+            if self.checkpoint.batch:
+                self.logger.info(
+                    f"Resuming stream {self.name} after batch {self.checkpoint.batch}"
+                )
+            self._run_batches(extract, *args, **kwargs)
+        else:
+            self._run(extract, *args, **kwargs)
+        self.checkpoint.complete()
+
+
+class CheckpointedRunner(Runner):
+    """Runner skipping the completed streams and resuming the partial ones.
+
+    The checkpoints are kept in ``<state_dir>/checkpoints``, with the state as of
+    the last one, which a resumed run starts from. With ``restart``, the checkpoints
+    of previous runs are removed and every stream runs again.
+
+    The run stops at the first failed stream, since the state may hold part of its
+    last batch, which the following streams would checkpoint.
+
+    Kafka streams are not checkpointed and are never skipped. They start from the
+    ``last_tx`` and the offsets of their extract configuration, not from the
+    offsets committed by their consumers, which a resumed run must update.
+    """
+
+    def __init__(self, stream_definitions, config_filepath, restart=False):
+        """Constructor."""
+        super().__init__(stream_definitions, config_filepath)
+        checkpoints_dir = self.state_dir / "checkpoints"
+        if restart:
+            shutil.rmtree(checkpoints_dir, ignore_errors=True)
+        elif (checkpoints_dir / "state.db").exists():
+            self._restore_state(checkpoints_dir, config_filepath)
+
+        state_checkpoint = StateCheckpoint(checkpoints_dir, self.state)
+        self.streams = [
+            (
+                stream
+                if isinstance(stream.extract, KafkaExtract)
+                else CheckpointedStream(
+                    stream,
+                    StreamCheckpoint(checkpoints_dir, stream.name),
+                    state_checkpoint,
+                )
+            )
+            for stream in self.streams
+        ]
+
+    def _restore_state(self, checkpoints_dir, config_filepath):
+        """Replace the state by the state of the last checkpoint."""
+        config = self._read_config(config_filepath)
+        state = StateDB(db_dir=checkpoints_dir, validators=self.state.validators)
+        Logger.get_logger().info(f"Restoring state from {state.db_filepath}.")
+        state.mem_eng  # loads the state from disk
+        # saved in the state dir from now on, like the state of the runner
+        state.db_dir = self.state.db_dir
+        state.db_filepath = self.state.db_filepath
+        self.state = state
+        STATE.initialized_state(
+            state,
+            cache=config.get("state_cache", True),
+            search_cache=config.get("state_search_cache", True),
+        )
+
+    def run(self):
+        """Run the streams, stopping at the first failed one."""
+        for stream in self.streams:
+            try:
+                stream.run()
+                if not isinstance(stream, CheckpointedStream):
+                    # on successful stream run, persist state
+                    STATE.flush_cache()
+                    self.state.save(filename=f"{stream.name}.db")
+            except Exception:
+                Logger.get_logger().exception(
+                    f"Stream {stream.name} failed.", exc_info=1
+                )
+                break
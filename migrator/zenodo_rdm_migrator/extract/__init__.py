@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Zenodo migrator extract."""
 
+from .jsonl import CheckpointedJSONLExtract
 from .kafka import KafkaExtract, KafkaExtractEnd
 
 __all__ = (
+    "CheckpointedJSONLExtract",
     "KafkaExtract",
     "KafkaExtractEnd",
 )
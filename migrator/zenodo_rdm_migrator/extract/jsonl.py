@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""JSONL extraction classes."""
+
+import itertools
+import json
+
+from invenio_rdm_migrator.extract import JSONLExtract
+
+
+class CheckpointedJSONLExtract(JSONLExtract):
+    """JSONL extract reading the entries in batches, from a byte offset.
+
+    The byte offset following each batch is where a resumed extract starts. Without
+    a ``batch_size``, the stream reads the whole file at once and is not resumable.
+    """
+
+    def __init__(self, filepath, batch_size=None):
+        """Constructor."""
+        super().__init__(filepath)
+        self.filepath = filepath
+        self.batch_size = batch_size
+
+    def iter_batches(self, offset=0):
+        """Yield ``(entries, offset)`` pairs, with the offset following the batch."""
+        with open(self.filepath, "rb") as fp:
+            fp.seek(offset)
+            lines = (line for line in iter(fp.readline, b"") if line.strip())
+            while batch := list(itertools.islice(lines, self.batch_size)):
+                yield [json.loads(line) for line in batch], fp.tell()
+
+    def run(self, offset=0):
+        """Yield the entries, from a byte offset."""
+        with open(self.filepath, "rb") as fp:
+            fp.seek(offset)
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
@@ -12,7 +12,7 @@ from invenio_rdm_migrator.extract import Extract, Tx
 from invenio_rdm_migrator.load.postgresql.transactions.operations import OperationType
 from invenio_rdm_migrator.logging import Logger
 from kafka import KafkaConsumer, TopicPartition
-from sortedcontainers import SortedList
+from sortedcontainers import SortedDict, SortedList
 
 
 class _TxState:
@@ -23,10 +23,10 @@ class _TxState:
         self.id = id
         self.commit_lsn = commit_lsn
         self.commit_offset = commit_offset
-        self.info = info
         # We order operations based on the Postgres LSN
         self.ops = SortedList(key=lambda o: o["source"]["lsn"])
         self._op_counts = Counter()
+        self.info = info
 
     @property
     def info(self):
@@ -45,6 +45,12 @@ class _TxState:
                     for c in val["data_collections"]
                 }
             )
+            # Tables whose row counts don't match the transaction info (yet)
+            self._mismatched_tables = {
+                t
+                for t in self._info_counts.keys() | self._op_counts.keys()
+                if self._info_counts[t] != self._op_counts[t]
+            }
         else:
             self._info_counts = None
 
@@ -57,12 +63,18 @@ class _TxState:
         # Update table row counts with the operations so far
         schema = op["source"]["schema"]
         table = op["source"]["table"]
-        self._op_counts.update([f"{schema}.{table}"])
+        table_name = f"{schema}.{table}"
+        self._op_counts[table_name] += 1
+        if self._info_counts is not None:
+            if self._info_counts[table_name] == self._op_counts[table_name]:
+                self._mismatched_tables.discard(table_name)
+            else:
+                self._mismatched_tables.add(table_name)
 
     @property
     def complete(self):
         """True if the available transaction info matches the ops table row counts."""
-        return self.info is not None and self._info_counts == self._op_counts
+        return self._info_counts is not None and not self._mismatched_tables
 
 
 def _load_json(val):
@@ -149,11 +161,15 @@ class KafkaExtract(Extract):
         self.last_tx = last_tx
         self.config = config or {}
         self.tx_registry = {}
+        # Transactions of the registry with a commit LSN, in commit order
+        self._lsn_index = SortedDict()
         self.tx_buffer = tx_buffer
         self.max_tx_info_fetch = max_tx_info_fetch
         self.max_ops_fetch = max_ops_fetch
         self._last_yielded_tx = None
         self._topic_states = {}
+        self._consumers = {}
+        self._uncommitted_consumers = {}
         # TODO: This class probably needs a dedicated logger namespace
         self.logger = Logger.get_logger()
         self._dump_dir = Path(_dump_dir) if _dump_dir else None
@@ -190,29 +206,21 @@ class KafkaExtract(Extract):
             consumer.seek(partition, offset)
         return partitions
 
-    def _seek_committed_offsets(self, consumer, topic):
-        partitions = [
-            TopicPartition(topic, p) for p in consumer.partitions_for_topic(topic)
-        ]
-        offsets = [consumer.committed(p) for p in partitions]
-        consumer.assign(partitions)
-        for partition, offset in zip(partitions, offsets):
-            consumer.seek(partition, offset)
-
     def _get_consumer(self, topic, group_id, offset):
-        consumer = KafkaConsumer(
-            group_id=group_id,
-            **self.DEFAULT_CONSUMER_CFG,
-            **self.config,
-        )
-        if topic not in self._topic_states:
+        """Get the consumer of a topic, created once for the life of the extract."""
+        consumer = self._consumers.get(group_id)
+        if consumer is None:
+            consumer = KafkaConsumer(
+                group_id=group_id,
+                **self.DEFAULT_CONSUMER_CFG,
+                **self.config,
+            )
             self._topic_states[topic] = self._seek_offsets(
                 consumer,
                 topic,
                 target_offset=offset,
             )
-        else:
-            self._seek_committed_offsets(consumer, topic)
+            self._consumers[group_id] = consumer
         return consumer
 
     # NOTE: These two properties are useful for tests/mocking
@@ -232,53 +240,76 @@ class KafkaExtract(Extract):
             self.ops_offset,
         )
 
+    def _commit_offsets(self):
+        """Commit the consumed offsets of the consumers.
+
+        Offsets are committed once per batch of yielded transactions, instead of after
+        every message, since each commit is a round trip to the Kafka brokers.
+        """
+        for consumer in self._uncommitted_consumers.values():
+            consumer.commit()
+        self._uncommitted_consumers.clear()
+
+    def close(self):
+        """Close the Kafka consumers."""
+        for consumer in self._consumers.values():
+            consumer.close()
+        self._consumers.clear()
+
     def iter_tx_info(self):
         """Yield commited transactions info."""
         consumer = self._tx_consumer
         for tx_msg in consumer:
+            self._uncommitted_consumers["tx"] = consumer
             self._dump_msg(self.tx_topic, tx_msg)
 
             if not tx_msg.value:
                 # Sometimes messages don't contain a value... So far it's not been an
                 # issue, but maybe logging in DEBUG could help at some point.
                 self.logger.debug(f"No message value for tx_info {tx_msg}")
-                consumer.commit()
                 continue
 
             tx_id, tx_lsn = map(int, tx_msg.value["id"].split(":"))
             # We drop anything before the configured last transaction ID
             if tx_id <= self.last_tx:
                 self.logger.info(f"Skipped {tx_id} at offset: {tx_msg.offset}")
-                consumer.commit()
                 continue
             if tx_msg.value["status"] == "BEGIN":
                 # ignore BEGIN statements
-                consumer.commit()
                 continue
             elif tx_msg.value["status"] == "END":
-                consumer.commit()
                 yield ((tx_id, tx_lsn, tx_msg.offset), tx_msg.value)
 
     def iter_ops(self):
         """Yields operations/statements."""
         consumer = self._ops_consumer
         for op_msg in consumer:
+            self._uncommitted_consumers["ops"] = consumer
             self._dump_msg(self.ops_topic, op_msg)
 
             if not op_msg.value:
                 self.logger.debug(f"No message value for op {op_msg}")
-                consumer.commit()
                 continue
             tx_id = op_msg.value["source"]["txId"]
             # We drop anything before the configured last transaction ID
             if tx_id <= self.last_tx:
-                consumer.commit()
                 continue
-            consumer.commit()
 
             op_msg.key.pop("__dbz__physicalTableIdentifier", None)
             yield (tx_id, dict(key=op_msg.key, **op_msg.value))
 
+    def _register_tx_info(self, tx_id, commit_lsn, commit_offset, info):
+        """Add the transaction info to the registry, indexing it by commit LSN."""
+        tx_state = self.tx_registry.get(tx_id)
+        if tx_state is None:
+            tx_state = self.tx_registry[tx_id] = _TxState(tx_id)
+        elif tx_state.commit_lsn is not None:
+            del self._lsn_index[(tx_state.commit_lsn, tx_id)]
+        tx_state.info = info
+        tx_state.commit_lsn = commit_lsn
+        tx_state.commit_offset = commit_offset
+        self._lsn_index[(commit_lsn, tx_id)] = tx_state
+
     def _yield_completed_tx(self, min_batch=None, max_batch=None):
         """Yields completed transactions.
 
@@ -293,15 +324,14 @@ class KafkaExtract(Extract):
            to have complete data, so that we can return all the completed transactions
            by their LSN order.
         """
-        lsn_sorted_tx = sorted(
-            self.tx_registry.values(),
-            key=lambda t: (t.commit_lsn is None, t.commit_lsn),
-        )
         completed_tx_batch = []
-        for tx_state in lsn_sorted_tx:
+        next_missing_tx = None
+        # Transactions without a commit LSN come last, and are never complete
+        for tx_state in self._lsn_index.values():
             if not tx_state.complete:
                 # We stop at the first non-completed transaction
                 self.logger.info(f"Earliest incomplete Tx: {tx_state}")
+                next_missing_tx = tx_state
                 break
             completed_tx_batch.append(tx_state)
 
@@ -311,17 +341,21 @@ class KafkaExtract(Extract):
 
         # If we didn't make a big enough batch we return
         if min_batch and len(completed_tx_batch) < min_batch:
-            if len(completed_tx_batch) < len(lsn_sorted_tx):
-                next_missing_tx = lsn_sorted_tx[len(completed_tx_batch)]
+            if next_missing_tx is not None:
                 self.logger.info(f"Couldn't gather {min_batch=}: {next_missing_tx=}")
             return
 
         for tx in completed_tx_batch:
             del self.tx_registry[tx.id]
+            del self._lsn_index[(tx.commit_lsn, tx.id)]
             # Keep track of the last yielded transaction ID
             self._last_yielded_tx = (tx.id, tx.commit_lsn, tx.commit_offset)
             yield Tx(id=tx.id, commit_lsn=tx.commit_lsn, operations=list(tx.ops))
 
+        # The yielded transactions were processed, we can commit the consumed offsets
+        if completed_tx_batch:
+            self._commit_offsets()
+
     def run(self):
         """Return a blocking generator yielding completed transactions."""
         # We're using an (always) SortedDict, since we want to yield transactions in
@@ -337,17 +371,7 @@ class KafkaExtract(Extract):
                     )
                 self.logger.info("Started streaming tx info")
                 for (tx_id, tx_lsn, offset), tx_info in tx_info_stream:
-                    if tx_id in self.tx_registry:
-                        self.tx_registry[tx_id].info = tx_info
-                        self.tx_registry[tx_id].commit_lsn = tx_lsn
-                        self.tx_registry[tx_id].commit_offset = offset
-                    else:
-                        self.tx_registry[tx_id] = _TxState(
-                            tx_id,
-                            commit_lsn=tx_lsn,
-                            commit_offset=offset,
-                            info=tx_info,
-                        )
+                    self._register_tx_info(tx_id, tx_lsn, offset, tx_info)
                 self.logger.info("Stopped streaming tx info")
 
                 # We then consume operations and build up the (pending) transactions in
@@ -376,3 +400,5 @@ class KafkaExtract(Extract):
         except KafkaExtractEnd:
             # Yield any remaining completed transactions
             yield from self._yield_completed_tx()
+        finally:
+            self.close()
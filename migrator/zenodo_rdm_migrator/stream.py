@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Migrator stream definitions."""
 
-from invenio_rdm_migrator.extract import JSONLExtract
 from invenio_rdm_migrator.load.postgresql.transactions import PostgreSQLTx
 from invenio_rdm_migrator.streams import StreamDefinition
 from invenio_rdm_migrator.streams.affiliations import ExistingAffiliationsLoad
@@ -33,7 +32,7 @@ from invenio_rdm_migrator.streams.records import (
 from invenio_rdm_migrator.streams.requests import RequestCopyLoad
 from invenio_rdm_migrator.streams.users import UserCopyLoad
 
-from .extract import KafkaExtract
+from .extract import CheckpointedJSONLExtract, KafkaExtract
 from .transform import (
     ZenodoCommunityTransform,
     ZenodoDeletedRecordTransform,
@@ -45,7 +44,7 @@ from .transform.transactions import ZenodoTxTransform
 
 CommunitiesStreamDefinition = StreamDefinition(
     name="communities",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=ZenodoCommunityTransform,
     load_cls=CommunityCopyLoad,
 )
@@ -53,7 +52,7 @@ CommunitiesStreamDefinition = StreamDefinition(
 
 RecordStreamDefinition = StreamDefinition(
     name="records",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=ZenodoRecordTransform,
     load_cls=RDMRecordCopyLoad,
 )
@@ -61,7 +60,7 @@ RecordStreamDefinition = StreamDefinition(
 
 DraftStreamDefinition = StreamDefinition(
     name="drafts",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=ZenodoRecordTransform,
     load_cls=RDMDraftCopyLoad,
 )
@@ -69,7 +68,7 @@ DraftStreamDefinition = StreamDefinition(
 
 DeletedRecordStreamDefinition = StreamDefinition(
     name="deleted_records",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=ZenodoDeletedRecordTransform,
     load_cls=RDMDeletedRecordCopyLoad,
 )
@@ -85,7 +84,7 @@ VersionStateStreamDefinition = StreamDefinition(
 
 UserStreamDefinition = StreamDefinition(
     name="users",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=ZenodoUserTransform,
     load_cls=UserCopyLoad,
 )
@@ -93,7 +92,7 @@ UserStreamDefinition = StreamDefinition(
 
 RequestStreamDefinition = StreamDefinition(
     name="requests",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=ZenodoRequestTransform,
     load_cls=RequestCopyLoad,
 )
@@ -150,7 +149,7 @@ OAuthClientStreamDefinition = StreamDefinition(
 
 OAuthServerClientStreamDefinition = StreamDefinition(
     name="oauthserver_clients",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=OAuthServerClientTransform,
     load_cls=OAuthServerClientCopyLoad,
 )
@@ -158,7 +157,7 @@ OAuthServerClientStreamDefinition = StreamDefinition(
 
 OAuthServerTokenStreamDefinition = StreamDefinition(
     name="oauthserver_tokens",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=OAuthServerTokenTransform,
     load_cls=OAuthServerTokenCopyLoad,
 )
@@ -182,7 +181,7 @@ GitHubRepositoriesStreamDefinition = StreamDefinition(
 
 GitHubReleasesStreamDefinition = StreamDefinition(
     name="github_releases",
-    extract_cls=JSONLExtract,
+    extract_cls=CheckpointedJSONLExtract,
     transform_cls=GitHubReleaseTransform,
     load_cls=GitHubReleasesCopyLoad,
 )
@@ -13,9 +13,10 @@ from .entries.communities import (
     ZenodoFeaturedCommunityEntry,
     ZenodoOAISetEntry,
 )
+from .parallel import ParallelTransformMixin
 
 
-class ZenodoCommunityTransform(CommunityTransform):
+class ZenodoCommunityTransform(ParallelTransformMixin, CommunityTransform):
     """Zenodo to RDM Community class for data transformation."""
 
     def _community(self, entry):
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Zenodo migrator parallel transform."""
+
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+_worker_transform = None
+"""Transform of a worker process, set once when the worker starts."""
+
+
+def _init_worker(transform):
+    """Set the transform of a worker process."""
+    global _worker_transform
+    _worker_transform = transform
+
+
+def _transform_chunk(entries):
+    """Transform a chunk of entries in a worker process.
+
+    Returns a ``(transformed, result)`` pair per entry, in order. Failed entries are
+    reported as not transformed, their errors are handled by the caller.
+    """
+    results = []
+    for entry in entries:
+        try:
+            results.append((True, _worker_transform._transform(entry)))
+        except Exception:
+            results.append((False, None))
+    return results
+
+
+class ParallelTransformMixin:
+    """Run the transform of the entries in a pool of worker processes.
+
+    The entries are sent to the workers in chunks, and the transformed entries are
+    yielded in the order of the extract. An entry that fails in a worker is
+    transformed again through the serial ``run``, so that its error is handled in
+    the same way as without workers.
+
+    With no ``workers``, or a single one, the entries are transformed serially.
+
+    Each run starts its own pool of workers, unless it runs within ``worker_pool``,
+    e.g. the batches of a checkpointed stream, which all use the same pool.
+    """
+
+    def __init__(self, workers=None, chunk_size=500, **kwargs):
+        """Constructor."""
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor = None
+        super().__init__(**kwargs)
+
+    def __getstate__(self):
+        """Pickle the transform for the workers, without the pool."""
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    @contextmanager
+    def worker_pool(self):
+        """Keep a pool of worker processes for the runs within the context."""
+        if not self.workers or self.workers <= 1 or self._executor is not None:
+            yield
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            self._executor = executor
+            try:
+                yield
+            finally:
+                self._executor = None
+
+    def _iter_chunks(self, entries):
+        entries = iter(entries)
+        while chunk := list(itertools.islice(entries, self.chunk_size)):
+            yield chunk
+
+    def run(self, entries):
+        """Transform and yield the entries, in order."""
+        if not self.workers or self.workers <= 1:
+            yield from super().run(entries)
+            return
+
+        with self.worker_pool():
+            executor = self._executor
+            chunks = self._iter_chunks(entries)
+            pending = deque()
+            # Keep the workers busy, without reading the whole extract in memory
+            for chunk in itertools.islice(chunks, 2 * self.workers):
+                pending.append((chunk, executor.submit(_transform_chunk, chunk)))
+            while pending:
+                chunk, future = pending.popleft()
+                results = future.result()
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    pending.append(
+                        (next_chunk, executor.submit(_transform_chunk, next_chunk))
+                    )
+                for entry, (transformed, result) in zip(chunk, results):
+                    if transformed:
+                        yield result
+                    else:
+                        yield from super().run([entry])
@@ -8,9 +8,10 @@ from zenodo_rdm_migrator.errors import InvalidTombstoneRecord
 
 from .entries.parents import ZENODO_DATACITE_PREFIXES, ParentRecordEntry
 from .entries.records.records import ZenodoDraftEntry, ZenodoRecordEntry
+from .parallel import ParallelTransformMixin
 
 
-class ZenodoRecordTransform(RDMRecordTransform):
+class ZenodoRecordTransform(ParallelTransformMixin, RDMRecordTransform):
     """Zenodo to RDM Record class for data transformation."""
 
     def __init__(self, partial=False, **kwargs):
@@ -58,7 +59,7 @@ class ZenodoRecordTransform(RDMRecordTransform):
         }
 
 
-class ZenodoDeletedRecordTransform(RDMRecordTransform):
+class ZenodoDeletedRecordTransform(ParallelTransformMixin, RDMRecordTransform):
     """Zenodo to RDM Record class for data transformation."""
 
     REMOVAL_REASONS_MAPPING = {
@@ -5,9 +5,10 @@
 from invenio_rdm_migrator.streams.requests import RequestTransform
 
 from .entries.requests import ZenodoRequestEntry
+from .parallel import ParallelTransformMixin
 
 
-class ZenodoRequestTransform(RequestTransform):
+class ZenodoRequestTransform(ParallelTransformMixin, RequestTransform):
     """Transform a Zenodo request into RDM."""
 
     def _request(self, entry):
@@ -3,7 +3,9 @@
 """Zenodo migrator actions transform."""
 
 
+from invenio_rdm_migrator.load.postgresql.transactions.operations import OperationType
 from invenio_rdm_migrator.transform import BaseTxTransform
+from invenio_rdm_migrator.transform.errors import MultipleActionMatches, NoActionMatch
 
 from ..actions.transform import (
     COMMUNITY_ACTIONS,
@@ -16,6 +18,97 @@ from ..actions.transform import (
 )
 
 
+def _op_value(op_type):
+    """Value of an operation type, as ``OperationType`` members are not hashable."""
+    return OperationType(op_type.upper()).value
+
+
+def _ops_signature(tx):
+    """Set of the ``(table, operation type value)`` pairs of a transaction."""
+    return frozenset(
+        (op["source"]["table"], _op_value(op["op"])) for op in tx.operations
+    )
+
+
+def _declared_signature(pairs):
+    """Hashable set of declared ``(table, operation type)`` pairs."""
+    if pairs is None:
+        return None
+    return frozenset(
+        (table, None if op_type is None else _op_value(op_type))
+        for table, op_type in pairs
+    )
+
+
+def _allows(ops_signature, table, op_type):
+    """True if a declared signature allows an operation."""
+    return (table, op_type) in ops_signature or (table, None) in ops_signature
+
+
+def _contains(signature, table, op_type):
+    """True if a transaction signature contains a required operation."""
+    if op_type is None:
+        return any(t == table for t, _ in signature)
+    return (table, op_type) in signature
+
+
+class ActionIndex:
+    """Index of the actions that can match a transaction, by its ops signature.
+
+    Actions declare the ``(table, operation type)`` pairs of the transactions they
+    match, with ``None`` standing for any operation type on the table, as either:
+
+    - ``ops_signature``: the pairs a matching transaction can only consist of.
+    - ``ops_required``: the pairs a matching transaction must contain.
+
+    Actions declaring neither are candidates for every transaction. The candidates
+    of each signature are computed once, and keep the order of the actions.
+
+    The declared pairs duplicate the checks of ``matches_action``, and must allow
+    every transaction it matches. A new action declaring a narrower signature is
+    never checked for these transactions, and they fail with ``NoActionMatch``.
+    ``test_candidates_match_every_action`` checks the recorded transactions of the
+    action tests.
+    """
+
+    def __init__(self, actions):
+        """Constructor."""
+        self.actions = list(actions)
+        self._declared = {
+            action: (
+                _declared_signature(getattr(action, "ops_signature", None)),
+                _declared_signature(getattr(action, "ops_required", None)),
+            )
+            for action in self.actions
+        }
+        self._candidates = {}
+
+    def _is_candidate(self, action, signature):
+        ops_signature, ops_required = self._declared[action]
+        if ops_signature is not None and not all(
+            _allows(ops_signature, table, op_type) for table, op_type in signature
+        ):
+            return False
+        if ops_required is not None and not all(
+            _contains(signature, table, op_type) for table, op_type in ops_required
+        ):
+            return False
+        return True
+
+    def candidates(self, tx):
+        """Get the actions that can match a transaction."""
+        try:
+            signature = _ops_signature(tx)
+        except ValueError:
+            # Unknown operation type, let all the actions decide
+            return self.actions
+        candidates = self._candidates.get(signature)
+        if candidates is None:
+            candidates = [a for a in self.actions if self._is_candidate(a, signature)]
+            self._candidates[signature] = candidates
+        return candidates
+
+
 class ZenodoTxTransform(BaseTxTransform):
     """Zenodo transaction transform."""
 
@@ -28,3 +121,28 @@ class ZenodoTxTransform(BaseTxTransform):
         *USER_ACTIONS,
         *IGNORED_ACTIONS,
     ]
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super().__init__(*args, **kwargs)
+        self.action_index = ActionIndex(type(self).actions)
+
+    def _detect_action(self, tx):
+        """Detect the action of a transaction, only checking its candidate actions."""
+        match_classes = [
+            action_cls
+            for action_cls in self.action_index.candidates(tx)
+            if action_cls.matches_action(tx)
+        ]
+
+        if len(match_classes) == 0:
+            self.failed_tx_logger.error("No action match.", extra={"tx": tx})
+            raise NoActionMatch(tx)
+        elif len(match_classes) > 1:
+            self.failed_tx_logger.error(
+                "Multiple action matches.",
+                extra={"tx": tx, "matches": match_classes},
+            )
+            raise MultipleActionMatches(tx, match_classes)
+
+        return match_classes[0]
@@ -5,9 +5,10 @@
 from invenio_rdm_migrator.streams.users import UserTransform
 
 from .entries.users import ZenodoUserEntry
+from .parallel import ParallelTransformMixin
 
 
-class ZenodoUserTransform(UserTransform):
+class ZenodoUserTransform(ParallelTransformMixin, UserTransform):
     """Zenodo user transform."""
 
     def _user(self, entry):
@@ -1,5 +1,8 @@
 """Generate IIIF tiles for a list of records.
 
+Prefer the ``generate_iiif_tiles`` job, which selects the records without tiles
+itself, processes them in parallel and can be re-run after a failure.
+
 Generated using the following SQL script:
 
 ```sql
@@ -37,33 +40,10 @@ order by p.pid_value::int
 ) TO '/root/rec_iiif.csv' WITH (FORMAT CSV, HEADER)
 ```
 """
-from invenio_rdm_records.proxies import current_rdm_records_service as service
-from invenio_rdm_records.records.processors.tiles import TilesProcessor
-from invenio_records_resources.services.files.processors.image import ImageMetadataExtractor
-from invenio_records_resources.services.uow import UnitOfWork, RecordCommitOp
-import sys
 import csv
+import sys
 
-
-image_metadata_extractor = ImageMetadataExtractor()
-
-def generate_iiif_tiles(recid):
-    with UnitOfWork() as uow:
-        record = service.record_cls.pid.resolve(recid)
-        processor = TilesProcessor()
-        # Call the processor on the record
-        processor(None, record, uow=uow)
-        uow.register(RecordCommitOp(record))
-
-        # Calculate image dimensions for each supported image file
-        # NOTE: This happens "synchronously", but VIPS is pretty fast and doesn't load
-        # the entire image in memory.
-        for file_record in record.files.values():
-            if image_metadata_extractor.can_process(file_record):
-                image_metadata_extractor.process(file_record)
-                file_record.commit()
-        uow.commit()
-
+from zenodo_rdm.iiif.tasks import generate_record_tiles
 
 
 def process_csv(csv_path):
@@ -72,7 +52,7 @@ def process_csv(csv_path):
         for recid, *_ in reader:
             print(f"Processing record {recid}")
             try:
-                generate_iiif_tiles(recid)
+                generate_record_tiles(recid)
                 print(f"Record {recid} processed")
             except Exception as e:
                 print(f"Error processing record {recid}: {e}")
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Community metrics tests."""
+
+import pytest
+from flask import g
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
+from invenio_communities.communities.records.api import Community
+from invenio_records_resources.services.uow import TaskOp
+
+from zenodo_rdm.communities_ui import metrics, tasks
+from zenodo_rdm.communities_ui.components import CommunityMetricsComponent
+from zenodo_rdm.communities_ui.metrics import cache_key, get_community_metrics
+from zenodo_rdm.communities_ui.tasks import update_community_metrics
+from zenodo_rdm.communities_ui.views import communities as views
+
+
+def _set_theme(community, theme):
+    record = Community.get_record(community.id)
+    record.theme = theme
+    record.commit()
+    current_cache.delete(cache_key(community.id))
+    current_cache.delete(f"{cache_key(community.id)}:scheduled")
+    return record
+
+
+@pytest.fixture()
+def themed_community(community, db):
+    """Community with an enabled theme."""
+    _set_theme(community, {"enabled": True, "brand": "horizon", "style": {}})
+    db.session.commit()
+    return community
+
+
+@pytest.fixture()
+def community_record(publish_record, minimal_record, themed_community):
+    """Public record of the themed community."""
+    return publish_record(
+        dict(minimal_record, access={"record": "public", "files": "public"}),
+        community=themed_community,
+    )
+
+
+class RecordedUnitOfWork:
+    """Unit of work keeping the registered operations."""
+
+    def __init__(self):
+        """Constructor."""
+        self.ops = []
+
+    def register(self, op):
+        self.ops.append(op)
+
+
+def test_component_only_themed_communities(
+    themed_community, community2, community_record
+):
+    """Metrics updates are only sent for the themed communities, once."""
+    record = community_record._record
+    record.parent.communities.add(community2._record)
+
+    uow = RecordedUnitOfWork()
+    component = CommunityMetricsComponent(service=None)
+    component.uow = uow
+    component.publish(system_identity, record=record)
+    assert [(op._celery_task, op._kwargs) for op in uow.ops] == [
+        (update_community_metrics, {"community_id": str(themed_community.id)})
+    ]
+    assert all(isinstance(op, TaskOp) for op in uow.ops)
+
+    # Updates are throttled during a burst of publications
+    uow.ops.clear()
+    component.publish(system_identity, record=record)
+    assert uow.ops == []
+
+
+def test_update_community_metrics_task(themed_community, community_record, db):
+    """The task stores the metrics, and removes them once the theme is disabled."""
+    update_community_metrics.delay(str(themed_community.id))
+    stored = get_community_metrics(themed_community.id, "horizon")
+    assert stored["total_records"] == 1
+    assert set(stored) == {"total_records", "total_data", "total_grants"}
+    # The metrics of another brand are not served
+    assert get_community_metrics(themed_community.id, "nih") is None
+
+    _set_theme(themed_community, {"enabled": False})
+    db.session.commit()
+    update_community_metrics.delay(str(themed_community.id))
+    assert current_cache.get(cache_key(themed_community.id)) is None
+
+
+def test_update_themed_communities_metrics_keeps_going(themed_community, monkeypatch):
+    """A failing community does not stop the update of the others."""
+    updated = []
+
+    def update(community_id):
+        updated.append(community_id)
+        raise RuntimeError("Search failed.")
+
+    monkeypatch.setattr(
+        metrics, "themed_community_ids", lambda: ["failing", str(themed_community.id)]
+    )
+    monkeypatch.setattr(metrics, "update_community_metrics", update)
+    tasks.update_themed_communities_metrics.delay()
+    assert updated == ["failing", str(themed_community.id)]
+
+
+def _render_home(community, monkeypatch):
+    rendered = {}
+
+    def render(template, **kwargs):
+        rendered.update(kwargs)
+        return ""
+
+    monkeypatch.setattr(views, "render_community_theme_template", render)
+    g.identity = system_identity
+    views.communities_home(pid_value=community.data["slug"])
+    return rendered["metrics"]
+
+
+def test_view_computes_metrics_on_cold_cache(
+    test_app, themed_community, community_record, monkeypatch
+):
+    """The first request on a cold cache computes and stores the metrics."""
+    assert get_community_metrics(themed_community.id, "horizon") is None
+
+    rendered = _render_home(themed_community, monkeypatch)
+    assert rendered["total_records"] == 1
+    assert get_community_metrics(themed_community.id, "horizon") == rendered
+
+    # The next requests read the stored metrics
+    monkeypatch.setattr(metrics, "compute_community_metrics", None)
+    assert _render_home(themed_community, monkeypatch) == rendered
+
+
+def test_view_defaults_while_computing(
+    test_app, themed_community, community_record, monkeypatch
+):
+    """Concurrent requests on a cold cache render the default metrics."""
+    lock_key = f"{cache_key(themed_community.id)}:computing"
+    current_cache.set(lock_key, True, timeout=60)
+    try:
+        rendered = _render_home(themed_community, monkeypatch)
+    finally:
+        current_cache.delete(lock_key)
+
+    assert rendered == {"total_records": 1, "total_data": 0, "total_grants": 0}
+    assert get_community_metrics(themed_community.id, "horizon") is None
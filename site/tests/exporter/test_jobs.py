@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Exporter jobs tests."""
+
+from datetime import datetime, timezone
+
+from zenodo_rdm.exporter.jobs import ExportRecords, ExportRecordsDelta
+
+
+def test_export_records_delta_arguments(app):
+    since = datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+    args = ExportRecordsDelta.build_task_arguments(None, since=since)
+
+    assert args == {
+        **ExportRecords.build_task_arguments(None),
+        "delta": True,
+        "since": "2025-03-01T12:30:00+00:00",
+    }
+
+
+def test_export_records_delta_first_run(app):
+    # without a previous successful run, every record goes in the delta files
+    args = ExportRecordsDelta.build_task_arguments(None, since=None)
+
+    assert args["delta"] is True
+    assert "since" not in args
@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Exporter tasks tests."""
+
+import gzip
+import json
+import tarfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from types import SimpleNamespace
+
+import pytest
+from invenio_files_rest.models import ObjectVersion
+from invenio_jobs.models import Job, Run, RunStatusEnum
+from invenio_search.api import dsl
+
+from zenodo_rdm.exporter import tasks
+from zenodo_rdm.exporter.tasks import (
+    _create_object_version,
+    _create_or_get_bucket,
+    _export_records_to_files,
+    _iter_serialized,
+    _open_object,
+    _remove_old_delta_files,
+    export_records,
+    export_shards_failed,
+)
+
+RECORDS = [{"id": f"rec-{i}", "title": f"Record {i}"} for i in range(10)]
+DELETED = ["del-0", "del-1", "del-2"]
+
+
+def _fake_export_records_to_files(
+    format, community_slug, records_file, deleted_file, slice=None, since=None
+):
+    """Export the records of a slice, without a search index."""
+    start, step = (slice["id"], slice["max"]) if slice else (0, 1)
+    deleted_file.write(b"record_id\n")
+    for record_id in DELETED[start::step]:
+        deleted_file.write(f"{record_id}\n".encode())
+    for record in RECORDS[start::step]:
+        content = json.dumps(record).encode()
+        tar_info = tarfile.TarInfo(f"{record['id']}.{format}")
+        tar_info.size = len(content)
+        records_file.addfile(tar_info, fileobj=BytesIO(content))
+
+
+@pytest.fixture()
+def fake_export(monkeypatch, location):
+    """Export fixed records, split by slice."""
+    monkeypatch.setattr(
+        tasks, "_export_records_to_files", _fake_export_records_to_files
+    )
+
+
+def _read_export(format="json"):
+    bucket = _create_or_get_bucket()
+    with (
+        _open_object(bucket, f"records-{format}.tar.gz") as fp,
+        tarfile.open(fileobj=fp, mode="r|gz") as records_file,
+    ):
+        records = {
+            tar_info.name: records_file.extractfile(tar_info).read()
+            for tar_info in records_file
+        }
+    with (
+        _open_object(bucket, "records-deleted.csv.gz") as fp,
+        gzip.GzipFile(fileobj=fp, mode="r") as deleted_file,
+    ):
+        deleted = deleted_file.read().decode().splitlines()
+    return records, deleted
+
+
+def _keys():
+    return {o.key for o in ObjectVersion.query.all()}
+
+
+def test_sharded_export_matches_unsharded(app, db, fake_export):
+    export_records("json", None)
+    expected_records, expected_deleted = _read_export()
+    assert len(expected_records) == len(RECORDS)
+
+    export_records("json", None, shards=3)
+    records, deleted = _read_export()
+
+    assert records == expected_records
+    # a single header, followed by the rows of every shard
+    assert deleted[0] == expected_deleted[0] == "record_id"
+    assert sorted(deleted[1:]) == sorted(expected_deleted[1:])
+    # the shard files are removed once merged
+    assert not any("/shards/" in key or key.startswith("shards/") for key in _keys())
+
+
+def test_export_spools_to_disk(app, db, fake_export, monkeypatch, tmp_path):
+    export_records("json", None)
+    expected = _read_export()
+
+    spools = []
+
+    class RecordedSpool(SpooledTemporaryFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            spools.append(self)
+
+    monkeypatch.setattr(tasks, "SpooledTemporaryFile", RecordedSpool)
+    monkeypatch.setitem(app.config, "EXPORTER_SPOOL_MAX_SIZE", 16)
+    monkeypatch.setitem(app.config, "EXPORTER_SPOOL_DIR", str(tmp_path))
+    export_records("json", None)
+
+    # the records and deleted files were larger than the limit
+    assert len(spools) == 2
+    assert all(spool._rolled for spool in spools)
+    assert all(spool._TemporaryFileArgs["dir"] == str(tmp_path) for spool in spools)
+    assert _read_export() == expected
+
+
+def _job_run(db, **kwargs):
+    job = Job(title="Export records", task="export_records", default_queue="celery")
+    run = Run(job=job, queue="celery", **kwargs)
+    db.session.add_all([job, run])
+    db.session.commit()
+    return run
+
+
+def test_sharded_export_job_run(app, db, fake_export, monkeypatch):
+    run = _job_run(db, status=RunStatusEnum.RUNNING)
+    monkeypatch.setattr(tasks, "_current_job_run_id", lambda: str(run.id))
+
+    export_records("json", None, shards=2)
+
+    run = Run.query.filter_by(id=run.id).one()
+    assert run.status == RunStatusEnum.SUCCESS
+    assert run.finished_at is not None
+    assert run.message is None
+
+
+def test_sharded_export_failure(app, db, fake_export):
+    # marked as successful by the job once the shards were dispatched
+    run = _job_run(db, status=RunStatusEnum.SUCCESS, finished_at=datetime.utcnow())
+    tasks.export_records_shard("json", None, 0, 2)
+    assert "shards/json/0/records-json.tar.gz" in _keys()
+
+    export_shards_failed(
+        SimpleNamespace(id="shard-1"),
+        ValueError("search timed out"),
+        None,
+        "json",
+        None,
+        2,
+        run_id=str(run.id),
+    )
+
+    run = Run.query.filter_by(id=run.id).one()
+    assert run.status == RunStatusEnum.FAILED
+    assert run.message == "ValueError: search timed out"
+    assert not any(key.startswith("shards/") for key in _keys())
+
+
+class FailingExecutor:
+    """Executor running the batches in-process, failing the second one."""
+
+    instances = 0
+
+    def __init__(self, **kwargs):
+        """Constructor."""
+        FailingExecutor.instances += 1
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if self.submitted == 2:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture()
+def serialization_pool(app, monkeypatch):
+    """Serialize in a fake pool of 2 workers, in batches of 3 records."""
+    monkeypatch.setitem(app.config, "EXPORTER_SERIALIZATION_WORKERS", 2)
+    monkeypatch.setitem(app.config, "EXPORTER_SERIALIZATION_BATCH_SIZE", 3)
+    monkeypatch.setattr(tasks, "ProcessPoolExecutor", FailingExecutor)
+    monkeypatch.setattr(
+        tasks, "_serialize_record", lambda format, record: record["title"].encode()
+    )
+    FailingExecutor.instances = 0
+
+
+def test_serialization_batch_failure(serialization_pool):
+    result = list(_iter_serialized("xml", RECORDS))
+
+    # the failed batch was serialized again in-process, in order
+    assert result == [(r["id"], r["title"].encode()) for r in RECORDS]
+    assert FailingExecutor.instances == 1
+
+
+def test_serialization_in_daemonic_process(serialization_pool, monkeypatch):
+    monkeypatch.setattr(
+        tasks.multiprocessing, "current_process", lambda: SimpleNamespace(daemon=True)
+    )
+
+    result = list(_iter_serialized("xml", RECORDS))
+
+    assert result == [(r["id"], r["title"].encode()) for r in RECORDS]
+    assert FailingExecutor.instances == 0
+
+
+def test_export_since_filter(app, db, location, monkeypatch):
+    scans = []
+
+    def _scan(*args, **kwargs):
+        scans.append(kwargs)
+        return SimpleNamespace(hits=[])
+
+    monkeypatch.setattr(tasks, "_scan_with_scroll", _scan)
+    since = "2025-03-01T10:30:00+00:00"
+    for kwargs in ({}, {"since": since}):
+        with (
+            BytesIO() as records_stream,
+            BytesIO() as deleted_stream,
+            tarfile.open(fileobj=records_stream, mode="w|gz") as records_file,
+            gzip.GzipFile(fileobj=deleted_stream, mode="w") as deleted_file,
+        ):
+            _export_records_to_files("json", None, records_file, deleted_file, **kwargs)
+
+    assert scans[0]["extra_filter"] is None
+    # deleted records are included, as deleting a record bumps its `updated`
+    assert scans[1]["extra_filter"] == dsl.Q("range", updated={"gt": since})
+    assert scans[1]["params"]["include_deleted"] is True
+
+
+def test_export_since_delta_files(app, db, fake_export, monkeypatch):
+    exports = []
+
+    def _export(*args, since=None, **kwargs):
+        exports.append(since)
+        _fake_export_records_to_files(*args, since=since, **kwargs)
+
+    monkeypatch.setattr(tasks, "_export_records_to_files", _export)
+    export_records("json", None, since="2025-03-01T12:30:00+02:00")
+
+    assert exports == ["2025-03-01T10:30:00+00:00"]
+    keys = _keys()
+    assert any(key.startswith("records-json-delta-") for key in keys)
+    assert any(key.startswith("records-deleted-delta-") for key in keys)
+    # the full export files are left untouched
+    assert "records-json.tar.gz" not in keys
+
+
+def test_remove_old_delta_files(app, db, location):
+    bucket = _create_or_get_bucket()
+    delta_keys = [
+        f"records-json-delta-2025-{month:02}-{day:02}T000000Z.tar.gz"
+        for month in (1, 2)
+        for day in range(1, 21)
+    ]
+    for key in [*delta_keys, "records-deleted-delta-2025-01-01T000000Z.csv.gz"]:
+        _create_object_version(bucket, BytesIO(b"data"), key, "application/gzip")
+
+    _remove_old_delta_files(bucket, delta_keys[-1])
+
+    keys = _keys()
+    # the 30 most recent of the same kind are kept
+    assert {k for k in keys if k.startswith("records-json-")} == set(delta_keys[-30:])
+    assert "records-deleted-delta-2025-01-01T000000Z.csv.gz" in keys
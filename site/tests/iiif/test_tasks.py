@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""IIIF tiles generation tasks tests."""
+
+import uuid
+
+import pytest
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from invenio_rdm_records.records.models import (
+    RDMFileRecordMetadata,
+    RDMMediaFileRecordMetadata,
+    RDMParentMetadata,
+    RDMRecordMetadata,
+)
+
+from zenodo_rdm.iiif import tasks
+from zenodo_rdm.iiif.tasks import generate_iiif_tiles, iter_records_to_tile
+
+
+def _create_record(db, recid, files, tiles=None):
+    """Create a record with files and the status of their tiles."""
+    parent = RDMParentMetadata(id=uuid.uuid4(), json={})
+    record = RDMRecordMetadata(id=uuid.uuid4(), parent_id=parent.id, json={})
+    db.session.add_all([parent, record])
+    db.session.flush()
+    PersistentIdentifier.create(
+        "recid",
+        recid,
+        object_type="rec",
+        object_uuid=record.id,
+        status=PIDStatus.REGISTERED,
+    )
+    for key in files:
+        db.session.add(RDMFileRecordMetadata(record_id=record.id, key=key, json={}))
+    for key, status in (tiles or {}).items():
+        db.session.add(
+            RDMMediaFileRecordMetadata(
+                record_id=record.id,
+                key=f"{key}.ptif",
+                json={"processor": {"type": "image-tiles", "status": status}},
+            )
+        )
+    db.session.commit()
+
+
+@pytest.fixture()
+def records_to_tile(db):
+    """Records with images, in different tiling states."""
+    _create_record(db, "1", ["a.png"])
+    _create_record(db, "2", ["a.png", "b.JPG"], tiles={"a.png": "finished"})
+    _create_record(db, "3", ["a.png"], tiles={"a.png": "finished"})
+    _create_record(db, "4", ["data.csv"])
+    _create_record(db, "5", ["a.tif"], tiles={"a.tif": "failed"})
+    _create_record(db, "6", ["a.png"], tiles={"a.png": "init"})
+    _create_record(db, "7", ["a.png", "b.png"])
+    return {"1", "2", "5", "6", "7"}
+
+
+def test_records_to_tile(app, records_to_tile):
+    """Only records with images without finished tiles are selected."""
+    recids = [recid for batch in iter_records_to_tile(10) for recid in batch]
+    assert sorted(recids) == sorted(records_to_tile)
+
+
+def test_records_to_tile_pages(app, records_to_tile):
+    """The records are paged, once each, and the paging can stop early."""
+    batches = list(iter_records_to_tile(2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    recids = [recid for batch in batches for recid in batch]
+    assert sorted(recids) == sorted(records_to_tile)
+
+    batches = list(iter_records_to_tile(2, max_records=3))
+    assert [len(b) for b in batches] == [2, 1]
+    assert recids[:3] == [recid for batch in batches for recid in batch]
+
+
+def test_records_to_tile_resumes(app, db, records_to_tile):
+    """Re-running after some records were tiled only picks up the rest."""
+    first, *_ = iter_records_to_tile(2)
+    for recid in first:
+        pid = PersistentIdentifier.get("recid", recid)
+        files = RDMFileRecordMetadata.query.filter_by(record_id=pid.object_uuid)
+        for file in files:
+            media = RDMMediaFileRecordMetadata.query.filter_by(
+                record_id=pid.object_uuid, key=f"{file.key}.ptif"
+            ).one_or_none()
+            if media is None:
+                media = RDMMediaFileRecordMetadata(
+                    record_id=pid.object_uuid, key=f"{file.key}.ptif"
+                )
+                db.session.add(media)
+            media.json = {"processor": {"type": "image-tiles", "status": "finished"}}
+    db.session.commit()
+
+    recids = [recid for batch in iter_records_to_tile(2) for recid in batch]
+    assert sorted(recids) == sorted(records_to_tile - set(first))
+
+
+def test_generate_iiif_tiles(app, records_to_tile, monkeypatch):
+    """The job tiles all the records, and reports the outcome of the tiles."""
+    outcomes = {"1": (1, 0), "2": (1, 0), "5": (0, 1), "7": (2, 0)}
+
+    def generate_record_tiles(recid):
+        if recid not in outcomes:
+            raise RuntimeError("Record failed.")
+        return outcomes[recid]
+
+    reports = []
+    report_if_done = tasks._report_if_done
+
+    def _report_if_done(run_id):
+        info = report_if_done(run_id)
+        if info:
+            reports.append(info)
+        return info
+
+    monkeypatch.setattr(tasks, "generate_record_tiles", generate_record_tiles)
+    monkeypatch.setattr(tasks, "_report_if_done", _report_if_done)
+
+    generate_iiif_tiles.delay(batch_size=2)
+
+    assert len(reports) == 1
+    report = reports[0]
+    assert report["processed"] == 5
+    # Record 5 has a failed file, and record 6 failed
+    assert report["failed"] == 2
+    assert report["tiles"] == 4
+    assert report["tiles_failed"] == 1
+    assert report["records_per_second"] > 0
+
+    # A batch finishing late doesn't report again
+    assert tasks._report_if_done(report["run_id"]) is None
+
+
+def test_generate_iiif_tiles_no_records(app, db):
+    """Nothing is sent when there are no records to tile."""
+    _create_record(db, "1", ["a.png"], tiles={"a.png": "finished"})
+    assert generate_iiif_tiles.delay().result is None
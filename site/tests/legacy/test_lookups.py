@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test the cached lookups of the legacy Files-REST API."""
+
+from io import BytesIO
+
+from flask import current_app
+from invenio_cache import current_cache
+
+from zenodo_rdm.legacy import lookups
+from zenodo_rdm.legacy.lookups import (
+    bucket_cache_key,
+    files_cache_key,
+    missing_files_cache_key,
+)
+
+DEPOSIT_DATA = {
+    "metadata": {
+        "upload_type": "dataset",
+        "title": "Legacy lookups",
+        "creators": [{"name": "Doe, John"}],
+        "publication_date": "2020-01-01",
+        "description": "Legacy lookups",
+        "access_right": "open",
+    }
+}
+
+
+def test_lookups_invalidated_on_publish(
+    test_app, client, headers, files_headers, deposit_url, uploader
+):
+    """Test that the bucket and file lookups are cached until publishing."""
+    client = uploader.api_login(client)
+    files_service = current_app.extensions[
+        "zenodo-rdm-legacy"
+    ].legacy_records_service.draft_files
+
+    res = client.post(deposit_url, json=DEPOSIT_DATA, headers=headers)
+    assert res.status_code == 201, res.json
+    recid = str(res.json["id"])
+    links = res.json["links"]
+    bucket_url = links["bucket"]
+    bucket_id = bucket_url.rsplit("/", 1)[-1]
+
+    res = client.put(
+        f"{bucket_url}/data.csv", headers=files_headers, data=BytesIO(b"1, 2, 3")
+    )
+    assert res.status_code == 201, res.json
+    res = client.get(bucket_url, headers=headers)
+    assert res.status_code == 200, res.json
+    cls_name, pid_value, _ = current_cache.get(bucket_cache_key(bucket_id))
+    assert (cls_name, pid_value) == ("draft", recid)
+
+    res = client.get(links["files"], headers=headers)
+    file_id = res.json[0]["id"]
+    assert files_service.get_file_key_by_id(recid, file_id) == "data.csv"
+    assert current_cache.get(files_cache_key(recid)) == {file_id: "data.csv"}
+
+    res = client.post(links["publish"])
+    assert res.status_code == 202, res.json
+    assert current_cache.get(bucket_cache_key(bucket_id)) is None
+    assert current_cache.get(files_cache_key(recid)) is None
+
+    res = client.get(f"{bucket_url}/data.csv", headers=headers)
+    assert res.status_code == 200
+    assert files_service.get_file_key_by_id(recid, file_id) == "data.csv"
+    assert files_service.get_file_key_by_id(recid, "unknown") is None
+
+
+def test_file_lookups_invalidated_on_file_changes(
+    test_app, client, headers, files_headers, deposit_url, uploader, monkeypatch
+):
+    """Test that file keys and misses are cached until the files change."""
+    client = uploader.api_login(client)
+    files_service = current_app.extensions[
+        "zenodo-rdm-legacy"
+    ].legacy_records_service.draft_files
+    queries = []
+    query_file_keys = lookups._query_file_keys
+
+    def _query_file_keys(*args):
+        queries.append(args[0])
+        return query_file_keys(*args)
+
+    monkeypatch.setattr(lookups, "_query_file_keys", _query_file_keys)
+
+    res = client.post(deposit_url, json=DEPOSIT_DATA, headers=headers)
+    assert res.status_code == 201, res.json
+    recid = str(res.json["id"])
+    links = res.json["links"]
+    bucket_url = links["bucket"]
+    res = client.put(
+        f"{bucket_url}/data.csv", headers=files_headers, data=BytesIO(b"1, 2, 3")
+    )
+    assert res.status_code == 201, res.json
+    res = client.get(links["files"], headers=headers)
+    file_id = res.json[0]["id"]
+
+    queries.clear()
+    assert files_service.get_file_key_by_id(recid, file_id) == "data.csv"
+    assert files_service.get_file_key_by_id(recid, file_id) == "data.csv"
+    assert files_service.get_file_key_by_id(recid, "unknown") is None
+    assert files_service.get_file_key_by_id(recid, "unknown") is None
+    # One query for the file keys, and one for the unknown file
+    assert queries == [recid, recid]
+    assert current_cache.get(missing_files_cache_key(recid)) == {"unknown"}
+
+    # Committing a file invalidates the file keys and the misses
+    res = client.put(
+        f"{bucket_url}/other.csv", headers=files_headers, data=BytesIO(b"4, 5")
+    )
+    assert res.status_code == 201, res.json
+    assert current_cache.get(files_cache_key(recid)) is None
+    assert current_cache.get(missing_files_cache_key(recid)) is None
+
+    assert files_service.get_file_key_by_id(recid, file_id) == "data.csv"
+    assert current_cache.get(files_cache_key(recid)) is not None
+
+    # So does deleting a file
+    res = client.delete(f"{bucket_url}/data.csv", headers=headers)
+    assert res.status_code == 204
+    assert current_cache.get(files_cache_key(recid)) is None
+    assert files_service.get_file_key_by_id(recid, file_id) is None
@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test Zenodo metrics."""
+
+import pytest
+from invenio_app import factory as app_factory
+
+
+@pytest.fixture(scope="module")
+def create_app(instance_path):
+    """Application factory fixture."""
+    return app_factory.create_api
@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Metrics counters tests."""
+
+from datetime import datetime, timezone
+
+from invenio_files_rest.models import FileInstance
+
+from zenodo_rdm.metrics.counters import COUNTERS, files_counter
+
+
+def _assert_counters_exact():
+    for counter in COUNTERS:
+        assert counter.get() == counter.query().count(), counter.name
+
+
+def test_counters_match_exact_count(app, db, cache):
+    """Test that counters follow mixed inserts, updates and deletes."""
+    for counter in COUNTERS:
+        counter.reconcile()
+
+    datastore = app.extensions["security"].datastore
+    now = datetime.now(timezone.utc)
+    files = [FileInstance.create() for _ in range(5)]
+    users = [
+        datastore.create_user(
+            email=f"counter-{i}@zenodo.org",
+            active=True,
+            confirmed_at=now if i % 2 else None,
+        )
+        for i in range(6)
+    ]
+    db.session.commit()
+    _assert_counters_exact()
+
+    db.session.delete(files[0])
+    db.session.delete(files[1])
+    db.session.delete(users[1])
+    users[0].confirmed_at = now
+    users[3].active = False
+    files.append(FileInstance.create())
+    db.session.commit()
+    _assert_counters_exact()
+
+    users[3].active = True
+    db.session.delete(files[2])
+    db.session.commit()
+    _assert_counters_exact()
+
+
+def test_counters_reconcile(app, db, cache):
+    """Test that reconciliation fixes drift from bulk statements."""
+    files_counter.reconcile()
+    files = [FileInstance.create() for _ in range(3)]
+    db.session.commit()
+
+    # Bulk deletes bypass the session events
+    FileInstance.query.filter(FileInstance.id.in_([f.id for f in files])).delete()
+    db.session.commit()
+    assert files_counter.get() == FileInstance.query.count() + 3
+
+    assert files_counter.reconcile() == -3
+    assert files_counter.get() == FileInstance.query.count()
+
+
+def test_counters_follow_expired_instances(app, db, cache):
+    """Test that counters follow changes of instances expired by a commit."""
+    for counter in COUNTERS:
+        counter.reconcile()
+
+    datastore = app.extensions["security"].datastore
+    users = [
+        datastore.create_user(email=f"expired-{i}@zenodo.org", active=True)
+        for i in range(3)
+    ]
+    files = [FileInstance.create() for _ in range(2)]
+    db.session.commit()
+
+    # The previous values were never loaded since the commit expired them
+    users[0].confirmed_at = datetime.now(timezone.utc)
+    users[1].confirmed_at = datetime.now(timezone.utc)
+    db.session.commit()
+    _assert_counters_exact()
+
+    users[1].active = False
+    db.session.delete(users[0])
+    db.session.delete(files[0])
+    db.session.commit()
+    _assert_counters_exact()
+
+
+def test_counters_follow_savepoints(app, db, cache):
+    """Test that counters revert savepoints and outer transactions rolled back."""
+    files_counter.reconcile()
+    initial = files_counter.get()
+
+    FileInstance.create()
+    with db.session.begin_nested():
+        FileInstance.create()
+    savepoint = db.session.begin_nested()
+    FileInstance.create()
+    db.session.flush()
+    savepoint.rollback()
+    db.session.flush()
+    assert files_counter.get() == initial + 2
+    db.session.commit()
+    _assert_counters_exact()
+
+    FileInstance.create()
+    with db.session.begin_nested():
+        FileInstance.create()
+    db.session.begin_nested()
+    FileInstance.create()
+    db.session.flush()
+    # Rolls back the open savepoint and the released one with the outer transaction
+    db.session.rollback()
+    assert files_counter.get() == initial + 2
+    _assert_counters_exact()
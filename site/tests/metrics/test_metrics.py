@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Metrics endpoint tests."""
+
+import datetime
+
+import pytest
+from invenio_cache import current_cache
+
+from zenodo_rdm.metrics import tasks, utils
+
+METRIC_ID = "test-metrics"
+
+
+@pytest.fixture
+def computed():
+    """Number of times each test metric was computed."""
+    return {"fast": 0, "slow": 0}
+
+
+@pytest.fixture
+def metrics_config(app, computed, monkeypatch):
+    """Two test metrics with different TTLs, and an empty cache."""
+
+    def _metric(name, ttl):
+        def _value():
+            computed[name] += 1
+            return computed[name]
+
+        return {
+            "name": f"test_{name}",
+            "help": f"The {name} test metric.",
+            "type": "gauge",
+            "value": _value,
+            "ttl": ttl,
+        }
+
+    metrics = [
+        _metric("fast", datetime.timedelta(minutes=1)),
+        _metric("slow", datetime.timedelta(hours=1)),
+    ]
+    monkeypatch.setitem(app.config["METRICS_DATA"], METRIC_ID, metrics)
+    keys = [utils._cache_key(METRIC_ID, m["name"]) for m in metrics]
+    keys.append(f"METRICS_EVALUATING::{METRIC_ID}")
+    current_cache.delete_many(*keys)
+    yield metrics
+    current_cache.delete_many(*keys)
+
+
+@pytest.fixture
+def delayed(monkeypatch):
+    """Metric IDs sent to the background computation."""
+    calls = []
+    monkeypatch.setattr(tasks.calculate_metrics, "delay", calls.append)
+    return calls
+
+
+def _age(name, seconds):
+    """Backdate the cached value of a test metric."""
+    key = utils._cache_key(METRIC_ID, name)
+    entry = current_cache.get(key)
+    entry["updated"] -= seconds
+    current_cache.set(key, entry, timeout=0)
+
+
+def _values(response):
+    """Parse the values of a Prometheus response."""
+    lines = response.get_data(as_text=True).splitlines()
+    return dict(line.split(" ") for line in lines if not line.startswith("#"))
+
+
+def test_metrics_served_stale(app, client, metrics_config, computed, delayed):
+    """Test that the last known values are served, with their age."""
+    # Nothing computed yet
+    res = client.get(f"/metrics/{METRIC_ID}")
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "300"
+
+    utils.calculate_metrics(METRIC_ID)
+    assert computed == {"fast": 1, "slow": 1}
+    res = client.get(f"/metrics/{METRIC_ID}")
+    assert res.status_code == 200
+    assert _values(res) == {
+        "test_fast": "1",
+        "test_fast_age_seconds": "0",
+        "test_slow": "1",
+        "test_slow_age_seconds": "0",
+    }
+
+    # Only the stale metric is recomputed
+    _age("test_fast", 90)
+    _age("test_slow", 90)
+    utils.calculate_metrics(METRIC_ID)
+    assert computed == {"fast": 2, "slow": 1}
+
+    # Stale values are served as they are, never a 503
+    _age("test_fast", 3600)
+    values = _values(client.get(f"/metrics/{METRIC_ID}"))
+    assert values["test_fast"] == "2"
+    assert int(values["test_fast_age_seconds"]) >= 3600
+    assert values["test_slow"] == "1"
+    assert 90 <= int(values["test_slow_age_seconds"]) < 3600
+
+    # A metric failing to compute keeps its last known value
+    metrics_config[0]["value"] = lambda: 1 / 0
+    utils.calculate_metrics(METRIC_ID)
+    res = client.get(f"/metrics/{METRIC_ID}")
+    assert res.status_code == 200
+    assert _values(res)["test_fast"] == "2"
+
+
+def test_metrics_trigger(app, client, metrics_config, delayed):
+    """Test that the computation is only triggered once for stale metrics."""
+    assert utils.has_stale_metrics(METRIC_ID)
+    client.get(f"/metrics/{METRIC_ID}")
+    client.get(f"/metrics/{METRIC_ID}")
+    assert delayed == [METRIC_ID]
+
+    # Fresh metrics don't trigger a computation
+    utils.calculate_metrics(METRIC_ID)
+    current_cache.delete(f"METRICS_EVALUATING::{METRIC_ID}")
+    assert not utils.has_stale_metrics(METRIC_ID)
+    assert client.get(f"/metrics/{METRIC_ID}").status_code == 200
+    assert delayed == [METRIC_ID]
+
+    # A single stale metric triggers a computation
+    _age("test_fast", 90)
+    assert utils.has_stale_metrics(METRIC_ID)
+    assert client.get(f"/metrics/{METRIC_ID}").status_code == 200
+    assert delayed == [METRIC_ID, METRIC_ID]
+
+
+def test_metrics_invalid_id(app, client, metrics_config):
+    """Test an unknown metric ID."""
+    assert client.get("/metrics/unknown").status_code == 404
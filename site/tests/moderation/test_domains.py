@@ -4,6 +4,7 @@
 
 import pytest
 
+from zenodo_rdm.moderation.domains import lookup_domains
 from zenodo_rdm.moderation.models import LinkDomain, LinkDomainStatus
 
 
@@ -39,3 +40,59 @@ def test_lookup_domain(domains, domain, expected_status):
         assert LinkDomain.lookup_domain(domain) is None
     else:
         assert LinkDomain.lookup_domain(domain).status == expected_status
+
+
+LOOKUP_URLS = [
+    "http://example.com/content",
+    "https://blog.io/article",
+    "https://spam.blog.io/article",
+    "http://other.blog.io/article",
+    "http://deep.spam.blog.io/article",
+    "https://BLOG.IO/article",
+    "https://www.blog.io/article",
+    "https://blog.io:8080/article",
+    "https://notblog.io/article",
+    "https://physics.edu.ch/article",
+    "http://spam.cam/content",
+    "http://sub.spam.cam/content",
+    "http://cam",
+    "www.spam.cam/content",
+    "not a url",
+    "http://[invalid/",
+    "",
+]
+
+
+def test_lookup_domains_matches_sql_lookup(domains):
+    """Test that the in-memory lookup returns the same domains as the SQL lookup."""
+    results = lookup_domains(LOOKUP_URLS)
+    assert len(results) == len(LOOKUP_URLS)
+    for url, result in zip(LOOKUP_URLS, results):
+        expected = LinkDomain.lookup_domain(url)
+        if expected is None:
+            assert result is None, url
+        else:
+            assert result is not None, url
+            assert (result.id, result.status, result.score) == (
+                expected.id,
+                expected.status,
+                expected.score,
+            ), url
+
+
+def test_lookup_domains_invalidation(db, domains):
+    """Test that the in-memory lookup is rebuilt when domains change."""
+    url = "https://spam.example.org/article"
+    assert lookup_domains([url]) == [None]
+
+    LinkDomain.create("example.org", LinkDomainStatus.BANNED, score=20)
+    db.session.commit()
+    (result,) = lookup_domains([url])
+    assert result.status == LinkDomainStatus.BANNED
+    assert result.score == 20
+
+    domain = LinkDomain.query.filter_by(domain=".org.example").one()
+    domain.status = LinkDomainStatus.SAFE
+    db.session.commit()
+    (result,) = lookup_domains([url])
+    assert result.status == LinkDomainStatus.SAFE
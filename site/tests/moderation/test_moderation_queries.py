@@ -3,8 +3,17 @@
 """Test ModerationQuery model class."""
 
 from invenio_db import db
+from invenio_search import current_search_client
 
+from zenodo_rdm.api import ZenodoRDMRecord
 from zenodo_rdm.moderation.models import ModerationQuery
+from zenodo_rdm.moderation.percolator import (
+    create_percolator_index,
+    get_percolator_index,
+    index_percolate_query,
+    percolate_documents,
+)
+from zenodo_rdm.moderation.rules import match_query_rule
 
 
 def test_moderation_query_creation(app):
@@ -34,4 +43,53 @@ def test_moderation_query_creation(app):
         )
 
 
-# TODO: Add test for matching query
+def test_percolate_documents(app, db, search_clear):
+    """Test percolating a batch of documents against moderation queries."""
+    create_percolator_index(ZenodoRDMRecord)
+    index_percolate_query(ZenodoRDMRecord, 1, "metadata.title:spam", score=10)
+    index_percolate_query(ZenodoRDMRecord, 2, "metadata.description:casino", score=5)
+    index_percolate_query(
+        ZenodoRDMRecord, 3, "metadata.title:spam", active=False, score=100
+    )
+    current_search_client.indices.refresh(index=get_percolator_index(ZenodoRDMRecord))
+
+    documents = [
+        {"metadata": {"title": "Spam offer", "description": "Online casino"}},
+        {"metadata": {"title": "A dataset", "description": "Measurements"}},
+        {"metadata": {"title": "Not spam", "description": "Nothing"}},
+    ]
+    matches = percolate_documents(ZenodoRDMRecord, documents)
+
+    assert len(matches) == 3
+    assert sorted(q["id"] for q in matches[0]) == [1, 2]
+    assert matches[1] == []
+    # Inactive queries are not matched
+    assert [q["id"] for q in matches[2]] == [1]
+    assert percolate_documents(ZenodoRDMRecord, []) == []
+
+
+def test_match_query_rule_without_percolator_index(app, db, search_clear):
+    """Test that records score nothing while there is no percolator index."""
+    record = ZenodoRDMRecord({"metadata": {"title": "Spam offer"}})
+    assert not current_search_client.indices.exists(index=get_percolator_index(record))
+
+    assert match_query_rule(None, record=record) == 0
+
+
+def test_percolate_documents_pages(app, db, search_clear, monkeypatch):
+    """Test that all the matched queries are returned, over several pages."""
+    monkeypatch.setitem(app.config, "MODERATION_PERCOLATOR_PAGE_SIZE", 2)
+    create_percolator_index(ZenodoRDMRecord)
+    for query_id in range(1, 6):
+        index_percolate_query(ZenodoRDMRecord, query_id, "metadata.title:spam")
+    index_percolate_query(ZenodoRDMRecord, 6, "metadata.title:casino")
+    current_search_client.indices.refresh(index=get_percolator_index(ZenodoRDMRecord))
+
+    documents = [
+        {"metadata": {"title": "Spam offer"}},
+        {"metadata": {"title": "Spam casino"}},
+    ]
+    matches = percolate_documents(ZenodoRDMRecord, documents)
+
+    assert sorted(q["id"] for q in matches[0]) == [1, 2, 3, 4, 5]
+    assert sorted(q["id"] for q in matches[1]) == [1, 2, 3, 4, 5, 6]
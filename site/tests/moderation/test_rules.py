@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Moderation rules tests."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from zenodo_rdm.moderation.rules import ModerationContext, text_sanitization_rule
+
+
+@pytest.mark.parametrize(
+    "metadata,expected_score",
+    [
+        ({"title": "A title", "description": "<p>Text</p>"}, 0),
+        ({"title": "😀 😀", "description": "😀"}, 0),
+        ({"title": "😀 😀", "description": "😀 😀"}, 5),
+        ({"description": "<h1>a</h1>" * 4}, 0),
+        ({"title": "<h2>Title</h2>", "description": "<h1>a</h1>" * 4}, 2),
+        ({"title": "😀 😀 😀 😀", "description": "<H3 id='a'>a</H3>" * 5}, 7),
+    ],
+)
+def test_text_sanitization_rule(running_app, metadata, expected_score):
+    """Test the score of the text sanitization rule."""
+    record = SimpleNamespace(metadata=metadata)
+    context = ModerationContext.from_record(record)
+    # The rule scores the text of the metadata values, not the keys
+    assert context.values_text == " ".join(map(str, metadata.values()))
+
+    assert text_sanitization_rule(None, record=record) == expected_score
+    assert text_sanitization_rule(None, record=record, context=context) == (
+        expected_score
+    )
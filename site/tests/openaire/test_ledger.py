@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test the OpenAIRE failures ledger."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from invenio_cache.proxies import current_cache
+
+from zenodo_rdm.openaire.ledger import (
+    claim_due_failures,
+    clear_failure,
+    count_failures,
+    get_failure,
+    import_legacy_failures,
+    iter_due_failures,
+    list_failures,
+    record_failure,
+)
+
+
+@pytest.fixture()
+def no_backoff(running_app, monkeypatch):
+    """Make the failures due right away."""
+    monkeypatch.setitem(
+        running_app.app.config, "OPENAIRE_FAILURES_BACKOFF", timedelta(0)
+    )
+
+
+def test_record_and_clear_failure(running_app, cache):
+    """Test that failures count their attempts and backoff exponentially."""
+    record_failure("1", "index", error=ValueError())
+    record_failure("1", error=KeyError())
+    failure = get_failure("1")
+    assert failure["attempts"] == 2
+    assert failure["operation"] == "index"
+    assert failure["error"] == "KeyError"
+    next_retry = datetime.fromisoformat(failure["next_retry"])
+    last_failed = datetime.fromisoformat(failure["last_failed"])
+    backoff = running_app.app.config["OPENAIRE_FAILURES_BACKOFF"]
+    assert abs(next_retry - last_failed - 2 * backoff) < timedelta(seconds=1)
+    # Not due yet
+    assert claim_due_failures(10) == []
+
+    clear_failure("1")
+    assert get_failure("1") is None
+    assert count_failures() == 0
+
+
+def test_claim_due_failures(running_app, cache, no_backoff):
+    """Test that due failures are drained in pages, each claimed once."""
+    for i in range(25):
+        record_failure(str(i), "index")
+    assert count_failures() == 25
+    assert [f["record_id"] for f in list_failures(limit=5)] == [
+        str(i) for i in range(5)
+    ]
+
+    assert len(claim_due_failures(10)) == 10
+    claimed = list(iter_due_failures(page_size=10))
+    assert len(claimed) == len(set(claimed)) == 25
+    # Failures stay in the ledger until they are cleared or recorded again
+    assert count_failures() == 25
+
+
+def test_claim_pushes_back_failures(running_app, cache):
+    """Test that claimed failures are pushed back by the backoff of their attempts."""
+    backoff = running_app.app.config["OPENAIRE_FAILURES_BACKOFF"].total_seconds()
+    now = datetime.now().timestamp()
+    record_failure("1", "index", retry_at=now)
+    record_failure("2", "index")
+    record_failure("2", "index", retry_at=now)
+
+    assert claim_due_failures(10, due_before=now + 1) == ["1", "2"]
+    # Claimed failures are not due again until their retry ran
+    assert claim_due_failures(10, due_before=now + 1) == []
+    client = current_cache.cache._write_client
+    prefix = current_cache.cache.key_prefix
+    for record_id, attempts in (("1", 1), ("2", 2)):
+        next_retry = client.zscore(prefix + "openaire:failures", record_id)
+        assert abs(next_retry - now - backoff * 2 ** (attempts - 1)) < 5
+    assert count_failures() == 2
+
+
+def test_import_legacy_failures(running_app, cache):
+    """Test that the legacy cache keys are moved to the ledger."""
+    current_cache.set("openaire_direct_index:42", datetime.now(), timeout=-1)
+    assert import_legacy_failures() == 1
+    assert not current_cache.has("openaire_direct_index:42")
+    assert get_failure("42")["operation"] == "index"
+    assert claim_due_failures(10) == ["42"]
@@ -6,11 +6,15 @@ from copy import deepcopy
 
 import pytest
 
+from zenodo_rdm.openaire import utils
+from zenodo_rdm.openaire.serializers import schema
+from zenodo_rdm.openaire.serializers.schema import add_openaire_types
 from zenodo_rdm.openaire.utils import (
     OA_DATASET,
     OA_OTHER,
     OA_PUBLICATION,
     OA_SOFTWARE,
+    get_resource_type_vocabulary,
     openaire_link,
     openaire_type,
 )
@@ -105,3 +109,63 @@ def test_openaire_link(running_app, minimal_open_record, resource_type, oatype):
     }
     r["metadata"]["resource_type"] = {"id": resource_type}
     assert openaire_link(r) == f"https://explore.openaire.eu/search/result?pid={doi}"
+
+
+def test_resource_type_vocabulary_cache(running_app, monkeypatch):
+    """Test that resource types are cached in the process until the TTL passes."""
+    reads = []
+    now = [1000.0]
+    monkeypatch.setattr(utils, "_read_resource_type_vocabulary", reads.append)
+    monkeypatch.setattr(utils.time, "monotonic", lambda: now[0])
+    ttl = 60
+    monkeypatch.setitem(running_app.app.config, "OPENAIRE_VOCABULARY_CACHE_TTL", ttl)
+    utils._cached_resource_type_vocabulary.cache_clear()
+
+    get_resource_type_vocabulary("dataset")
+    get_resource_type_vocabulary("dataset")
+    get_resource_type_vocabulary("software")
+    assert reads == ["dataset", "software"]
+
+    # Entries expire when the TTL bucket changes
+    now[0] += ttl
+    get_resource_type_vocabulary("dataset")
+    assert reads == ["dataset", "software", "dataset"]
+
+    # A TTL of 0 disables the cache
+    monkeypatch.setitem(running_app.app.config, "OPENAIRE_VOCABULARY_CACHE_TTL", 0)
+    get_resource_type_vocabulary("dataset")
+    get_resource_type_vocabulary("dataset")
+    assert reads == ["dataset", "software", "dataset", "dataset", "dataset"]
+    utils._cached_resource_type_vocabulary.cache_clear()
+
+
+def test_add_openaire_types(
+    running_app, openaire_record, openaire_serializer, monkeypatch
+):
+    """Test that the types are added once, for the check and the serialization."""
+    record = openaire_record.data
+    data = add_openaire_types(record)
+    assert data["_openaire_type"] == OA_DATASET
+    assert data["type"] == OA_DATASET
+    assert data["_communities"] == []
+    # The record itself is left as is
+    assert "_openaire_type" not in record
+
+    # Dumping the prepared data doesn't read the communities again
+    reads = []
+    monkeypatch.setattr(
+        schema, "get_record_communities", lambda record: reads.append(record) or []
+    )
+    assert openaire_serializer.dump_obj(data) == openaire_serializer.dump_obj(record)
+    assert len(reads) == 1
+
+
+def test_add_openaire_types_not_openaire(running_app, minimal_record):
+    """Test the records that are not sent to OpenAIRE."""
+    r = deepcopy(minimal_record)
+    r["metadata"]["resource_type"] = {"id": "publication"}
+    r["access"] = {"record": "restricted", "files": "restricted"}
+    assert add_openaire_types(r)["_openaire_type"] is None
+
+    del r["metadata"]["resource_type"]
+    assert add_openaire_types(r) is None
@@ -0,0 +1,211 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test the OpenAIRE bulk re-feed."""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from invenio_rdm_records.proxies import current_rdm_records_service as records_service
+
+from zenodo_rdm.openaire import refeed
+from zenodo_rdm.openaire.ledger import get_failure
+from zenodo_rdm.openaire.refeed import (
+    AdaptiveLimiter,
+    get_refeed_checkpoint,
+    refeed_records,
+)
+
+
+class StubOpenAIRE(ThreadingHTTPServer):
+    """Local stub of the OpenAIRE API.
+
+    ``statuses`` maps the ``originalId`` of a record to the status codes of its
+    successive requests, the last one being repeated. Other records get a 200.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, statuses):
+        """Constructor."""
+        super().__init__(("127.0.0.1", 0), StubOpenAIREHandler)
+        self.statuses = {key: list(value) for key, value in statuses.items()}
+        self.received = []
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        """Base URL of the stub API."""
+        host, port = self.server_address
+        return f"http://{host}:{port}/api"
+
+    def next_status(self, original_id):
+        """Pop the next status code of a record."""
+        with self.lock:
+            statuses = self.statuses.get(original_id, [200])
+            return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+
+
+class StubOpenAIREHandler(BaseHTTPRequestHandler):
+    """Record the posted records, keeping the connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        """Handle a feed request."""
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = self.server.next_status(data["originalId"])
+        with self.server.lock:
+            self.server.received.append((self.path, data))
+            self.server.connections.add(self.client_address)
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        """Silence the request logs."""
+
+
+@pytest.fixture()
+def stub_openaire(running_app, monkeypatch):
+    """Start a stub OpenAIRE API and point the config to it."""
+
+    def _start(statuses=None):
+        server = StubOpenAIRE(statuses or {})
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setitem(running_app.app.config, "OPENAIRE_API_URL", server.url)
+        return server
+
+    servers = []
+    monkeypatch.setattr(refeed, "_retry_after", lambda response, attempt: 0)
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _create_records(create_record, record_data, num):
+    records = [create_record(record_data) for _ in range(num)]
+    records_service.record_cls.index.refresh()
+    return records
+
+
+def _original_id(record):
+    return f"10.5281/zenodo.{record.id}"
+
+
+def test_refeed_records(
+    running_app, openaire_record_data, create_record, stub_openaire
+):
+    """Test that the records are sent in batches over pooled connections."""
+    records = _create_records(create_record, openaire_record_data, 5)
+    server = stub_openaire()
+
+    checkpoint = refeed_records(resume=False, batch_size=2)
+
+    assert checkpoint["processed"] >= 5
+    assert checkpoint["sent"] == len(server.received)
+    assert checkpoint["failed"] == checkpoint["rejected"] == 0
+    assert checkpoint["finished"]
+    assert get_refeed_checkpoint() == checkpoint
+
+    sent = {data["originalId"] for _, data in server.received}
+    assert all(path == "/api/results/feedObject" for path, _ in server.received)
+    assert {_original_id(rec) for rec in records} <= sent
+    # Connections are kept alive and reused across requests and batches
+    max_concurrency = running_app.app.config["OPENAIRE_REFEED_MAX_CONCURRENCY"]
+    assert len(server.connections) <= max_concurrency
+
+
+def test_refeed_records_failures(
+    running_app, openaire_record_data, create_record, stub_openaire
+):
+    """Test that throttled, rejected and failed records are handled."""
+    throttled, rejected, failed = _create_records(
+        create_record, openaire_record_data, 3
+    )
+    server = stub_openaire(
+        {
+            _original_id(throttled): [429, 503, 200],
+            _original_id(rejected): [400],
+            _original_id(failed): [500],
+        }
+    )
+
+    checkpoint = refeed_records(resume=False)
+
+    assert checkpoint["rejected"] == 1
+    assert checkpoint["failed"] == 1
+    # Throttled and failed records are retried, rejected ones are not
+    attempts = Counter(data["originalId"] for _, data in server.received)
+    max_attempts = running_app.app.config["OPENAIRE_REFEED_MAX_ATTEMPTS"]
+    assert attempts[_original_id(throttled)] == 3
+    assert attempts[_original_id(rejected)] == 1
+    assert attempts[_original_id(failed)] == max_attempts
+    # Only the failed record is left for ``retry_openaire_failures``
+    for record in (throttled, rejected):
+        assert get_failure(record.id) is None
+    assert get_failure(failed.id)["operation"] == "index"
+
+
+def test_refeed_records_resume(
+    running_app, openaire_record_data, create_record, stub_openaire
+):
+    """Test that an interrupted re-feed resumes from its checkpoint."""
+    records = _create_records(create_record, openaire_record_data, 3)
+    server = stub_openaire()
+
+    checkpoint = refeed_records(resume=False, batch_size=1, max_records=2)
+    assert checkpoint["processed"] == 2
+    assert not checkpoint["finished"]
+
+    checkpoint = refeed_records(resume=True, batch_size=1)
+    assert checkpoint["processed"] >= 3
+    assert checkpoint["finished"]
+    # No record was sent twice
+    sent = [data["originalId"] for _, data in server.received]
+    assert len(sent) == len(set(sent))
+    assert {_original_id(rec) for rec in records} <= set(sent)
+
+
+def test_adaptive_limiter():
+    """Test that the limit grows on success and halves on throttling."""
+    limiter = AdaptiveLimiter(1, 4)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(success=True)
+    assert limiter.limit == 4
+
+    limiter.acquire()
+    limiter.release(success=False)
+    assert limiter.limit == 2
+
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(success=False)
+    assert limiter.limit == 1
+
+
+def test_refeed_records_after_finished(
+    running_app, openaire_record_data, create_record, stub_openaire
+):
+    """Test that a re-feed after a finished one starts over."""
+    records = _create_records(create_record, openaire_record_data, 2)
+    server = stub_openaire()
+
+    checkpoint = refeed_records(resume=False)
+    assert checkpoint["finished"]
+    sent = len(server.received)
+
+    checkpoint = refeed_records(resume=True)
+    assert checkpoint["finished"]
+    assert checkpoint["sent"] == sent
+    assert len(server.received) == 2 * sent
+    assert {_original_id(rec) for rec in records} <= {
+        data["originalId"] for _, data in server.received[sent:]
+    }
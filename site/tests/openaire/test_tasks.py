@@ -2,11 +2,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Test OpenAIRE tasks."""
 
+from datetime import timedelta
 from unittest.mock import MagicMock, call
 
 import pytest
-from invenio_cache.proxies import current_cache
 
+from zenodo_rdm.openaire import tasks
+from zenodo_rdm.openaire.ledger import get_failure
 from zenodo_rdm.openaire.tasks import (
     openaire_delete,
     openaire_direct_index,
@@ -61,8 +63,8 @@ def test_openaire_direct_index_task(
         timeout=30,
     )
 
-    # Assert key is not in cache : means success
-    assert not current_cache.cache.has(f"openaire_direct_index:{openaire_record.id}")
+    # Assert record is not in the failures ledger : means success
+    assert get_failure(openaire_record.id) is None
 
 
 def test_openaire_direct_index_task_with_beta(
@@ -96,25 +98,29 @@ def test_openaire_direct_index_task_with_beta(
     ]
     mocked_session.post.assert_has_calls(calls)
 
-    # Assert key is not in cache : means success
-    assert not current_cache.cache.has(f"openaire_direct_index:{openaire_record.id}")
+    # Assert record is not in the failures ledger : means success
+    assert get_failure(openaire_record.id) is None
 
 
 def test_openaire_retries_task(
-    running_app, openaire_record, mocked_session, enable_openaire_indexing
+    running_app, openaire_record, mocked_session, enable_openaire_indexing, monkeypatch
 ):
     """Test OpenAIRE retry task.
 
     The test mocks the post request to fail.
     """
+    # Make the failures due for a retry right away
+    monkeypatch.setitem(
+        running_app.app.config, "OPENAIRE_FAILURES_BACKOFF", timedelta(0)
+    )
     mocked_session.post.side_effect = Exception("An error.")
 
     # The task will fail multiple times: the first one + N retries (configured)
     openaire_direct_index.delay(openaire_record.id)
 
-    assert current_cache.cache.has(f"openaire_direct_index:{openaire_record.id}")
+    assert get_failure(openaire_record.id)["operation"] == "index"
 
-    # After failing, the cache has is populated with ``openaire_direct_index:<record.id>`` that is picked up by the task ``retry_openaire_failures``
+    # After failing, the record is in the failures ledger that is picked up by the task ``retry_openaire_failures``
     mocked_session.post.side_effect = None
 
     # Reset number of calls on ``post`` - this can be used to assess whether openaire indexing executed succesfully
@@ -126,8 +132,28 @@ def test_openaire_retries_task(
     # Assert post was executed N times
     assert mocked_session.post.called_once()
 
-    # Assert cache does not have the key
-    assert not current_cache.cache.has(f"openaire_direct_index:{openaire_record.id}")
+    # Assert the ledger does not have the record
+    assert get_failure(openaire_record.id) is None
+
+
+def test_openaire_failure_recorded_once_retries_exhausted(
+    running_app, openaire_record, mocked_session, enable_openaire_indexing, monkeypatch
+):
+    """Failures are only added to the ledger once Celery stops retrying."""
+    recorded = []
+    monkeypatch.setattr(
+        tasks, "record_failure", lambda *args, **kwargs: recorded.append(args)
+    )
+    mocked_session.post.side_effect = Exception("An error.")
+
+    openaire_direct_index.delay(openaire_record.id)
+    assert mocked_session.post.call_count == openaire_direct_index.max_retries + 1
+    assert recorded == [(openaire_record.id, "index")]
+
+    # Retries from the ledger are recorded right away
+    recorded.clear()
+    openaire_direct_index.delay(openaire_record.id, retry=False)
+    assert recorded == [(openaire_record.id, "index")]
 
 
 @pytest.mark.parametrize("status_code", [400, 413])
@@ -140,7 +166,7 @@ def test_openaire_direct_index_rejected(
 
     openaire_direct_index.delay(openaire_record.id)
 
-    assert not current_cache.cache.has(f"openaire_direct_index:{openaire_record.id}")
+    assert get_failure(openaire_record.id) is None
 
 
 def test_openaire_delete_task(
@@ -157,5 +183,5 @@ def test_openaire_delete_task(
         f"{openaire_url}/result/{openaire_id}",
     )
 
-    # Assert key is not in cache : means success
-    assert not current_cache.cache.has(f"openaire_direct_index:{openaire_record.id}")
+    # Assert record is not in the failures ledger : means success
+    assert get_failure(openaire_record.id) is None
@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Piwik stats exporter tests."""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+from invenio_cache.proxies import current_cache
+from opensearch_dsl.utils import AttrDict
+
+from zenodo_rdm.stats import exporters
+from zenodo_rdm.stats.errors import PiwikExportRequestError
+from zenodo_rdm.stats.exporters import PiwikExporter
+
+
+class FakeMatomo(ThreadingHTTPServer):
+    """Local fake of the Matomo bulk tracking endpoint.
+
+    Requests are answered after a random delay, so that they complete out of
+    order. Chunks containing an event timestamp of ``fail_on`` get an HTTP 500.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fail_on=None):
+        """Constructor."""
+        super().__init__(("127.0.0.1", 0), FakeMatomoHandler)
+        self.fail_on = fail_on
+        self.received = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        """URL of the tracking endpoint."""
+        host, port = self.server_address
+        return f"http://{host}:{port}/piwik.php"
+
+
+class FakeMatomoHandler(BaseHTTPRequestHandler):
+    """Record the tracked events."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        """Handle a bulk tracking request."""
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        timestamps = [parse_qs(qs[1:])["cdt"][0] for qs in payload["requests"]]
+        time.sleep(random.uniform(0, 0.05))
+        with self.server.lock:
+            self.server.received.append(timestamps)
+        if self.server.fail_on in timestamps:
+            status, body = 500, b"{}"
+        else:
+            status = 200
+            body = json.dumps(
+                {"status": "success", "tracked": len(timestamps), "invalid": 0}
+            ).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Silence the request logs."""
+
+
+@pytest.fixture()
+def fake_matomo(running_app, cache, monkeypatch):
+    """Start a fake Matomo endpoint and point the exporter to it."""
+
+    def _start(fail_on=None):
+        server = FakeMatomo(fail_on=fail_on)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        config = {
+            **running_app.app.config["STATS_PIWIK_EXPORTER"],
+            "url": server.url,
+            "chunk_size": 5,
+            "max_in_flight": 4,
+        }
+        monkeypatch.setitem(running_app.app.config, "STATS_PIWIK_EXPORTER", config)
+        return server
+
+    servers = []
+    monkeypatch.setattr(
+        exporters,
+        "fetch_records",
+        lambda recids: {
+            recid: {"oai_id": f"oai:zenodo.org:{recid}", "title": "Title"}
+            for recid in recids
+        },
+    )
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _events(num):
+    start = datetime(2025, 1, 1)
+    return [
+        AttrDict(
+            {
+                "recid": str(i % 7 + 1),
+                "visitor_id": f"{i:032x}",
+                "timestamp": (start + timedelta(minutes=i)).isoformat(),
+                "referrer": None,
+            }
+        )
+        for i in range(num)
+    ]
+
+
+def test_export_pipelined(running_app, fake_matomo):
+    """Test that all the events are sent and the bookmark reaches the last one."""
+    server = fake_matomo()
+    events = _events(48)
+
+    PiwikExporter().export(events)
+
+    received = sorted(ts for chunk in server.received for ts in chunk)
+    assert received == [event.timestamp for event in events]
+    assert len(server.received) == 10
+    assert current_cache.get("piwik_export:bookmark") == events[-1].timestamp
+
+
+def test_export_failure_keeps_contiguous_bookmark(running_app, fake_matomo):
+    """Test that the bookmark does not advance past a failed chunk."""
+    events = _events(50)
+    # Fail the 4th chunk, while the next ones may already be acknowledged
+    server = fake_matomo(fail_on=events[17].timestamp)
+
+    with pytest.raises(PiwikExportRequestError) as exc_info:
+        PiwikExporter().export(events)
+
+    assert exc_info.value.extra["begin_event_timestamp"] == events[15].timestamp
+    assert current_cache.get("piwik_export:bookmark") == events[14].timestamp
+    # No chunk is sent beyond the window of requests in flight
+    sent = {chunk[0] for chunk in server.received}
+    assert events[15 + 5 * 4].timestamp not in sent
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Test sitemap sections."""
+
+from datetime import datetime, timezone
+
+from invenio_cache import current_cache
+
+from zenodo_rdm.sitemap import RecordsSection
+
+
+def test_records_section_entries(test_app, monkeypatch):
+    """Test the sitemap entries of the cached records shards."""
+    section = RecordsSection()
+    shard_size = test_app.config["ZENODO_SITEMAP_RECORDS_SHARD_SIZE"]
+    current_cache.set(
+        section._state_key,
+        {
+            "hwm": datetime.now(timezone.utc).isoformat(),
+            "shard_size": shard_size,
+            "shards": [0],
+        },
+        timeout=0,
+    )
+    current_cache.set(
+        section._shard_key(0),
+        [{"id": "abcd-1234", "updated": "2024-01-02T03:04:05.123456+00:00"}],
+        timeout=0,
+    )
+    monkeypatch.setattr(section, "_touched_shards", lambda *args: set())
+
+    entries = [section.to_dict(e) for e in section.iter_entities()]
+
+    assert len(entries) == 1
+    assert entries[0]["loc"].endswith("/records/abcd-1234")
+    assert entries[0]["lastmod"].startswith("2024-01-02")
+
+    current_cache.delete_many(section._state_key, section._shard_key(0))
+
+
+class FakeRecordsIndex:
+    """Records index of a records section, without a search cluster."""
+
+    def __init__(self, section, shard_size, records):
+        """Constructor."""
+        self.records = records
+        self.scanned = []
+        self.since = []
+        self.shard_size = shard_size
+        section._scan_shard = self.scan_shard
+        section._last_shard = self.last_shard
+        section._touched_shards = self.touched_shards
+
+    def scan_shard(self, shard_size, shard):
+        self.scanned.append(shard)
+        return [
+            {"id": r["id"], "updated": r["updated"]}
+            for r in self.records
+            if r["pk"] // shard_size == shard
+        ]
+
+    def last_shard(self, shard_size):
+        return max(r["pk"] for r in self.records) // shard_size
+
+    def touched_shards(self, shard_size, since):
+        self.since.append(since)
+        return {r["pk"] // shard_size for r in self.records if r["updated"] >= since}
+
+
+def _record(pk, updated):
+    return {"id": f"rec-{pk}", "pk": pk, "updated": updated.isoformat()}
+
+
+def _sitemap_ids(section):
+    return [e["id"] for e in section.iter_entities()]
+
+
+def test_records_section_full_rebuild(test_app):
+    """Without a state, every shard is scanned and stored, one at a time."""
+    section = RecordsSection()
+    shard_size = test_app.config["ZENODO_SITEMAP_RECORDS_SHARD_SIZE"]
+    updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    # The second shard has no records
+    records = [_record(pk, updated) for pk in (1, 2, 2 * shard_size + 1)]
+    # A state of another shard size is rebuilt, and its shards removed
+    current_cache.set(
+        section._state_key,
+        {"hwm": updated.isoformat(), "shard_size": shard_size + 1, "shards": [7]},
+        timeout=0,
+    )
+    current_cache.set(section._shard_key(7), [{"id": "old"}], timeout=0)
+    index = FakeRecordsIndex(section, shard_size, records)
+
+    assert _sitemap_ids(section) == ["rec-1", "rec-2", f"rec-{2 * shard_size + 1}"]
+    assert index.scanned == [0, 1, 2]
+    assert index.since == []
+    state = current_cache.get(section._state_key)
+    assert state["shard_size"] == shard_size
+    assert state["shards"] == [0, 2]
+    assert current_cache.get(section._shard_key(1)) is None
+    assert current_cache.get(section._shard_key(7)) is None
+
+    current_cache.delete_many(
+        section._state_key, section._shard_key(0), section._shard_key(2)
+    )
+
+
+def test_records_section_hwm_overlap(test_app):
+    """Records updated shortly before the previous build are rescanned."""
+    section = RecordsSection()
+    shard_size = test_app.config["ZENODO_SITEMAP_RECORDS_SHARD_SIZE"]
+    overlap = test_app.config["ZENODO_SITEMAP_RECORDS_HWM_OVERLAP"]
+    hwm = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    current_cache.set(
+        section._state_key,
+        {"hwm": hwm.isoformat(), "shard_size": shard_size, "shards": [0, 1, 2]},
+        timeout=0,
+    )
+    for shard in (0, 1, 2):
+        current_cache.set(
+            section._shard_key(shard), [{"id": f"cached-{shard}"}], timeout=0
+        )
+    records = [
+        # Updated before the overlap
+        _record(1, hwm - 2 * overlap),
+        # Updated within the overlap, e.g. indexed after the previous build
+        _record(shard_size + 1, hwm - overlap / 2),
+        # Updated since the previous build
+        _record(2 * shard_size + 1, hwm + overlap),
+    ]
+    index = FakeRecordsIndex(section, shard_size, records)
+
+    assert _sitemap_ids(section) == [
+        "cached-0",
+        f"rec-{shard_size + 1}",
+        f"rec-{2 * shard_size + 1}",
+    ]
+    assert index.since == [(hwm - overlap).isoformat()]
+    assert index.scanned == [1, 2]
+    assert current_cache.get(section._state_key)["hwm"] > hwm.isoformat()
+
+    current_cache.delete_many(
+        section._state_key, *[section._shard_key(shard) for shard in (0, 1, 2)]
+    )
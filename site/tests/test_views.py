@@ -12,7 +12,8 @@ from invenio_cache import current_cache
 from invenio_communities.proxies import current_communities
 from invenio_search.api import dsl
 
-from zenodo_rdm.theme.api import cache_key
+from zenodo_rdm.cli import warm_frontpage_cache_command
+from zenodo_rdm.theme.api import cache_key, recent_uploads, recent_uploads_cache
 from zenodo_rdm.theme.tasks import warm_frontpage_cache
 
 
@@ -81,8 +82,8 @@ def test_frontpage_cache_warmup(test_app, frontpage_records):
         for ctx in reversed(popped):
             ctx.push()
 
-    cached_records = current_cache.get(recent_uploads_key)
-    cached_communities = current_cache.get(featured_communities_key)
+    cached_records = current_cache.get(recent_uploads_key)["value"]
+    cached_communities = current_cache.get(featured_communities_key)["value"]
     assert len(cached_records) == 2
     assert {r["metadata"]["title"] for r in cached_records} == {
         "Dataset one",
@@ -91,6 +92,67 @@ def test_frontpage_cache_warmup(test_app, frontpage_records):
     assert len(cached_communities) == 1
 
 
+def test_frontpage_cache_serves_stale(test_app, frontpage_records):
+    """A value from a previous deploy is served, while it is refreshed."""
+    key = cache_key("recent-uploads")
+    current_cache.set(
+        key,
+        {"value": ["stale"], "version": "previous-deploy", "fresh_until": 0},
+        timeout=60,
+    )
+
+    # Background refresh runs synchronously in tests
+    assert recent_uploads() == ["stale"]
+    entry = current_cache.get(key)
+    assert len(entry["value"]) == 2
+    assert entry["version"] != "previous-deploy"
+    assert recent_uploads() == entry["value"]
+    assert not recent_uploads_cache.is_locked()
+
+
+def test_frontpage_warmup_keeps_refresh_lock(test_app, frontpage_records):
+    """The warmup does not release a lock held by a concurrent revalidation."""
+    lock_token = recent_uploads_cache._acquire_lock()
+    assert lock_token
+    try:
+        assert len(recent_uploads(refresh_cache=True)) == 2
+        assert recent_uploads_cache.is_locked()
+    finally:
+        recent_uploads_cache._release_lock(lock_token)
+    assert not recent_uploads_cache.is_locked()
+
+
+def test_frontpage_refresh_lock_token(test_app):
+    """The lock is only released by the worker holding it."""
+    lock_token = recent_uploads_cache._acquire_lock()
+    assert lock_token
+    assert recent_uploads_cache._acquire_lock() is None
+
+    # E.g. a worker whose lock expired, and was taken by another one
+    recent_uploads_cache._release_lock("expired-token")
+    assert recent_uploads_cache.is_locked()
+
+    recent_uploads_cache._release_lock(lock_token)
+    assert not recent_uploads_cache.is_locked()
+
+
+def test_warm_frontpage_cache_command(
+    test_app, frontpage_records, cli_runner, set_app_config_fn_scoped
+):
+    """The warmup is sent once per deployed image."""
+    set_app_config_fn_scoped({"IMAGE_BUILD_TIMESTAMP": "20260101_000000"})
+    current_cache.delete(cache_key("recent-uploads"))
+
+    result = cli_runner(warm_frontpage_cache_command)
+    assert result.exit_code == 0
+    assert "warmup sent" in result.output
+    assert len(current_cache.get(cache_key("recent-uploads"))["value"]) == 2
+
+    result = cli_runner(warm_frontpage_cache_command)
+    assert result.exit_code == 0
+    assert "already sent" in result.output
+
+
 def test_frontpage_with_string_query(test_app, client, set_app_config_fn_scoped):
     """Test frontpage works with legacy string query configuration."""
     # Override config to use string query for backwards compatibility test
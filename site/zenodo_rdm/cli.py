@@ -5,8 +5,10 @@
 import csv
 
 import click
+from flask import current_app
 from flask.cli import with_appcontext
 from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
 from invenio_communities.communities.records.api import Community
 from invenio_db import db
 from invenio_pidstore.models import PersistentIdentifier
@@ -31,6 +33,16 @@ from zenodo_rdm.moderation.percolator import (
     get_percolator_index,
     index_percolate_query,
 )
+from zenodo_rdm.moderation.tasks import rescore_records
+from zenodo_rdm.openaire.ledger import (
+    clear_failure,
+    count_failures,
+    get_failure,
+    import_legacy_failures,
+    list_failures,
+)
+from zenodo_rdm.openaire.tasks import openaire_refeed, retry_openaire_failures
+from zenodo_rdm.theme.tasks import warm_frontpage_cache
 
 
 def _get_parent(record_model):
@@ -211,11 +223,11 @@ def delete_record(recid):
         rdm_draft,
     ) = _get_record(recid)
     # Parent
-    (parent_model, parent_id, parent_pid, parent_communities, requests) = _get_parent(
+    parent_model, parent_id, parent_pid, parent_communities, requests = _get_parent(
         record_model
     )
     # Version
-    (record_version, latest_record_version_id, all_versions) = _get_version(
+    record_version, latest_record_version_id, all_versions = _get_version(
         recid, parent_id
     )
 
@@ -255,6 +267,132 @@ def delete_record(recid):
         current_requests_service.indexer.delete(req)
 
 
+@zenodo_admin.command("openaire-refeed")
+@click.option(
+    "--restart",
+    is_flag=True,
+    default=False,
+    help="Start over instead of resuming from the last checkpoint.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Number of records read and serialized at once.",
+)
+@click.option(
+    "--max-records",
+    type=click.IntRange(min=1),
+    help="Stop after this number of records.",
+)
+@click.option(
+    "--async",
+    "run_async",
+    is_flag=True,
+    default=False,
+    help="Run the re-feed in a Celery task.",
+)
+@with_appcontext
+def openaire_refeed_command(restart, batch_size, max_records, run_async):
+    """Re-feed all published records to OpenAIRE in bulk."""
+    kwargs = dict(resume=not restart, batch_size=batch_size, max_records=max_records)
+    if run_async:
+        openaire_refeed.delay(**kwargs)
+        click.secho("OpenAIRE re-feed task sent.", fg="green")
+        return
+
+    checkpoint = openaire_refeed(**kwargs)
+    if checkpoint is None:
+        click.secho("OpenAIRE direct indexing is disabled.", fg="yellow")
+        return
+    click.secho(
+        "Processed {processed} records: {sent} sent, {skipped} skipped, "
+        "{rejected} rejected, {failed} failed.".format(**checkpoint),
+        fg="green",
+    )
+
+
+@zenodo_admin.group("openaire-failures")
+def openaire_failures_cli():
+    """Inspect the ledger of failed OpenAIRE operations."""
+
+
+@openaire_failures_cli.command("list")
+@click.option("--offset", type=click.IntRange(min=0), default=0)
+@click.option("-n", "--limit", type=click.IntRange(min=1), default=100)
+@with_appcontext
+def list_openaire_failures(offset, limit):
+    """List the failures, ordered by their next retry."""
+    click.echo(f"{count_failures()} failures.")
+    for failure in list_failures(offset=offset, limit=limit):
+        click.echo(
+            "\t".join(
+                [failure["record_id"]]
+                + [
+                    f"{key}={failure.get(key)}"
+                    for key in ("operation", "attempts", "error", "next_retry")
+                ]
+            )
+        )
+
+
+@openaire_failures_cli.command("show")
+@click.argument("recid")
+@with_appcontext
+def show_openaire_failure(recid):
+    """Show the failure of a record."""
+    failure = get_failure(recid)
+    if failure is None:
+        click.secho(f"No failure for record {recid}.", fg="green")
+        return
+    for key, value in failure.items():
+        click.echo(f"{key}: {value}")
+
+
+@openaire_failures_cli.command("clear")
+@click.argument("recid")
+@with_appcontext
+def clear_openaire_failure(recid):
+    """Remove the failure of a record, without retrying it."""
+    clear_failure(recid)
+    click.secho(f"Failure of record {recid} cleared.", fg="green")
+
+
+@openaire_failures_cli.command("retry")
+@with_appcontext
+def retry_openaire_failures_command():
+    """Send the retry task for the failures that are due."""
+    retry_openaire_failures.delay()
+    click.secho("OpenAIRE retry task sent.", fg="green")
+
+
+@openaire_failures_cli.command("import-legacy")
+@with_appcontext
+def import_legacy_openaire_failures():
+    """Move the failures stored as ``openaire_direct_index:<id>`` cache keys."""
+    imported = import_legacy_failures()
+    click.secho(f"Imported {imported} failures.", fg="green")
+
+
+@zenodo_admin.command("warm-frontpage-cache")
+@with_appcontext
+def warm_frontpage_cache_command():
+    """Send the frontpage cache warmup, once per deployed image.
+
+    Meant to run as a deploy step: the processes of the new image
+    (``IMAGE_BUILD_TIMESTAMP``) miss the cached frontpage data of the previous one.
+    """
+    timestamp = current_app.config.get("IMAGE_BUILD_TIMESTAMP")
+    # Only the first run of the deploy sends the warmup
+    if timestamp and not current_cache.add(
+        f"frontpage:warmup:{timestamp}", True, timeout=60 * 60 * 24
+    ):
+        click.secho("Frontpage cache warmup already sent.", fg="yellow")
+        return
+    warm_frontpage_cache.delay()
+    click.secho("Frontpage cache warmup sent.", fg="green")
+
+
 @click.group()
 def moderation_cli():
     """Moderation commands."""
@@ -367,6 +505,44 @@ def _create_and_index_query(record_cls, query_string, notes, score, active):
     index_percolate_query(record_cls, query.id, query_string, active, score, notes)
 
 
+@queries_cli.command("rescore")
+@click.option(
+    "--start",
+    type=click.DateTime(),
+    required=True,
+    help="Re-score records created on or after this date.",
+)
+@click.option(
+    "--end",
+    type=click.DateTime(),
+    required=True,
+    help="Re-score records created before this date.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Number of records percolated at once.",
+)
+@click.option(
+    "--async",
+    "run_async",
+    is_flag=True,
+    default=False,
+    help="Run the re-scoring in a Celery task.",
+)
+@with_appcontext
+def rescore_records_command(start, end, batch_size, run_async):
+    """Command to re-score records against the moderation queries."""
+    args = (start.isoformat(), end.isoformat(), batch_size)
+    if run_async:
+        rescore_records.delay(*args)
+        click.secho("Re-scoring task sent.", fg="green")
+    else:
+        total, matched = rescore_records(*args)
+        click.secho(f"Re-scored {total} records, {matched} matched.", fg="green")
+
+
 @moderation_cli.group("domains")
 def domains_cli():
     """Moderation domains commands."""
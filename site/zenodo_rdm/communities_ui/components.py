@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Community metrics record component."""
+
+from invenio_drafts_resources.services.records.components import ServiceComponent
+from invenio_records_resources.services.uow import TaskOp
+
+from zenodo_rdm.communities_ui.metrics import (
+    should_schedule_update,
+    themed_community_ids,
+)
+from zenodo_rdm.communities_ui.tasks import update_community_metrics
+
+
+class CommunityMetricsComponent(ServiceComponent):
+    """Update the metrics of the communities of a published record."""
+
+    def publish(self, identity, draft=None, record=None):
+        """Publish handler."""
+        community_ids = list(record.parent.communities.ids)
+        if not community_ids:
+            return
+        # Only the themed communities have metrics
+        for community_id in themed_community_ids(community_ids):
+            if should_schedule_update(community_id):
+                self.uow.register(
+                    TaskOp(update_community_metrics, community_id=community_id)
+                )
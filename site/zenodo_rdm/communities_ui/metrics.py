@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Precomputed metrics of the themed communities.
+
+The aggregations of a brand's ``THEME_METRICS_QUERY`` run over all the records of
+a community, which is slow for large communities. They are computed in a Celery
+task, on a schedule and after publishing to a community, and the community home
+page reads the stored values. Only on a cold cache, e.g. for a newly themed
+community, the first request computes them.
+"""
+
+from datetime import datetime, timezone
+
+from flask import current_app
+from flask_principal import AnonymousIdentity
+from invenio_access.permissions import any_user
+from invenio_cache import current_cache
+from invenio_communities.communities.records.models import CommunityMetadata
+from invenio_db import db
+from invenio_rdm_records.proxies import current_community_records_service
+
+from zenodo_rdm.communities_ui.views.metrics_config import (
+    THEME_METRICS,
+    THEME_METRICS_QUERY,
+)
+
+METRICS_VERSION = 1
+"""Version of the stored metrics, to bump when their format changes."""
+
+
+def cache_key(community_id):
+    """Cache key of the metrics of a community."""
+    return f"community_metrics:{community_id}"
+
+
+def _get_metric(aggregations, accessor):
+    """Get a metric from the aggregations of a search."""
+    value = aggregations
+    for key in accessor.split("."):
+        value = value[key]
+    return value
+
+
+def default_metrics(brand, total_records=0):
+    """Metrics to show until the ones of a community are computed."""
+    metrics = {metric: 0 for metric in THEME_METRICS.get(brand, {})}
+    metrics["total_records"] = total_records
+    return metrics
+
+
+def compute_community_metrics(community_id, brand):
+    """Compute the metrics of a community, with the aggregations of its brand."""
+    # Metrics are shared by all visitors, so only public records are counted
+    identity = AnonymousIdentity()
+    identity.provides.add(any_user)
+    params = {"size": 1}
+    if brand in THEME_METRICS_QUERY:
+        params["metrics"] = THEME_METRICS_QUERY[brand]
+
+    result = current_community_records_service.search(
+        community_id=str(community_id),
+        identity=identity,
+        params=params,
+        expand=False,
+    )
+
+    metrics = {"total_records": result.total}
+    for metric, getter in THEME_METRICS.get(brand, {}).items():
+        if isinstance(getter, str):
+            metrics[metric] = _get_metric(result._results.aggregations, getter)
+        else:
+            metrics[metric] = getter(result) or 0
+    return metrics
+
+
+def get_community_metrics(community_id, brand):
+    """Get the stored metrics of a community, or ``None`` if not computed yet."""
+    entry = current_cache.get(cache_key(community_id))
+    if (
+        not entry
+        or entry.get("version") != METRICS_VERSION
+        or entry.get("brand") != brand
+    ):
+        return None
+    return entry["metrics"]
+
+
+def update_community_metrics(community_id):
+    """Compute and store the metrics of a themed community."""
+    from invenio_communities.communities.records.api import Community
+
+    community = Community.get_record(community_id)
+    theme = community.theme or {}
+    if not theme.get("enabled"):
+        current_cache.delete(cache_key(community_id))
+        return None
+
+    brand = theme.get("brand")
+    entry = {
+        "version": METRICS_VERSION,
+        "brand": brand,
+        "updated": datetime.now(timezone.utc).isoformat(),
+        "metrics": compute_community_metrics(community.id, brand),
+    }
+    current_cache.set(
+        cache_key(community_id),
+        entry,
+        timeout=current_app.config["ZENODO_COMMUNITY_METRICS_CACHE_TIMEOUT"],
+    )
+    return entry
+
+
+def get_or_compute_community_metrics(community_id, brand):
+    """Get the stored metrics of a community, computing them on a cold cache.
+
+    Only one request computes the metrics of a community, the concurrent ones get
+    ``None`` until they are stored.
+    """
+    metrics = get_community_metrics(community_id, brand)
+    if metrics is not None:
+        return metrics
+
+    lock_key = f"{cache_key(community_id)}:computing"
+    if not current_cache.add(lock_key, True, timeout=60):
+        return None
+    try:
+        entry = update_community_metrics(community_id)
+    except Exception:
+        current_app.logger.exception(
+            "Could not compute the metrics of community %(community_id)s.",
+            {"community_id": community_id},
+            extra={"community_id": community_id},
+        )
+        return None
+    finally:
+        current_cache.delete(lock_key)
+    return entry["metrics"] if entry else None
+
+
+def themed_community_ids(community_ids=None):
+    """Ids of the communities with an enabled theme, optionally among some ids."""
+    query = db.session.query(CommunityMetadata.id).filter(
+        CommunityMetadata.is_deleted.isnot(True),
+        CommunityMetadata.json["theme"]["enabled"].as_boolean().is_(True),
+    )
+    if community_ids is not None:
+        query = query.filter(CommunityMetadata.id.in_(community_ids))
+    return [str(community_id) for (community_id,) in query]
+
+
+def should_schedule_update(community_id):
+    """Check if an update of the metrics of a community should be sent.
+
+    Updates are sent at most once per ``ZENODO_COMMUNITY_METRICS_UPDATE_INTERVAL``
+    seconds per community, e.g. during a burst of publications.
+    """
+    return current_cache.add(
+        f"{cache_key(community_id)}:scheduled",
+        True,
+        timeout=current_app.config["ZENODO_COMMUNITY_METRICS_UPDATE_INTERVAL"],
+    )
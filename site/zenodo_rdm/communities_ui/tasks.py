@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Community metrics tasks."""
+
+from celery import shared_task
+from flask import current_app
+
+from zenodo_rdm.communities_ui import metrics
+
+
+@shared_task(ignore_result=True)
+def update_community_metrics(community_id):
+    """Compute the metrics of a themed community."""
+    metrics.update_community_metrics(community_id)
+
+
+@shared_task(ignore_result=True)
+def update_themed_communities_metrics():
+    """Compute the metrics of all the themed communities."""
+    for community_id in metrics.themed_community_ids():
+        try:
+            metrics.update_community_metrics(community_id)
+        except Exception:
+            # Keep going if one community fails, but log so it stays visible.
+            current_app.logger.exception(
+                "Could not update the metrics of community %(community_id)s.",
+                {"community_id": community_id},
+                extra={"community_id": community_id},
+            )
@@ -5,7 +5,6 @@
 """Community custom views."""
 
 from flask import g, redirect, request, url_for
-from invenio_cache import current_cache
 from invenio_communities.views.communities import (
     HEADER_PERMISSIONS,
     render_community_theme_template,
@@ -18,21 +17,12 @@ from invenio_rdm_records.proxies import (
 from invenio_rdm_records.resources.serializers import UIJSONSerializer
 from invenio_records_resources.services.errors import PermissionDeniedError
 
-from zenodo_rdm.communities_ui.views.metrics_config import (
-    THEME_METRICS,
-    THEME_METRICS_QUERY,
+from zenodo_rdm.communities_ui.metrics import (
+    default_metrics,
+    get_or_compute_community_metrics,
 )
 
 
-def _get_metric_from_search(result, accessor):
-    """Get metric from search result."""
-    value = result._results.aggregations
-    keys = accessor.split(".")
-    for key in keys:
-        value = value[key]
-    return value
-
-
 @pass_community(serialize=True)
 def communities_home(pid_value, community, community_ui):
     """Community home page."""
@@ -55,41 +45,21 @@ def communities_home(pid_value, community, community_ui):
         return redirect(url)
 
     if theme_enabled:
-        metrics = current_cache.get(f"community_metrics:{community.id}")
-
-        params = {
-            "sort": "newest",
-            "size": 3,
-        }
-        if not metrics:
-            params["metrics"] = THEME_METRICS_QUERY[community._record.theme["brand"]]
+        brand = community._record.theme["brand"]
+        metrics = get_or_compute_community_metrics(community.id, brand)
 
         recent_uploads = current_community_records_service.search(
             community_id=pid_value,
             identity=g.identity,
-            params=params,
+            params={"sort": "newest", "size": 3},
             expand=True,
         )
 
         collections = collections_service.list_trees(g.identity, community.id, depth=0)
 
-        # TODO resultitem does not expose aggregations except labelled facets
-        if not metrics:
-            metrics = {
-                "total_records": recent_uploads.total,
-            }
-            for metric, getter in THEME_METRICS.get(
-                community._record.theme["brand"], {}
-            ).items():
-                if type(getter) == str:
-                    metrics[metric] = _get_metric_from_search(recent_uploads, getter)
-                else:
-                    metrics[metric] = getter(recent_uploads) or 0
-            current_cache.set(
-                f"community_metrics:{community.id}",
-                metrics,
-                timeout=60 * 60 * 4,
-            )
+        # Until the metrics are computed, e.g. by a concurrent request
+        if metrics is None:
+            metrics = default_metrics(brand, total_records=recent_uploads.total)
 
         records_ui = UIJSONSerializer().dump_list(recent_uploads.to_dict())["hits"][
             "hits"
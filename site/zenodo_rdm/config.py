@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Custom code config."""
 
+from datetime import timedelta
+
 from invenio_administration.permissions import administration_permission
 from invenio_search.api import dsl
 
@@ -195,7 +197,51 @@ ZENODO_FRONTPAGE_RECENT_UPLOADS_QUERY = dsl.query.Bool(
     ]
 )
 
-ZENODO_FRONTPAGE_CACHE_TIMEOUT = 60 * 30
+ZENODO_FRONTPAGE_CACHE_TIMEOUT = 60 * 60 * 6
+"""Seconds after which the frontpage data expires and is recomputed in the request."""
+
+ZENODO_FRONTPAGE_CACHE_SOFT_TIMEOUT = 60 * 30
+"""Seconds after which the frontpage data is refreshed in the background."""
+
+
+# Community metrics
+# =================
+
+ZENODO_COMMUNITY_METRICS_CACHE_TIMEOUT = 60 * 60 * 24 * 2
+"""Seconds the metrics of a themed community are kept if not recomputed."""
+
+ZENODO_COMMUNITY_METRICS_UPDATE_INTERVAL = 60 * 5
+"""Minimum seconds between two updates of a community's metrics on publish."""
+
+
+# IIIF
+# ====
+
+ZENODO_IIIF_TILES_BATCH_SIZE = 50
+"""Number of records per task of the IIIF tiles generation job."""
+
+ZENODO_IIIF_TILES_MAX_RECORDS = None
+"""Maximum number of records tiled per run of the job (``None`` for all)."""
+
+
+# Legacy API
+# ==========
+
+ZENODO_LEGACY_LOOKUPS_CACHE_TIMEOUT = 60 * 60
+"""Seconds the bucket owners and file keys of the legacy Files-REST API are cached."""
+
+ZENODO_LEGACY_LOOKUPS_MISSING_CACHE_TIMEOUT = 30
+"""Seconds the file IDs not found by the legacy Files-REST API are cached."""
+
+
+# Sitemap
+# =======
+
+ZENODO_SITEMAP_RECORDS_SHARD_SIZE = 50_000
+"""Size of the ``pid.pk`` ranges of the record sitemap shards kept between builds."""
+
+ZENODO_SITEMAP_RECORDS_HWM_OVERLAP = timedelta(hours=1)
+"""Overlap with the previous build, covering records indexed after being updated."""
 
 
 # Citations
@@ -27,11 +27,36 @@ def exporter():
     type=str,
     help="Slug of the community.",
 )
+@click.option(
+    "-s",
+    "--shards",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of shards exported in parallel by Celery workers.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    help="Only export records updated after this date (delta export).",
+)
 @with_appcontext
-def export_records_command(format, community_slug):
+def export_records_command(format, community_slug, shards, since):
     """Export records."""
     try:
-        export_records(format, community_slug)
-        click.secho("Records exported successfully.", fg="green")
+        export_records(
+            format,
+            community_slug,
+            shards=shards,
+            since=since.isoformat() if since else None,
+        )
+        if shards > 1:
+            click.secho(
+                f"Records export dispatched to {shards} shards. The export files "
+                "are published once the shards are merged.",
+                fg="green",
+            )
+        else:
+            click.secho("Records exported successfully.", fg="green")
     except Exception as e:
         click.secho(f"Error exporting records: {e}", fg="red")
@@ -8,7 +8,33 @@ EXPORTER_BUCKET_UUID = UUID("00000000-0000-0000-0000-000000000001")
 
 EXPORTER_NUMBER_VERSIONS_TO_KEEP = 3
 
+EXPORTER_NUMBER_DELTAS_TO_KEEP = 30
+"""Number of most recent delta export files to keep."""
+
 EXPORTER_JOB_DEFAULT_FORMAT = "json"
 
 # TODO: Use `example-community-slug` when custom args work properly.
 EXPORTER_JOB_DEFAULT_COMMUNITY_SLUG = "biosyslit"
+
+EXPORTER_SPOOL_MAX_SIZE = 64 * 1024 * 1024  # 64 MB
+"""Maximum size of an export file kept in memory before spilling to disk."""
+
+EXPORTER_SPOOL_DIR = None
+"""Directory for spilled export files (defaults to the system temp directory)."""
+
+EXPORTER_JOB_DEFAULT_SHARDS = 1
+"""Number of sliced-scroll shards exported in parallel by the export job.
+
+The shards are merged by a chord callback, which also updates the job run.
+"""
+
+EXPORTER_SERIALIZATION_WORKERS = 0
+"""Number of processes serializing records to XML (0 serializes in-process).
+
+Only used where the exporter can start child processes, e.g. when running the
+export from the CLI. It is ignored in prefork Celery workers, where sharded exports
+(``EXPORTER_JOB_DEFAULT_SHARDS``) parallelize the export instead.
+"""
+
+EXPORTER_SERIALIZATION_BATCH_SIZE = 500
+"""Number of records sent at once to a serialization process."""
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """ZenodoRDM exporter jobs."""
 
+import arrow
 from flask import current_app
 from invenio_i18n import lazy_gettext as _
 from invenio_jobs.jobs import JobType
@@ -24,4 +25,27 @@ class ExportRecords(JobType):
         default_community_slug = current_app.config[
             "EXPORTER_JOB_DEFAULT_COMMUNITY_SLUG"
         ]
-        return {"format": default_format, "community_slug": default_community_slug}
+        default_shards = current_app.config["EXPORTER_JOB_DEFAULT_SHARDS"]
+        return {
+            "format": default_format,
+            "community_slug": default_community_slug,
+            "shards": default_shards,
+        }
+
+
+class ExportRecordsDelta(ExportRecords):
+    """Export Records Delta Job."""
+
+    description = _("Export records updated since the last successful run")
+    title = _("Export Records Delta")
+    id = "export_records_delta"
+
+    @classmethod
+    def build_task_arguments(cls, job_obj, since=None, **kwargs):
+        """Generate default job arguments, exporting only records updated since."""
+        args = super().build_task_arguments(job_obj, since=since, **kwargs)
+        # Without a previous successful run, all the records go in the delta files
+        args["delta"] = True
+        if since:
+            args["since"] = arrow.get(since).isoformat()
+        return args
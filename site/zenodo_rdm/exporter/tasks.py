@@ -5,18 +5,30 @@
 import csv
 import gzip
 import json
+import multiprocessing
+import shutil
 import tarfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
 from io import BytesIO, TextIOWrapper
+from itertools import islice
+from tempfile import SpooledTemporaryFile
 
-from celery import shared_task
+import arrow
+from celery import chord, group, shared_task
 from flask import current_app
 from flask_principal import AnonymousIdentity, identity_changed
 from invenio_access.permissions import any_user
 from invenio_communities.communities.records.models import CommunityMetadata
 from invenio_db import db
 from invenio_files_rest.models import Bucket, Location, ObjectVersion, as_bucket
+from invenio_jobs.models import Run, RunStatusEnum
+from invenio_jobs.tasks import execute_run
 from invenio_rdm_records.oai import oai_datacite_etree
 from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_search.api import dsl
 from lxml import etree
 
 RECORDS_MIMETYPE = "application/gzip"
@@ -38,6 +50,7 @@ def _scan_with_scroll(
     search_preference=None,
     expand=False,
     scroll="5m",
+    slice=None,
     **kwargs,
 ):
     """Scan for records matching the querystring with scroll parameter."""
@@ -47,11 +60,11 @@ def _scan_with_scroll(
 
     # Prepare and execute the search as scan()
     params = params or {}
-    search_result = (
-        service._search("scan", identity, params, search_preference, **kwargs)
-        .params(scroll=scroll)
-        .scan()
-    )
+    search = service._search("scan", identity, params, search_preference, **kwargs)
+    if slice:
+        # Sliced scroll, e.g. ``{"id": 0, "max": 4}`` for the first of 4 slices
+        search = search.extra(slice=slice)
+    search_result = search.params(scroll=scroll).scan()
 
     return service.result_list(
         service,
@@ -65,7 +78,9 @@ def _scan_with_scroll(
     )
 
 
-def _export_records_to_files(format, community_slug, records_file, deleted_file):
+def _export_records_to_files(
+    format, community_slug, records_file, deleted_file, slice=None, since=None
+):
     community_uuid = None
 
     if community_slug:
@@ -83,6 +98,9 @@ def _export_records_to_files(format, community_slug, records_file, deleted_file)
         q=f"parent.communities.ids:{community_uuid}" if community_uuid else "",
         params={"allversions": True, "include_deleted": True},
         scroll="15m",
+        slice=slice,
+        # Deleting a record also bumps its `updated`, so tombstones are included
+        extra_filter=dsl.Q("range", updated={"gt": since}) if since else None,
     )
 
     deleted_file_content = TextIOWrapper(deleted_file, encoding="utf-8")
@@ -100,54 +118,46 @@ def _export_records_to_files(format, community_slug, records_file, deleted_file)
         ]
     )
 
-    for idx, record in enumerate(res.hits):
-        if idx % 1000 == 0:
-            current_app.logger.debug(f"Record index: {idx:_}")
-
-        record_id = record.get("id")
-        if not record_id:
-            continue
+    def live_records():
+        for idx, record in enumerate(res.hits):
+            if idx % 1000 == 0:
+                current_app.logger.debug(f"Record index: {idx:_}")
 
-        is_deleted = record.get("deletion_status", {}).get("is_deleted", False)
-        if is_deleted:
-            removal_reason = (
-                record.get("tombstone", {}).get("removal_reason", {}).get("id")
-            )
-            deleted_writer.writerow(
-                [
-                    record_id,
-                    record["pids"]["doi"]["identifier"],
-                    record.get("parent", {}).get("id"),
-                    record.get("parent", {})
-                    .get("pids", {})
-                    .get("doi", {})
-                    .get("identifier"),
-                    record.get("tombstone", {}).get("note"),
-                    removal_reason,
-                    record.get("tombstone", {}).get("removal_date"),
-                    (
-                        record.get("tombstone", {}).get("citation_text")
-                        if removal_reason != "spam"
-                        else None
-                    ),
-                ]
-            )
-            continue
+            record_id = record.get("id")
+            if not record_id:
+                continue
 
-        if format == "json":
-            content_bytes = json.dumps(record).encode()
-        elif format == "xml":
-            try:
-                oai_etree = oai_datacite_etree(None, {"_source": record})
-                content_bytes = etree.tostring(
-                    oai_etree,
-                    xml_declaration=True,
-                    encoding="UTF-8",
+            is_deleted = record.get("deletion_status", {}).get("is_deleted", False)
+            if is_deleted:
+                removal_reason = (
+                    record.get("tombstone", {}).get("removal_reason", {}).get("id")
+                )
+                deleted_writer.writerow(
+                    [
+                        record_id,
+                        record["pids"]["doi"]["identifier"],
+                        record.get("parent", {}).get("id"),
+                        record.get("parent", {})
+                        .get("pids", {})
+                        .get("doi", {})
+                        .get("identifier"),
+                        record.get("tombstone", {}).get("note"),
+                        removal_reason,
+                        record.get("tombstone", {}).get("removal_date"),
+                        (
+                            record.get("tombstone", {}).get("citation_text")
+                            if removal_reason != "spam"
+                            else None
+                        ),
+                    ]
                 )
-            except Exception as e:
-                current_app.logger.exception(f"Error serializing {record_id}: {e}")
-        else:
-            raise ValueError(f"Unsupported format '{format}'")
+                continue
+
+            yield record
+
+    for record_id, content_bytes in _iter_serialized(format, live_records()):
+        if content_bytes is None:
+            continue
 
         filename = f"{record_id}.{format}"
         tar_info = tarfile.TarInfo(filename)
@@ -159,6 +169,98 @@ def _export_records_to_files(format, community_slug, records_file, deleted_file)
         records_file.addfile(tar_info, fileobj=file_content)
 
 
+def _serialize_record(format, record):
+    """Serialize a record, returning ``None`` if it cannot be serialized."""
+    if format == "json":
+        return json.dumps(record).encode()
+    elif format == "xml":
+        try:
+            oai_etree = oai_datacite_etree(None, {"_source": record})
+            return etree.tostring(
+                oai_etree,
+                xml_declaration=True,
+                encoding="UTF-8",
+            )
+        except Exception as e:
+            current_app.logger.exception(f"Error serializing {record['id']}: {e}")
+            return None
+    else:
+        raise ValueError(f"Unsupported format '{format}'")
+
+
+def _serialize_batch(format, records):
+    return [(record["id"], _serialize_record(format, record)) for record in records]
+
+
+def _init_serialization_worker():
+    """Push an application context in a serialization worker process."""
+    from invenio_app.factory import create_api
+
+    create_api().app_context().push()
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _iter_serialized(format, records):
+    """Yield ``(record_id, content_bytes)`` pairs in the order of ``records``.
+
+    XML serialization is CPU-bound, so with ``EXPORTER_SERIALIZATION_WORKERS`` set
+    batches of records are serialized in a pool of processes. At most two batches
+    per worker are in flight, and results are yielded in submission order, so the
+    caller stays the single writer of the archive. A batch that fails in the pool,
+    e.g. with a crashed worker, is serialized again in-process, record by record.
+
+    Daemonic processes, e.g. prefork Celery workers, cannot have children, so
+    there the records are always serialized in-process. Sharded exports are the
+    way to parallelize an export running in Celery.
+    """
+    workers = current_app.config["EXPORTER_SERIALIZATION_WORKERS"]
+    if workers and multiprocessing.current_process().daemon:
+        current_app.logger.warning(
+            "EXPORTER_SERIALIZATION_WORKERS is ignored in daemonic processes, "
+            "e.g. Celery workers."
+        )
+        workers = 0
+    if format != "xml" or not workers:
+        for record in records:
+            yield record["id"], _serialize_record(format, record)
+        return
+
+    def _results(batch, future):
+        try:
+            return future.result()
+        except Exception:
+            current_app.logger.exception("Serialization of a batch failed.")
+            return _serialize_batch(format, batch)
+
+    batch_size = current_app.config["EXPORTER_SERIALIZATION_BATCH_SIZE"]
+    # Workers are spawned (not forked) so that they don't share DB connections
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_serialization_worker,
+    ) as executor:
+        pending = deque()
+        for batch in _batched(records, batch_size):
+            pending.append((batch, executor.submit(_serialize_batch, format, batch)))
+            if len(pending) >= 2 * workers:
+                yield from _results(*pending.popleft())
+        while pending:
+            yield from _results(*pending.popleft())
+
+
+def _spooled_file():
+    """Temporary file kept in memory up to a size limit, then spilled to disk."""
+    return SpooledTemporaryFile(
+        max_size=current_app.config["EXPORTER_SPOOL_MAX_SIZE"],
+        dir=current_app.config["EXPORTER_SPOOL_DIR"],
+    )
+
+
 def _create_or_get_bucket():
     bucket_uuid = current_app.config["EXPORTER_BUCKET_UUID"]
     bucket = as_bucket(bucket_uuid)
@@ -202,33 +304,267 @@ def _remove_old_object_versions(bucket, filename):
     db.session.commit()
 
 
-@shared_task
-def export_records(format, community_slug):
-    """Export records."""
-    bucket = _create_or_get_bucket()
+def _export_filenames(format, community_slug, shard_id=None, delta_date=None):
+    """Return the keys of the records and deleted records files of an export."""
+    filename_prefix = f"{community_slug}/" if community_slug else ""
+    if shard_id is not None:
+        filename_prefix += f"shards/{format}/{shard_id}/"
+    suffix = f"-delta-{delta_date}" if delta_date else ""
+    records_filename = f"{filename_prefix}records-{format}{suffix}.tar.gz"
+    deleted_filename = f"{filename_prefix}records-deleted{suffix}.csv.gz"
+    return records_filename, deleted_filename
+
+
+def _open_object(bucket, filename):
+    """Open the head version of an object for reading."""
+    object_version = ObjectVersion.get(bucket, filename)
+    return object_version.file.storage().open()
+
+
+def _remove_all_object_versions(bucket, filename):
+    for object_version in ObjectVersion.get_versions(bucket=bucket, key=filename):
+        object_version.remove()
+    db.session.commit()
+
+
+def _remove_old_delta_files(bucket, filename):
+    """Keep only the most recent delta files of the same kind as ``filename``."""
+    number_deltas_to_keep = current_app.config["EXPORTER_NUMBER_DELTAS_TO_KEEP"]
+    key_prefix = filename.rsplit("-delta-", 1)[0] + "-delta-"
+    keys = (
+        db.session.query(ObjectVersion.key)
+        .filter(
+            ObjectVersion.bucket_id == bucket.id,
+            ObjectVersion.key.startswith(key_prefix),
+        )
+        .distinct()
+        .all()
+    )
+    # Delta keys end with a UTC timestamp, so sorting them sorts them by date
+    for (key,) in sorted(keys, reverse=True)[number_deltas_to_keep:]:
+        current_app.logger.info(f"Removing previous delta file: {key}")
+        _remove_all_object_versions(bucket, key)
 
-    records_file_stream = BytesIO()
-    deleted_file_stream = BytesIO()
 
+def _write_export_files(bucket, records_filename, deleted_filename, write_func):
+    """Build the export files with ``write_func`` and store them in the bucket."""
     with (
-        tarfile.open(fileobj=records_file_stream, mode="w|gz") as records_file,
-        gzip.GzipFile(fileobj=deleted_file_stream, mode="w") as deleted_file,
+        _spooled_file() as records_file_stream,
+        _spooled_file() as deleted_file_stream,
     ):
-        _export_records_to_files(format, community_slug, records_file, deleted_file)
+        with (
+            tarfile.open(fileobj=records_file_stream, mode="w|gz") as records_file,
+            gzip.GzipFile(fileobj=deleted_file_stream, mode="w") as deleted_file,
+        ):
+            write_func(records_file, deleted_file)
 
-    records_file_stream.seek(0)
-    deleted_file_stream.seek(0)
+        records_file_stream.seek(0)
+        deleted_file_stream.seek(0)
 
-    filename_prefix = f"{community_slug}/" if community_slug else ""
-    records_filename = f"{filename_prefix}records-{format}.tar.gz"
-    deleted_filename = f"{filename_prefix}records-deleted.csv.gz"
+        _create_object_version(
+            bucket, records_file_stream, records_filename, RECORDS_MIMETYPE
+        )
+        _create_object_version(
+            bucket, deleted_file_stream, deleted_filename, DELETED_MIMETYPE
+        )
+
+
+def _remove_shard_files(bucket, format, community_slug, shards, delta_date):
+    for shard_id in range(shards):
+        for filename in _export_filenames(format, community_slug, shard_id, delta_date):
+            _remove_all_object_versions(bucket, filename)
 
-    _create_object_version(
-        bucket, records_file_stream, records_filename, RECORDS_MIMETYPE
-    )
-    _create_object_version(
-        bucket, deleted_file_stream, deleted_filename, DELETED_MIMETYPE
-    )
 
+def _cleanup_export_files(bucket, records_filename, deleted_filename, delta_date):
     _remove_old_object_versions(bucket, records_filename)
     _remove_old_object_versions(bucket, deleted_filename)
+    if delta_date:
+        _remove_old_delta_files(bucket, records_filename)
+        _remove_old_delta_files(bucket, deleted_filename)
+
+
+def _merge_shard_files(
+    bucket, format, community_slug, shards, delta_date, records_file, deleted_file
+):
+    """Concatenate the shard files of an export, in shard order."""
+    for shard_id in range(shards):
+        shard_records, shard_deleted = _export_filenames(
+            format, community_slug, shard_id, delta_date
+        )
+        with (
+            _open_object(bucket, shard_records) as fp,
+            tarfile.open(fileobj=fp, mode="r|gz") as shard_file,
+        ):
+            for tar_info in shard_file:
+                records_file.addfile(tar_info, shard_file.extractfile(tar_info))
+
+        with (
+            _open_object(bucket, shard_deleted) as fp,
+            gzip.GzipFile(fileobj=fp, mode="r") as shard_file,
+        ):
+            header = shard_file.readline()
+            if shard_id == 0:
+                deleted_file.write(header)
+            shutil.copyfileobj(shard_file, deleted_file)
+
+
+@shared_task
+def export_records_shard(
+    format, community_slug, shard_id, shards, since=None, delta_date=None
+):
+    """Export one slice of the records into partial shard files."""
+    bucket = _create_or_get_bucket()
+    records_filename, deleted_filename = _export_filenames(
+        format, community_slug, shard_id, delta_date
+    )
+    current_app.logger.info(f"Exporting shard {shard_id + 1}/{shards}")
+    _write_export_files(
+        bucket,
+        records_filename,
+        deleted_filename,
+        partial(
+            _export_records_to_files,
+            format,
+            community_slug,
+            slice={"id": shard_id, "max": shards},
+            since=since,
+        ),
+    )
+
+
+def _current_job_run_id():
+    """Id of the job run executing the export, if any."""
+    # Job runs apply the task of their job from within their own task
+    task_id = execute_run.request.id
+    if not task_id:
+        return None
+    run = Run.query.filter_by(task_id=task_id).one_or_none()
+    return str(run.id) if run else None
+
+
+@shared_task
+def merge_export_shards(
+    results, format, community_slug, shards, delta_date=None, run_id=None
+):
+    """Merge the shard files of an export into the published files.
+
+    Last step of a sharded export, marking its job run, if any, as successful.
+    """
+    bucket = _create_or_get_bucket()
+    records_filename, deleted_filename = _export_filenames(
+        format, community_slug, delta_date=delta_date
+    )
+
+    _write_export_files(
+        bucket,
+        records_filename,
+        deleted_filename,
+        partial(_merge_shard_files, bucket, format, community_slug, shards, delta_date),
+    )
+
+    _remove_shard_files(bucket, format, community_slug, shards, delta_date)
+    _cleanup_export_files(bucket, records_filename, deleted_filename, delta_date)
+
+    if run_id:
+        run = Run.query.filter_by(id=run_id).one()
+        run.status = RunStatusEnum.SUCCESS
+        run.message = None
+        run.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+@shared_task(bind=True, max_retries=60, default_retry_delay=5)
+def fail_export_run(self, run_id, message):
+    """Mark the job run of a sharded export as failed."""
+    run = Run.query.filter_by(id=run_id).one()
+    if run.finished_at is None:
+        # Not yet marked as successful by the job, which would override the failure
+        raise self.retry()
+    run.status = RunStatusEnum.FAILED
+    run.message = message
+    run.finished_at = datetime.utcnow()
+    db.session.commit()
+
+
+@shared_task
+def export_shards_failed(
+    request,
+    exc,
+    traceback,
+    format,
+    community_slug,
+    shards,
+    delta_date=None,
+    run_id=None,
+):
+    """Errback of a sharded export, called when a shard or the merge fails."""
+    current_app.logger.error(
+        f"Sharded export failed: {exc!r}",
+        extra={"format": format, "community": community_slug, "task": request.id},
+    )
+    _remove_shard_files(
+        _create_or_get_bucket(), format, community_slug, shards, delta_date
+    )
+    if run_id:
+        fail_export_run.delay(run_id, f"{exc.__class__.__name__}: {exc}")
+
+
+@shared_task
+def export_records(format, community_slug, shards=1, since=None, delta=False):
+    """Export records.
+
+    With ``shards`` greater than one, the records are split with a sliced scroll
+    and every slice is exported by its own task. The shard files are merged into
+    the published files by a chord callback once all of them are done, and the
+    export returns right after dispatching the shards.
+
+    The job run of a sharded export is marked as successful by the job once the
+    shards are dispatched. The merge marks it as successful again when the files
+    are published, and it is marked as failed if a shard or the merge fails, so
+    that delta exports keep starting from the last complete one.
+
+    With ``since``, only the records updated (or deleted) after that date are
+    exported. Delta exports, i.e. with ``delta`` or ``since``, are written to
+    ``-delta-<timestamp>`` files next to the full export files.
+    """
+    if since:
+        since = arrow.get(since).to("utc").isoformat()
+    delta_date = None
+    if delta or since:
+        delta_date = arrow.utcnow().strftime("%Y-%m-%dT%H%M%SZ")
+
+    if shards > 1:
+        run_id = _current_job_run_id()
+        if run_id:
+            run = Run.query.filter_by(id=run_id).one()
+            run.message = f"Exporting {shards} shards, published once merged."
+            db.session.commit()
+        header = group(
+            export_records_shard.si(
+                format, community_slug, shard_id, shards, since, delta_date
+            )
+            for shard_id in range(shards)
+        )
+        callback = merge_export_shards.s(
+            format, community_slug, shards, delta_date, run_id=run_id
+        ).on_error(
+            export_shards_failed.s(
+                format, community_slug, shards, delta_date, run_id=run_id
+            )
+        )
+        chord(header)(callback)
+        return
+
+    bucket = _create_or_get_bucket()
+    records_filename, deleted_filename = _export_filenames(
+        format, community_slug, delta_date=delta_date
+    )
+
+    _write_export_files(
+        bucket,
+        records_filename,
+        deleted_filename,
+        partial(_export_records_to_files, format, community_slug, since=since),
+    )
+
+    _cleanup_export_files(bucket, records_filename, deleted_filename, delta_date)
@@ -0,0 +1,3 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""ZenodoRDM IIIF module."""
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""ZenodoRDM IIIF jobs."""
+
+from flask import current_app
+from invenio_i18n import lazy_gettext as _
+from invenio_jobs.jobs import JobType
+
+from zenodo_rdm.iiif.tasks import generate_iiif_tiles
+
+
+class GenerateIIIFTiles(JobType):
+    """Generate IIIF tiles job."""
+
+    task = generate_iiif_tiles
+    description = _("Generate IIIF tiles for the records that don't have them yet")
+    title = _("Generate IIIF tiles")
+    id = "generate_iiif_tiles"
+
+    @classmethod
+    def build_task_arguments(cls, job_obj, since=None, **kwargs):
+        """Generate default job arguments."""
+        return {
+            "batch_size": current_app.config["ZENODO_IIIF_TILES_BATCH_SIZE"],
+            "max_records": current_app.config["ZENODO_IIIF_TILES_MAX_RECORDS"],
+        }
@@ -0,0 +1,266 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""IIIF tiles generation tasks.
+
+Records with image files are selected in SQL, leaving out the ones whose image
+files all have a ``finished`` ``.ptif`` media file. This makes each record its
+own checkpoint: re-running the job after a crash only picks up the records that
+were not tiled yet, including the ones that failed.
+"""
+
+import time
+import uuid
+from datetime import datetime, timezone
+
+from celery import shared_task
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_rdm_records.records.models import (
+    RDMFileRecordMetadata,
+    RDMMediaFileRecordMetadata,
+)
+from invenio_rdm_records.records.processors.tiles import TilesProcessor
+from invenio_rdm_records.services.iiif.tasks import generate_tiles
+from invenio_records_resources.services.files.processors.image import (
+    ImageMetadataExtractor,
+)
+from invenio_records_resources.services.uow import RecordCommitOp, TaskOp, UnitOfWork
+from sqlalchemy import and_, exists, func, or_
+
+STATS_TIMEOUT = 60 * 60 * 24 * 7
+"""Time the stats of a tiles generation run are kept, in seconds."""
+
+
+def _records_to_tile_query(after=None):
+    """Query the records with image files that are not tiled yet.
+
+    Returns ``(record id, recid)`` pairs ordered by record id, which the unique
+    index on the files ``(record_id, key)`` serves for the keyset pagination.
+    """
+    extensions = current_app.config["IIIF_TILES_VALID_EXTENSIONS"]
+    files = RDMFileRecordMetadata
+    media = RDMMediaFileRecordMetadata
+
+    tiled = exists().where(
+        and_(
+            media.record_id == files.record_id,
+            media.key == files.key + ".ptif",
+            media.json["processor"]["status"].as_string() == "finished",
+        )
+    )
+    query = (
+        db.session.query(files.record_id, PersistentIdentifier.pid_value)
+        .join(files, files.record_id == PersistentIdentifier.object_uuid)
+        .filter(
+            PersistentIdentifier.pid_type == "recid",
+            PersistentIdentifier.status == PIDStatus.REGISTERED,
+            or_(*[func.lower(files.key).like(f"%.{ext}") for ext in set(extensions)]),
+            ~tiled,
+        )
+        .group_by(files.record_id, PersistentIdentifier.pid_value)
+        .order_by(files.record_id)
+    )
+    if after is not None:
+        query = query.filter(files.record_id > after)
+    return query
+
+
+def iter_records_to_tile(batch_size, max_records=None):
+    """Yield batches of recids of the records to tile, in record id order."""
+    after = None
+    remaining = max_records
+    while remaining is None or remaining > 0:
+        limit = batch_size if remaining is None else min(batch_size, remaining)
+        rows = _records_to_tile_query(after).limit(limit).all()
+        if not rows:
+            return
+        yield [recid for _, recid in rows]
+        after = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+class _TilesGenerationUnitOfWork:
+    """Unit of work keeping the tiles generation tasks apart, to run them in-process.
+
+    ``TilesProcessor`` sends a ``generate_tiles`` task per image file once the unit
+    of work is committed. Running them in the job instead makes its outcome that
+    of the generated tiles, and not of the sent tasks.
+    """
+
+    def __init__(self, uow):
+        """Constructor."""
+        self.uow = uow
+        self.files = []
+
+    def register(self, op):
+        """Register an operation, keeping the arguments of the tiles generation."""
+        if isinstance(op, TaskOp) and op._celery_task is generate_tiles:
+            self.files.append(op._kwargs)
+        else:
+            self.uow.register(op)
+
+
+def _tiles_status(record_id, file_key):
+    media = RDMMediaFileRecordMetadata
+    return (
+        db.session.query(media.json["processor"]["status"].as_string())
+        .filter(media.record_id == record_id, media.key == f"{file_key}.ptif")
+        .scalar()
+    )
+
+
+def generate_record_tiles(recid):
+    """Generate the tiles and compute the image dimensions of a record.
+
+    Returns the number of image files tiled and failed.
+    """
+    image_metadata_extractor = ImageMetadataExtractor()
+    with UnitOfWork() as uow:
+        record = service.record_cls.pid.resolve(recid)
+        tiles_uow = _TilesGenerationUnitOfWork(uow)
+        # Initializes the tiles of each image file
+        TilesProcessor()(None, record, uow=tiles_uow)
+        uow.register(RecordCommitOp(record))
+
+        # NOTE: VIPS is pretty fast and doesn't load the entire image in memory.
+        for file_record in record.files.values():
+            if image_metadata_extractor.can_process(file_record):
+                image_metadata_extractor.process(file_record)
+                file_record.commit()
+        uow.commit()
+
+    tiled = failed = 0
+    for kwargs in tiles_uow.files:
+        generate_tiles(**kwargs)
+        if _tiles_status(record.id, kwargs["file_key"]) == "finished":
+            tiled += 1
+        else:
+            failed += 1
+    return tiled, failed
+
+
+def _stats_key(run_id, name):
+    return f"IIIF_TILES::{run_id}::{name}"
+
+
+def _report_if_done(run_id):
+    """Log the stats of a run once all its batches are done, only once."""
+    stats = {
+        name: current_cache.get(_stats_key(run_id, name))
+        for name in (
+            "started",
+            "batches",
+            "done",
+            "processed",
+            "failed",
+            "tiles",
+            "tiles_failed",
+            "seconds",
+        )
+    }
+    if stats["batches"] is None or (stats["done"] or 0) < stats["batches"]:
+        return None
+    if not current_cache.add(_stats_key(run_id, "reported"), True, STATS_TIMEOUT):
+        return None
+
+    elapsed = (
+        datetime.now(timezone.utc) - datetime.fromisoformat(stats["started"])
+    ).total_seconds()
+    processed = stats["processed"] or 0
+    info = {
+        "run_id": run_id,
+        "processed": processed,
+        "failed": stats["failed"] or 0,
+        "tiles": stats["tiles"] or 0,
+        "tiles_failed": stats["tiles_failed"] or 0,
+        "elapsed_seconds": round(elapsed, 1),
+        "records_per_second": round(processed / elapsed, 2) if elapsed else None,
+        "tiles_per_second": (
+            round((stats["tiles"] or 0) / elapsed, 2) if elapsed else None
+        ),
+        # The stats are kept as integers, in milliseconds
+        "worker_seconds": round((stats["seconds"] or 0) / 1000, 1),
+    }
+    failed = info["failed"] or info["tiles_failed"]
+    log = current_app.logger.warning if failed else current_app.logger.info
+    log("IIIF tiles generation finished.", extra=info)
+    return info
+
+
+@shared_task(ignore_result=True)
+def generate_tiles_batch(recids, run_id=None):
+    """Generate the tiles of a batch of records, adding its outcome to the run."""
+    start = time.perf_counter()
+    failed = []
+    tiles = tiles_failed = 0
+    for recid in recids:
+        try:
+            tiled, not_tiled = generate_record_tiles(recid)
+        except Exception:
+            db.session.rollback()
+            failed.append(recid)
+            current_app.logger.exception(
+                "IIIF tiles generation failed for record %(recid)s.",
+                {"recid": recid},
+                extra={"recid": recid},
+            )
+            continue
+        tiles += tiled
+        tiles_failed += not_tiled
+        if not_tiled:
+            failed.append(recid)
+            current_app.logger.warning(
+                "IIIF tiles generation failed for files of record %(recid)s.",
+                {"recid": recid},
+                extra={"recid": recid, "failed_files": not_tiled},
+            )
+
+    if run_id is None:
+        return
+    for name, value in [
+        ("processed", len(recids)),
+        ("failed", len(failed)),
+        ("tiles", tiles),
+        ("tiles_failed", tiles_failed),
+        ("seconds", round((time.perf_counter() - start) * 1000)),
+        ("done", 1),
+    ]:
+        if value:
+            current_cache.inc(_stats_key(run_id, name), value)
+    _report_if_done(run_id)
+
+
+@shared_task(ignore_result=True)
+def generate_iiif_tiles(batch_size=None, max_records=None):
+    """Generate the IIIF tiles of the records that don't have them yet.
+
+    The batches of records are sent to the workers while paging through the
+    records. Each batch generates the tiles of its records, and adds their
+    outcome to the stats of the run, kept in the cache. The last batch to finish
+    reports the throughput and the failures of the run.
+    """
+    batch_size = batch_size or current_app.config["ZENODO_IIIF_TILES_BATCH_SIZE"]
+    run_id = uuid.uuid4().hex
+    current_cache.set(
+        _stats_key(run_id, "started"),
+        datetime.now(timezone.utc).isoformat(),
+        timeout=STATS_TIMEOUT,
+    )
+    for name in ("done", "processed", "failed", "tiles", "tiles_failed", "seconds"):
+        current_cache.set(_stats_key(run_id, name), 0, timeout=STATS_TIMEOUT)
+
+    batches = 0
+    for recids in iter_records_to_tile(batch_size, max_records=max_records):
+        generate_tiles_batch.delay(recids, run_id=run_id)
+        batches += 1
+    if not batches:
+        current_app.logger.info("No records to generate IIIF tiles for.")
+        return
+
+    current_cache.set(_stats_key(run_id, "batches"), batches, timeout=STATS_TIMEOUT)
+    # All the batches may already be done
+    _report_if_done(run_id)
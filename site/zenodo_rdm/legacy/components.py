@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Legacy API record and file components."""
+
+from invenio_drafts_resources.services.records.components import ServiceComponent
+from invenio_records_resources.services.files.components import FileServiceComponent
+
+from .lookups import InvalidateLookupsOp
+
+
+class LegacyLookupsComponent(ServiceComponent):
+    """Invalidate the cached legacy Files-REST lookups of a record."""
+
+    def _invalidate(self, *records):
+        records = [r for r in records if r is not None]
+        self.uow.register(
+            InvalidateLookupsOp(
+                bucket_ids=[r.bucket_id for r in records],
+                pid_values=[r.pid.pid_value for r in records],
+            )
+        )
+
+    def publish(self, identity, draft=None, record=None):
+        """Publish handler."""
+        self._invalidate(draft, record)
+
+    def edit(self, identity, draft=None, record=None):
+        """Edit handler."""
+        self._invalidate(draft, record)
+
+    def new_version(self, identity, draft=None, record=None):
+        """New version handler."""
+        self._invalidate(draft, record)
+
+    def delete_draft(self, identity, draft=None, record=None, force=False):
+        """Delete draft handler."""
+        self._invalidate(draft, record)
+
+    def delete_record(self, identity, data=None, record=None, **kwargs):
+        """Delete record handler."""
+        self._invalidate(record)
+
+
+class LegacyFileLookupsComponent(FileServiceComponent):
+    """Invalidate the cached legacy file keys of a draft when its files change."""
+
+    def _invalidate(self, id_):
+        self.uow.register(InvalidateLookupsOp(pid_values=[id_]))
+
+    def commit_file(self, identity, id_, file_key, record):
+        """Commit file handler."""
+        self._invalidate(id_)
+
+    def delete_file(self, identity, id_, file_key, record, deleted_file):
+        """Delete file handler."""
+        self._invalidate(id_)
+
+    def delete_all_files(self, identity, id_, record, results):
+        """Delete all files handler."""
+        self._invalidate(id_)
@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Cached lookups of the legacy Files-REST API.
+
+Legacy clients address files by bucket ID and by file ID, which are resolved to
+the owning draft or record on every request. The mappings are cached:
+
+- ``legacy:bucket:<bucket_id>``: ``("draft" | "record", <pid value>, <id>)``
+- ``legacy:files:<pid value>``: ``{<file_id>: <key>}`` of the draft and record
+- ``legacy:files:<pid value>:missing``: file IDs not found, cached briefly
+
+and invalidated when a record is published, gets a new version, is edited or is
+deleted, or when a file of its draft is committed or deleted.
+"""
+
+import sqlalchemy as sa
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_db.uow import Operation
+from invenio_files_rest.models import ObjectVersion
+from invenio_pidstore.models import PersistentIdentifier
+
+
+def bucket_cache_key(bucket_id):
+    """Cache key of the owner of a bucket."""
+    return f"legacy:bucket:{bucket_id}"
+
+
+def files_cache_key(pid_value):
+    """Cache key of the file keys of a record."""
+    return f"legacy:files:{pid_value}"
+
+
+def missing_files_cache_key(pid_value):
+    """Cache key of the file IDs not found in a record."""
+    return f"legacy:files:{pid_value}:missing"
+
+
+def _recid_join(model_cls):
+    return sa.and_(
+        PersistentIdentifier.object_uuid == model_cls.id,
+        PersistentIdentifier.pid_type == "recid",
+        PersistentIdentifier.object_type == "rec",
+    )
+
+
+def _query_bucket_owner(bucket_id, draft_model_cls, record_model_cls):
+    """Query the draft or else the record owning a bucket, in a single query."""
+
+    def select(model_cls, cls_name):
+        return (
+            sa.select(
+                sa.literal(cls_name).label("cls_name"),
+                PersistentIdentifier.pid_value,
+                model_cls.id,
+            )
+            .join(PersistentIdentifier, _recid_join(model_cls))
+            .where(model_cls.bucket_id == bucket_id)
+        )
+
+    owners = sa.union_all(
+        select(draft_model_cls, "draft"), select(record_model_cls, "record")
+    ).subquery()
+    # "draft" sorts before "record", i.e. drafts take precedence
+    row = db.session.execute(
+        sa.select(owners).order_by(owners.c.cls_name).limit(1)
+    ).first()
+    return (row.cls_name, row.pid_value, str(row.id)) if row else None
+
+
+def _query_file_keys(pid_value, draft_model_cls, record_model_cls):
+    """Query the file keys of a draft and its record, in a single query."""
+
+    def select(model_cls, priority):
+        return (
+            sa.select(
+                sa.literal(priority).label("priority"),
+                ObjectVersion.file_id,
+                ObjectVersion.key,
+            )
+            .join(model_cls, ObjectVersion.bucket_id == model_cls.bucket_id)
+            .join(PersistentIdentifier, _recid_join(model_cls))
+            .where(
+                PersistentIdentifier.pid_value == pid_value,
+                ObjectVersion.file_id.isnot(None),
+            )
+        )
+
+    file_keys = sa.union_all(
+        select(record_model_cls, 0), select(draft_model_cls, 1)
+    ).subquery()
+    rows = db.session.execute(sa.select(file_keys).order_by(file_keys.c.priority))
+    # The keys of the draft are set last, i.e. take precedence
+    return {str(row.file_id): row.key for row in rows}
+
+
+def get_bucket_owner(bucket_id, draft_model_cls, record_model_cls):
+    """Get the ``(class name, pid value, id)`` of the owner of a bucket.
+
+    Returns ``None`` if the bucket belongs to no draft or record.
+    """
+    key = bucket_cache_key(bucket_id)
+    owner = current_cache.get(key)
+    if owner is None:
+        owner = _query_bucket_owner(bucket_id, draft_model_cls, record_model_cls)
+        if owner is not None:
+            current_cache.set(
+                key,
+                owner,
+                timeout=current_app.config["ZENODO_LEGACY_LOOKUPS_CACHE_TIMEOUT"],
+            )
+    return owner
+
+
+def get_file_key(pid_value, file_id, draft_model_cls, record_model_cls):
+    """Get the key of a file of a draft or record by its file ID.
+
+    File IDs that are not found are cached for a short time, so that requests for
+    unknown files don't query the database each time.
+    """
+    file_id = str(file_id)
+    key = files_cache_key(pid_value)
+    file_keys = current_cache.get(key)
+    if file_keys is not None and file_id in file_keys:
+        return file_keys[file_id]
+
+    missing_key = missing_files_cache_key(pid_value)
+    missing = current_cache.get(missing_key) or set()
+    if file_id in missing:
+        return None
+
+    # A file missing from the cached keys may have been uploaded since
+    file_keys = _query_file_keys(pid_value, draft_model_cls, record_model_cls)
+    current_cache.set(
+        key,
+        file_keys,
+        timeout=current_app.config["ZENODO_LEGACY_LOOKUPS_CACHE_TIMEOUT"],
+    )
+    if file_id not in file_keys:
+        current_cache.set(
+            missing_key,
+            missing | {file_id},
+            timeout=current_app.config["ZENODO_LEGACY_LOOKUPS_MISSING_CACHE_TIMEOUT"],
+        )
+    return file_keys.get(file_id)
+
+
+def invalidate_lookups(bucket_ids=(), pid_values=()):
+    """Delete the cached owners of buckets and file keys of records."""
+    keys = [bucket_cache_key(b) for b in bucket_ids if b]
+    for pid_value in pid_values:
+        if pid_value:
+            keys += [files_cache_key(pid_value), missing_files_cache_key(pid_value)]
+    if keys:
+        current_cache.delete_many(*keys)
+
+
+class InvalidateLookupsOp(Operation):
+    """Invalidate the cached lookups once the transaction is committed."""
+
+    def __init__(self, bucket_ids=(), pid_values=()):
+        """Constructor."""
+        self._bucket_ids = [str(b) for b in bucket_ids if b]
+        self._pid_values = [str(p) for p in pid_values if p]
+
+    def on_post_commit(self, uow):
+        """Delete the cached lookups."""
+        invalidate_lookups(self._bucket_ids, self._pid_values)
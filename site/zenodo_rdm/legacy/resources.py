@@ -315,8 +315,8 @@ class LegacyFilesRESTResource(FileResource):
     def search(self):
         """List files."""
         bucket_id = resource_requestctx.view_args["bucket_id"]
-        record = self.service.get_record_by_bucket_id(bucket_id)
-        files = self.service.list_files(g.identity, record["id"])
+        record_id = self.service.get_record_id_by_bucket_id(bucket_id)
+        files = self.service.list_files(g.identity, record_id)
         return files.to_dict(), 200
 
     @request_files_view_args
@@ -325,9 +325,9 @@ class LegacyFilesRESTResource(FileResource):
         """Get file as in Files-REST views."""
         bucket_id = resource_requestctx.view_args["bucket_id"]
         key = resource_requestctx.view_args["key"]
-        record = self.service.get_record_by_bucket_id(bucket_id)
+        record_id = self.service.get_record_id_by_bucket_id(bucket_id)
 
-        item = self.service.get_file_content(g.identity, record["id"], key)
+        item = self.service.get_file_content(g.identity, record_id, key)
         if item is None:
             abort(404)
 
@@ -343,10 +343,10 @@ class LegacyFilesRESTResource(FileResource):
         key = resource_requestctx.view_args["key"]
         stream = resource_requestctx.data["request_stream"]
         content_length = resource_requestctx.data["request_content_length"]
-        record = self.service.get_record_by_bucket_id(bucket_id)
+        record_id = self.service.get_record_id_by_bucket_id(bucket_id)
 
         commit_file_result = _create_or_update_file(
-            self.service, key, stream, content_length, record["id"]
+            self.service, key, stream, content_length, record_id
         )
 
         return commit_file_result.to_dict(), 201
@@ -357,9 +357,9 @@ class LegacyFilesRESTResource(FileResource):
         """Delete a file as in Files-REST views."""
         bucket_id = resource_requestctx.view_args["bucket_id"]
         key = resource_requestctx.view_args["key"]
-        record = self.service.get_record_by_bucket_id(bucket_id)
+        record_id = self.service.get_record_id_by_bucket_id(bucket_id)
 
-        self.service.delete_file(g.identity, record["id"], key)
+        self.service.delete_file(g.identity, record_id, key)
         return "", 204
 
 
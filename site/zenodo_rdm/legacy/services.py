@@ -10,10 +10,7 @@ from invenio_app_rdm.records_ui.previewer.iiif_simple import (
     previewable_extensions as image_extensions,
 )
 from invenio_base.urls import invenio_url_for
-from invenio_db import db
 from invenio_drafts_resources.services.records.config import is_record
-from invenio_files_rest.models import FileInstance, ObjectVersion
-from invenio_pidstore.models import PersistentIdentifier
 from invenio_rdm_records.proxies import current_record_communities_service
 from invenio_rdm_records.records import RDMRecord
 from invenio_rdm_records.services import (
@@ -36,6 +33,8 @@ from invenio_records_resources.services.uow import (
 from sqlalchemy.exc import NoResultFound
 from werkzeug.local import LocalProxy
 
+from .lookups import get_bucket_owner, get_file_key
+
 record_thumbnail_sizes = LocalProxy(
     lambda: current_app.config["APP_RDM_RECORD_THUMBNAIL_SIZES"]
 )
@@ -381,45 +380,35 @@ class LegacyFileService(FileService):
 
         return record
 
+    def _get_bucket_owner(self, bucket_id):
+        owner = get_bucket_owner(
+            bucket_id,
+            self.record_cls.model_cls,
+            self.config.published_record_cls.model_cls,
+        )
+        if owner is None:
+            raise NoResultFound(f"No draft or record with bucket {bucket_id}.")
+        return owner
+
+    def get_record_id_by_bucket_id(self, bucket_id):
+        """Get the PID value of the associated record by its bucket ID."""
+        _, pid_value, _ = self._get_bucket_owner(bucket_id)
+        return pid_value
+
     def get_record_by_bucket_id(self, bucket_id):
         """Get the associated record by its bucket ID."""
-        try:
-            # Try first the draft
-            model_cls = self.record_cls.model_cls
-            obj = model_cls.query.filter(model_cls.bucket_id == bucket_id).one()
-            return self.record_cls(obj.data, model=obj)
-        except NoResultFound:
-            # If it's published try the record
-            model_cls = self.config.published_record_cls.model_cls
-            obj = model_cls.query.filter(model_cls.bucket_id == bucket_id).one()
-            return self.config.published_record_cls(obj.data, model=obj)
+        cls_name, _, id_ = self._get_bucket_owner(bucket_id)
+        record_cls = (
+            self.record_cls if cls_name == "draft" else self.config.published_record_cls
+        )
+        obj = record_cls.model_cls.query.filter_by(id=id_).one()
+        return record_cls(obj.data, model=obj)
 
     def get_file_key_by_id(self, pid_value, file_id):
         """Get the associated record file key by its ID."""
-
-        def query_file_id_by_model_cls(model_cls):
-            """Query for file based on passed model cls."""
-            key = (
-                db.session.query(ObjectVersion.key)
-                .join(FileInstance, ObjectVersion.file_id == FileInstance.id)
-                .join(model_cls, ObjectVersion.bucket_id == model_cls.bucket_id)
-                .join(
-                    PersistentIdentifier,
-                    PersistentIdentifier.object_uuid == model_cls.id,
-                )
-                .filter(
-                    FileInstance.id == file_id,
-                    PersistentIdentifier.pid_type == "recid",
-                    PersistentIdentifier.pid_value == pid_value,
-                    PersistentIdentifier.object_type == "rec",
-                )
-                .scalar()
-            )
-            return key
-
-        RDMDraft = self.record_cls.model_cls
-        key = query_file_id_by_model_cls(RDMDraft)
-        if key is None:
-            RDMRecord = self.config.published_record_cls.model_cls
-            key = query_file_id_by_model_cls(RDMRecord)
-        return key
+        return get_file_key(
+            pid_value,
+            file_id,
+            self.record_cls.model_cls,
+            self.config.published_record_cls.model_cls,
+        )
@@ -7,13 +7,12 @@ from datetime import datetime, timedelta, timezone
 
 import requests
 from flask import current_app
-from invenio_accounts.models import User
 from invenio_communities.communities.records.models import CommunityMetadata
-from invenio_files_rest.models import FileInstance
 from invenio_search import current_search_client
 from invenio_search.utils import build_alias_name
 from opensearchpy import Search
 
+from zenodo_rdm.metrics.counters import files_counter, researchers_counter
 from zenodo_rdm.metrics.proxies import current_metrics
 
 
@@ -107,15 +106,12 @@ class ZenodoMetric(object):
     @staticmethod
     def get_researchers():
         """Get number of unique zenodo users."""
-        return User.query.filter(
-            User.confirmed_at.isnot(None),
-            User.active.is_(True),
-        ).count()
+        return researchers_counter.get()
 
     @staticmethod
     def get_files():
         """Get number of files."""
-        return FileInstance.query.count()
+        return files_counter.get()
 
     @staticmethod
     def get_communities():
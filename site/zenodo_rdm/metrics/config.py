@@ -7,8 +7,14 @@ import datetime
 from zenodo_rdm.metrics.api import ZenodoMetric
 
 METRICS_START_DATE = datetime.datetime(2021, 1, 1)
-METRICS_CACHE_TIMEOUT = int(datetime.timedelta(hours=1).total_seconds())
-METRICS_CACHE_UPDATE_INTERVAL = datetime.timedelta(minutes=30)
+METRICS_CACHE_UPDATE_INTERVAL = datetime.timedelta(minutes=5)
+"""How often stale metrics are checked for and recomputed."""
+
+METRICS_DEFAULT_TTL = datetime.timedelta(minutes=30)
+"""Time after which a metric without its own ``ttl`` is recomputed."""
+
+METRICS_MAX_WORKERS = 4
+"""Number of metrics computed concurrently."""
 
 METRICS_DATA = {
     "openaire-nexus": [
@@ -20,6 +26,7 @@ METRICS_DATA = {
             ),
             "type": "counter",
             "value": ZenodoMetric.get_data_transfer,
+            "ttl": datetime.timedelta(hours=1),
         },
         {
             "name": "zenodo_nexus_unique_visitors_web_total",
@@ -29,30 +36,35 @@ METRICS_DATA = {
             ),
             "type": "counter",
             "value": ZenodoMetric.get_visitors,
+            "ttl": datetime.timedelta(hours=1),
         },
         {
             "name": "zenodo_last_month_uptime_ratio",
             "help": "Zenodo uptime percentage for the last month.",
             "type": "gauge",
             "value": ZenodoMetric.get_uptime,
+            "ttl": datetime.timedelta(hours=6),
         },
         {
             "name": "zenodo_researchers",
             "help": "Number of researchers registered on Zenodo",
             "type": "gauge",
             "value": ZenodoMetric.get_researchers,
+            "ttl": datetime.timedelta(minutes=30),
         },
         {
             "name": "zenodo_files",
             "help": "Number of files hosted on Zenodo",
             "type": "gauge",
             "value": ZenodoMetric.get_files,
+            "ttl": datetime.timedelta(minutes=30),
         },
         {
             "name": "zenodo_communities",
             "help": "Number of Zenodo communities created",
             "type": "gauge",
             "value": ZenodoMetric.get_communities,
+            "ttl": datetime.timedelta(minutes=30),
         },
     ]
 }
@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Incrementally maintained row counters for metrics."""
+
+from flask import current_app, has_app_context
+from invenio_accounts.models import User
+from invenio_cache import current_cache
+from invenio_files_rest.models import FileInstance
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_PENDING_DELTAS_KEY = "zenodo_metrics_counters"
+_PREVIOUS_MATCHES_KEY = "zenodo_metrics_counters_previous"
+
+
+class ModelCounter:
+    """Number of rows of a model matching a condition.
+
+    The counter is seeded with an exact count, and then updated with the rows
+    inserted, updated and deleted through the ORM session. Bulk statements bypass
+    the session, so ``reconcile`` should run periodically to fix any drift.
+
+    Whether the changed and deleted rows matched is captured before the flush, with
+    the previous values of ``attrs`` always loaded when they are set.
+    """
+
+    name = None
+    model = None
+    attrs = ()
+    """Attributes the condition depends on."""
+
+    @property
+    def cache_key(self):
+        """Cache key of the counter value."""
+        return f"METRICS_COUNTER::{self.name}"
+
+    def query(self):
+        """Query of the counted rows."""
+        return self.model.query
+
+    def matches(self, **values):
+        """Check the condition against the values of ``attrs``."""
+        return True
+
+    def _matches(self, obj, previous=False):
+        state = inspect(obj)
+        values = {}
+        for attr in self.attrs:
+            value = getattr(obj, attr)
+            history = state.attrs[attr].history
+            if previous and history.has_changes():
+                # A previous ``None`` is not part of the history
+                value = history.deleted[0] if history.deleted else None
+            values[attr] = value
+        return self.matches(**values)
+
+    def previous_matches(self, session):
+        """Whether the deleted and changed rows of a session matched, by object id.
+
+        Called before the flush, while the deleted rows can still be loaded.
+        """
+        previous = {}
+        for obj in session.deleted:
+            if isinstance(obj, self.model):
+                previous[id(obj)] = self._matches(obj, previous=True)
+        if self.attrs:
+            for obj in session.dirty:
+                if isinstance(obj, self.model):
+                    previous[id(obj)] = self._matches(obj, previous=True)
+        return previous
+
+    def flush_delta(self, session, previous):
+        """Change of the count caused by the pending flush of a session."""
+        delta = 0
+        for obj in session.new:
+            if isinstance(obj, self.model) and self._matches(obj):
+                delta += 1
+        for obj in session.deleted:
+            if isinstance(obj, self.model) and previous.get(id(obj)):
+                delta -= 1
+        if self.attrs:
+            for obj in session.dirty:
+                if isinstance(obj, self.model) and id(obj) in previous:
+                    delta += self._matches(obj) - previous[id(obj)]
+        return delta
+
+    def get(self):
+        """Get the counter value, seeding it if needed."""
+        value = current_cache.get(self.cache_key)
+        if value is None:
+            self.reconcile()
+            value = current_cache.get(self.cache_key)
+        return value
+
+    def inc(self, delta):
+        """Increment an already seeded counter."""
+        if delta and current_cache.has(self.cache_key):
+            current_cache.inc(self.cache_key, delta)
+
+    def reconcile(self):
+        """Reset the counter to the exact count, returning the drift that was fixed."""
+        exact = self.query().count()
+        previous = current_cache.get(self.cache_key)
+        current_cache.set(self.cache_key, exact, timeout=0)
+        return 0 if previous is None else exact - previous
+
+
+class FilesCounter(ModelCounter):
+    """Number of files."""
+
+    name = "files"
+    model = FileInstance
+
+
+class ResearchersCounter(ModelCounter):
+    """Number of confirmed and active users."""
+
+    name = "researchers"
+    model = User
+    attrs = ("confirmed_at", "active")
+
+    def query(self):
+        """Query of the confirmed and active users."""
+        return User.query.filter(
+            User.confirmed_at.isnot(None),
+            User.active.is_(True),
+        )
+
+    def matches(self, confirmed_at, active):
+        """Check that the user is confirmed and active."""
+        return confirmed_at is not None and active is True
+
+
+files_counter = FilesCounter()
+researchers_counter = ResearchersCounter()
+
+COUNTERS = [files_counter, researchers_counter]
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """Listener loading the previous value of a counted attribute when it is set."""
+
+
+def _before_flush(session, flush_context, instances):
+    """Capture whether the rows changed by the flush matched before it."""
+    if not has_app_context():
+        return
+    session.info[_PREVIOUS_MATCHES_KEY] = {
+        counter.name: counter.previous_matches(session) for counter in COUNTERS
+    }
+
+
+def _current_transaction(session):
+    """Innermost savepoint of a session, or its root transaction."""
+    return session.get_nested_transaction() or session.get_transaction()
+
+
+def _boundary(transaction):
+    """Innermost savepoint or root transaction enclosing a transaction."""
+    while not transaction.nested and transaction.parent is not None:
+        transaction = transaction.parent
+    return transaction
+
+
+def _after_flush(session, flush_context):
+    """Apply the count changes of a flush, remembering them per transaction."""
+    previous = session.info.pop(_PREVIOUS_MATCHES_KEY, None)
+    if previous is None or not has_app_context():
+        return
+    transaction = _current_transaction(session)
+    for counter in COUNTERS:
+        delta = counter.flush_delta(session, previous[counter.name])
+        if delta:
+            counter.inc(delta)
+            pending = session.info.setdefault(_PENDING_DELTAS_KEY, {})
+            deltas = pending.setdefault(transaction, {})
+            deltas[counter.name] = deltas.get(counter.name, 0) + delta
+
+
+def _after_commit(session):
+    """Settle the count changes of a committed transaction.
+
+    Also called when a savepoint is released, whose changes are only settled with
+    the transaction enclosing it, so they are moved to it.
+    """
+    pending = session.info.get(_PENDING_DELTAS_KEY)
+    if not pending:
+        return
+    transaction = _current_transaction(session)
+    deltas = pending.pop(transaction, None)
+    if deltas and transaction.nested:
+        parent_deltas = pending.setdefault(_boundary(transaction.parent), {})
+        for name, delta in deltas.items():
+            parent_deltas[name] = parent_deltas.get(name, 0) + delta
+
+
+def _after_transaction_end(session, transaction):
+    """Revert the count changes of a transaction that was not committed.
+
+    Called after the rollback of a savepoint or of the root transaction, and for
+    the savepoints closed by the rollback of a transaction enclosing them.
+    """
+    pending = session.info.get(_PENDING_DELTAS_KEY)
+    if not pending:
+        return
+    deltas = pending.pop(transaction, None)
+    if not deltas or not has_app_context():
+        return
+    for counter in COUNTERS:
+        counter.inc(-deltas.get(counter.name, 0))
+
+
+def register_counters_listeners():
+    """Keep the counters current from the ORM session events."""
+    for counter in COUNTERS:
+        for attr in counter.attrs:
+            attribute = getattr(counter.model, attr)
+            if not event.contains(attribute, "set", _load_previous_value):
+                event.listen(
+                    attribute, "set", _load_previous_value, active_history=True
+                )
+    for name, listener in [
+        ("before_flush", _before_flush),
+        ("after_flush", _after_flush),
+        ("after_commit", _after_commit),
+        ("after_transaction_end", _after_transaction_end),
+    ]:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+def reconcile_counters():
+    """Reset all counters to their exact count."""
+    for counter in COUNTERS:
+        drift = counter.reconcile()
+        if drift:
+            current_app.logger.warning(
+                "Metrics counter drift fixed",
+                extra={"counter": counter.name, "drift": drift},
+            )
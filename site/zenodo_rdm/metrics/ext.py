@@ -5,6 +5,7 @@
 from flask import current_app
 
 from zenodo_rdm.metrics import config
+from zenodo_rdm.metrics.counters import register_counters_listeners
 
 
 class ZenodoMetrics(object):
@@ -25,6 +26,7 @@ class ZenodoMetrics(object):
     def init_app(self, app):
         """Flask application initialization."""
         self.init_config(app)
+        register_counters_listeners()
         app.extensions["zenodo-metrics"] = self
 
     @property
@@ -4,10 +4,16 @@
 
 from celery import shared_task
 
-from zenodo_rdm.metrics import utils
+from zenodo_rdm.metrics import counters, utils
 
 
 @shared_task(ignore_result=True)
 def calculate_metrics(metric_id=None):
     """Calculate metrics for the passed metric ID."""
     utils.calculate_metrics(metric_id)
+
+
+@shared_task(ignore_result=True)
+def reconcile_counters():
+    """Reset the metrics counters to their exact count."""
+    counters.reconcile_counters()
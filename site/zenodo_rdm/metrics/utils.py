@@ -2,41 +2,115 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Utilities for metrics module."""
 
-from copy import deepcopy
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import current_app
 from invenio_cache import current_cache
 
 
-def get_metrics(metric_id):
-    """Get metrics from cache."""
-    cached_data = current_cache.get(f"METRICS_CACHE::{metric_id}")
-    if cached_data is not None:
-        return cached_data
+def _cache_key(metric_id, name):
+    return f"METRICS_CACHE::{metric_id}::{name}"
+
+
+def _get_cached_values(metric_id):
+    """Get the cached ``{"value", "updated"}`` entries of a metric ID, by name."""
+    names = [m["name"] for m in current_app.config["METRICS_DATA"][metric_id]]
+    entries = current_cache.get_many(*[_cache_key(metric_id, n) for n in names])
+    return {name: entry for name, entry in zip(names, entries) if entry is not None}
 
 
-def calculate_metrics(metric_id, cache=True):
-    """Calculate a metric's result."""
-    metrics = deepcopy(current_app.config["METRICS_DATA"][metric_id])
+def _is_stale(metric, entry, now):
+    ttl = metric.get("ttl", current_app.config["METRICS_DEFAULT_TTL"])
+    return entry is None or now - entry["updated"] >= ttl.total_seconds()
+
+
+def get_metrics(metric_id):
+    """Get the last known metrics from cache, with their age.
 
+    Every metric is followed by a ``<name>_age_seconds`` gauge. Returns ``None`` if
+    no metric has been computed yet.
+    """
+    cached_values = _get_cached_values(metric_id)
+    if not cached_values:
+        return None
+
+    now = time.time()
     result = []
-    for metric in metrics:
+    for metric in current_app.config["METRICS_DATA"][metric_id]:
+        entry = cached_values.get(metric["name"])
+        if entry is None:
+            continue
+        result.append({**metric, "value": entry["value"]})
+        result.append(
+            {
+                "name": f"{metric['name']}_age_seconds",
+                "help": f"Seconds since {metric['name']} was last computed.",
+                "type": "gauge",
+                "value": int(now - entry["updated"]),
+            }
+        )
+    return result
+
+
+def has_stale_metrics(metric_id):
+    """Check if any metric of a metric ID is missing or older than its TTL."""
+    cached_values = _get_cached_values(metric_id)
+    now = time.time()
+    return any(
+        _is_stale(metric, cached_values.get(metric["name"]), now)
+        for metric in current_app.config["METRICS_DATA"][metric_id]
+    )
+
+
+def _evaluate_metric(app, metric_id, metric, cache):
+    """Evaluate a single metric in its own application context."""
+    with app.app_context():
         try:
-            metric["value"] = metric["value"]()
-            result.append(metric)
+            value = metric["value"]()
         except Exception:
             current_app.logger.exception(
                 "Metric evaluation failed", extra={"metric": metric["name"]}
             )
+            return None
 
-    if cache:
-        current_cache.set(
-            f"METRICS_CACHE::{metric_id}",
-            result,
-            timeout=current_app.config["METRICS_CACHE_TIMEOUT"],
-        )
+        entry = {"value": value, "updated": time.time()}
+        if cache:
+            # Keep the last known value until it gets recomputed
+            current_cache.set(_cache_key(metric_id, metric["name"]), entry, timeout=0)
+        return entry
 
-    return result
+
+def calculate_metrics(metric_id, cache=True, force=False):
+    """Calculate the stale metrics of a metric ID concurrently.
+
+    Metrics whose cached value is younger than their ``ttl`` are not recomputed,
+    unless ``force`` is set.
+    """
+    metrics = current_app.config["METRICS_DATA"][metric_id]
+    cached_values = _get_cached_values(metric_id) if cache else {}
+
+    now = time.time()
+    stale_metrics = [
+        m for m in metrics if force or _is_stale(m, cached_values.get(m["name"]), now)
+    ]
+
+    app = current_app._get_current_object()
+    max_workers = current_app.config["METRICS_MAX_WORKERS"]
+    if stale_metrics:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            entries = executor.map(
+                lambda m: _evaluate_metric(app, metric_id, m, cache), stale_metrics
+            )
+            for metric, entry in zip(stale_metrics, entries):
+                if entry is not None:
+                    cached_values[metric["name"]] = entry
+
+    return [
+        {**metric, "value": cached_values[metric["name"]]["value"]}
+        for metric in metrics
+        if metric["name"] in cached_values
+    ]
 
 
 def formatted_response(metrics):
@@ -17,16 +17,19 @@ def metrics(metric_id):
     if metric_id not in current_app.config["METRICS_DATA"]:
         return Response("Invalid key", status=404, mimetype="text/plain")
 
+    # Send off task to compute metrics only if it wasn't already requested
+    if utils.has_stale_metrics(metric_id) and not current_cache.get(
+        f"METRICS_EVALUATING::{metric_id}"
+    ):
+        tasks.calculate_metrics.delay(metric_id)
+        current_cache.set(f"METRICS_EVALUATING::{metric_id}", True, timeout=60 * 2)
+
+    # Serve the last known values, even if some of them are being recomputed
     metrics = utils.get_metrics(metric_id)
     if metrics:
         response = utils.formatted_response(metrics)
         return Response(response, mimetype="text/plain")
 
-    # Send off task to compute metrics only if it wasn't already requested
-    if not current_cache.get(f"METRICS_EVALUATING::{metric_id}"):
-        tasks.calculate_metrics.delay(metric_id)
-        current_cache.set(f"METRICS_EVALUATING::{metric_id}", True, timeout=60 * 2)
-
     retry_after = current_app.config["METRICS_CACHE_UPDATE_INTERVAL"]
     return Response(
         f"Metrics not available. Try again after {humanize.naturaldelta(retry_after)}.",
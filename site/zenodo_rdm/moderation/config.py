@@ -69,3 +69,9 @@ MODERATION_PERCOLATOR_MAPPING = {
     }
 }
 """Properties for moderation percolator index."""
+
+MODERATION_PERCOLATOR_PAGE_SIZE = 1000
+"""Number of matched queries fetched per page of a percolation."""
+
+MODERATION_RESCORE_BATCH_SIZE = 100
+"""Number of records percolated at once when re-scoring records."""
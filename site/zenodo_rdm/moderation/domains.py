@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""In-memory lookup of moderated link domains.
+
+The ``moderation_link_domains`` table is loaded into a process-local trie of
+reversed domain labels, so that looking up all the links of a record does not
+need a query per link. The trie is rebuilt when the version key stored in the
+cache changes, which happens on every committed change to a ``LinkDomain``.
+"""
+
+import threading
+import uuid
+from collections import namedtuple
+
+from flask import has_app_context
+from invenio_cache import current_cache
+from invenio_db import db
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .models import LinkDomain
+
+VERSION_CACHE_KEY = "moderation:link_domains:version"
+
+_CHANGED_KEY = "moderation_link_domains_changed"
+
+LinkDomainEntry = namedtuple(
+    "LinkDomainEntry", ["id", "domain", "status", "score", "reason"]
+)
+"""Detached copy of a ``LinkDomain`` row."""
+
+
+class LinkDomainTrie:
+    """Trie of reversed domain labels, matching the longest domain suffix."""
+
+    _ENTRY = None  # Labels are strings, so ``None`` never clashes with a label
+
+    def __init__(self, entries=()):
+        """Constructor."""
+        self._root = {}
+        for entry in entries:
+            self.insert(entry)
+
+    @staticmethod
+    def _labels(reversed_domain):
+        # Reversed domains start with a dot, e.g. ".io.blog.spam"
+        return reversed_domain[1:].split(".")
+
+    def insert(self, entry):
+        """Insert a link domain entry."""
+        node = self._root
+        for label in self._labels(entry.domain):
+            node = node.setdefault(label, {})
+        node[self._ENTRY] = entry
+
+    def lookup(self, reversed_domain):
+        """Get the most specific entry matching a reversed domain."""
+        node = self._root
+        match = None
+        for label in self._labels(reversed_domain):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(self._ENTRY, match)
+        return match
+
+
+_lock = threading.Lock()
+_trie = None
+_trie_version = None
+
+
+def _current_version():
+    version = current_cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = invalidate_link_domains()
+    return version
+
+
+def get_link_domains_trie():
+    """Get the trie of link domains, rebuilding it if it is outdated."""
+    global _trie, _trie_version
+
+    version = _current_version()
+    with _lock:
+        if _trie is None or _trie_version != version:
+            _trie = LinkDomainTrie(
+                LinkDomainEntry(ld.id, ld.domain, ld.status, ld.score, ld.reason)
+                for ld in db.session.query(LinkDomain)
+            )
+            _trie_version = version
+        return _trie
+
+
+def lookup_domains(urls):
+    """Lookup the domain status of a list of URLs.
+
+    Returns a list with a ``LinkDomainEntry`` (or ``None``) for each URL, matching
+    the result of ``LinkDomain.lookup_domain``.
+    """
+    trie = get_link_domains_trie()
+    results = []
+    for url in urls:
+        reversed_domain = LinkDomain.reverse_url_domain(url)
+        results.append(trie.lookup(reversed_domain) if reversed_domain else None)
+    return results
+
+
+def invalidate_link_domains():
+    """Bump the version of the link domains, returning the new version."""
+    version = uuid.uuid4().hex
+    current_cache.set(VERSION_CACHE_KEY, version, timeout=0)
+    return version
+
+
+@event.listens_for(LinkDomain, "after_insert")
+@event.listens_for(LinkDomain, "after_update")
+@event.listens_for(LinkDomain, "after_delete")
+def _link_domain_changed(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Invalidate only once committed, so other processes rebuild with the change
+    if session.info.pop(_CHANGED_KEY, False) and has_app_context():
+        invalidate_link_domains()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_CHANGED_KEY, None)
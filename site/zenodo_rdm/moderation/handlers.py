@@ -35,6 +35,7 @@ from werkzeug.utils import cached_property
 
 from .errors import UserBlockedException
 from .proxies import current_scores
+from .rules import ModerationContext
 from .tasks import run_moderation_handlers, update_moderation_request
 from .uow import ExceptionOp
 
@@ -76,9 +77,13 @@ class BaseModerationHandler:
                 )
                 return
 
+            # Analyse the record's text once, instead of in every rule
+            context = ModerationContext.from_record(record)
             results = {}
             for name, rule in self.rules.items():
-                results[name] = rule(identity, draft=draft, record=record)
+                results[name] = rule(
+                    identity, draft=draft, record=record, context=context
+                )
 
             evaluation = self.evaluate_result(results)
             action_ctx = {
@@ -41,9 +41,9 @@ class LinkDomain(db.Model, Timestamp):
         db.session.add(ld)
         return ld
 
-    @classmethod
-    def lookup_domain(cls, url):
-        """Lookup the status of a URL's domain."""
+    @staticmethod
+    def reverse_url_domain(url):
+        """Get the reversed domain of a URL (e.g. ``.io.blog.spam``)."""
         try:
             parsed = urlparse(url)
         except ValueError:
@@ -55,7 +55,15 @@ class LinkDomain(db.Model, Timestamp):
         if not domain_parts:
             return None
 
-        reversed_domain = "." + ".".join(domain_parts[::-1]).lower()
+        return "." + ".".join(domain_parts[::-1]).lower()
+
+    @classmethod
+    def lookup_domain(cls, url):
+        """Lookup the status of a URL's domain."""
+        reversed_domain = cls.reverse_url_domain(url)
+        if reversed_domain is None:
+            return None
+
         return (
             cls.query.filter(
                 # Exact match
@@ -95,3 +95,41 @@ def index_percolate_query(
         )
     except Exception as e:
         current_app.logger.exception(e)
+
+
+def percolate_documents(record_cls, documents):
+    """Percolate a batch of documents against the active moderation queries.
+
+    All documents are percolated together using the multi-document ``documents``
+    form, and the matched queries are mapped back to the documents via
+    ``_percolator_document_slot``. The matched queries are paged, so that none is
+    missed however many the batch matches. Returns a list with the ``_source`` of
+    the matched queries for each document.
+    """
+    matches = [[] for _ in documents]
+    if not documents:
+        return matches
+
+    page_size = current_app.config["MODERATION_PERCOLATOR_PAGE_SIZE"]
+    body = {
+        "size": page_size,
+        "sort": [{"id": "asc"}],
+        "query": {
+            "bool": {
+                "must": [
+                    {"term": {"active": True}},
+                    {"percolate": {"field": "query", "documents": list(documents)}},
+                ]
+            }
+        },
+    }
+    while True:
+        hits = current_search_client.search(
+            index=get_percolator_index(record_cls), body=body
+        )["hits"]["hits"]
+        for hit in hits:
+            for slot in hit.get("fields", {}).get("_percolator_document_slot", [0]):
+                matches[slot].append(hit["_source"])
+        if len(hits) < page_size:
+            return matches
+        body["search_after"] = hits[-1]["sort"]
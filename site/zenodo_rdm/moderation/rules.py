@@ -3,12 +3,14 @@
 """Rules for moderation."""
 
 import re
+from dataclasses import dataclass
 
 from flask import current_app
-from invenio_search import current_search_client
+from invenio_search.engine import search
 
-from .models import LinkDomain, LinkDomainStatus
-from .percolator import get_percolator_index
+from .domains import lookup_domains
+from .models import LinkDomainStatus
+from .percolator import percolate_documents
 from .proxies import current_scores
 
 #
@@ -27,6 +29,13 @@ EMOJI_PATTERN = re.compile(
 )
 
 
+URL_PATTERN = re.compile(
+    r'href=["\']?([^"\'>]+)|\b(https?://[^\s\'"<>,]+|www\.[^\s\'"<>,]+)',
+)
+
+HEADER_TAG_PATTERN = re.compile(r"<h[1-9]\b[^>]*>", re.IGNORECASE)
+
+
 def extract_emojis(text):
     """Extract all emojis from text using a regex pattern."""
     return EMOJI_PATTERN.findall(text)
@@ -34,12 +43,8 @@ def extract_emojis(text):
 
 def extract_links(text):
     """Extract unique URLs from text using regex."""
-    url_pattern = re.compile(
-        r'href=["\']?([^"\'>]+)|\b(https?://[^\s\'"<>,]+|www\.[^\s\'"<>,]+)',
-    )
-
     links = []
-    for match in url_pattern.findall(text):
+    for match in URL_PATTERN.findall(text):
         for url in match:
             if url:
                 links.append(url)
@@ -47,21 +52,45 @@ def extract_links(text):
     return links
 
 
+@dataclass(frozen=True)
+class ModerationContext:
+    """Text analysis of a record's metadata, shared by all the rules of a run."""
+
+    text: str
+    values_text: str
+    links: tuple
+    description_links: tuple
+    emoji_count: int
+    header_tag_count: int
+
+    @classmethod
+    def from_record(cls, record):
+        """Analyse the metadata of a record (or community) in a single pass."""
+        text = str(record.metadata)
+        values_text = " ".join(map(str, record.metadata.values()))
+        description = str(record.metadata.get("description", ""))
+        return cls(
+            text=text,
+            values_text=values_text,
+            links=tuple(extract_links(text)),
+            description_links=tuple(extract_links(description)),
+            emoji_count=len(extract_emojis(values_text)),
+            header_tag_count=len(HEADER_TAG_PATTERN.findall(values_text)),
+        )
+
+
 #
 # Rules
 #
-def links_rule(identity, draft=None, record=None):
+def links_rule(identity, draft=None, record=None, context=None):
     """Calculate a moderation score based on links found in record metadata."""
+    context = context or ModerationContext.from_record(record)
     score = 0
-    description_links = extract_links(str(record.metadata.get("description", "")))
 
-    if len(description_links) > 5:
+    if len(context.description_links) > 5:
         score += current_scores.excess_links
 
-    extracted_links = extract_links(str(record.metadata))
-
-    for link in extracted_links:
-        domain = LinkDomain.lookup_domain(link)
+    for domain in lookup_domains(context.links):
         if domain is None:
             continue
         default_score = (
@@ -77,22 +106,21 @@ def links_rule(identity, draft=None, record=None):
     return score
 
 
-def text_sanitization_rule(identity, draft=None, record=None):
+def text_sanitization_rule(identity, draft=None, record=None, context=None):
     """Calculate a score based on excessive emoji and HTML tag usage in metadata text."""
-    record_text = " ".join(map(str, record.metadata.values()))
-    htag_count = len(re.findall(r"<h[1-9]\b[^>]*>", record_text, re.IGNORECASE))
+    context = context or ModerationContext.from_record(record)
     score = 0
 
-    if len(extract_emojis(record_text)) > 3:
+    if context.emoji_count > 3:
         score += current_scores.spam_emoji
 
-    if htag_count > 4:
+    if context.header_tag_count > 4:
         score += current_scores.spam_header_tags
 
     return score
 
 
-def verified_user_rule(identity, draft=None, record=None):
+def verified_user_rule(identity, draft=None, record=None, context=None):
     """Adjust moderation score based on the verification status of the user."""
     is_verified = (
         getattr(record.parent, "is_verified", None)
@@ -106,7 +134,7 @@ def verified_user_rule(identity, draft=None, record=None):
     )
 
 
-def files_rule(identity, draft=None, record=None):
+def files_rule(identity, draft=None, record=None, context=None):
     """Calculate score based on the number, size, and type of files associated with the record."""
     score = 0
 
@@ -129,28 +157,11 @@ def files_rule(identity, draft=None, record=None):
     return score
 
 
-def match_query_rule(identity, draft=None, record=None):
+def match_query_rule(identity, draft=None, record=None, context=None):
     """Calculate a score based on matched percolate queries against the given document in the specified index."""
-    document = record.dumps()
-    percolator_index = get_percolator_index(record)
-    if percolator_index:
-        matched_queries = current_search_client.search(
-            index=percolator_index,
-            body={
-                "query": {
-                    "bool": {
-                        "must": [
-                            {"term": {"active": True}},
-                            {"percolate": {"field": "query", "document": document}},
-                        ]
-                    }
-                }
-            },
-        )
-
-    score = 0
-
-    for hit in matched_queries["hits"]["hits"]:
-        query_score = hit["_source"].get("score", 0)
-        score += query_score
-    return score
+    try:
+        (matched_queries,) = percolate_documents(record, [record.dumps()])
+    except search.NotFoundError:
+        # No percolator index (yet), so no moderation queries
+        return 0
+    return sum(query.get("score", 0) for query in matched_queries)
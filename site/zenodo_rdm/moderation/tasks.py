@@ -20,9 +20,12 @@ from invenio_requests.proxies import (
 )
 from invenio_requests.records.api import Request
 from invenio_requests.services.user_moderation.errors import OpenRequestAlreadyExists
+from invenio_search.api import RecordsSearchV2
 from invenio_search.engine import dsl
 from invenio_users_resources.proxies import current_users_service as users_service
 
+from .percolator import percolate_documents
+
 
 @shared_task(ignore_result=True)
 def update_moderation_request(user_id, action_ctx):
@@ -123,3 +126,49 @@ def run_moderation_handlers(user_id, record_id=None, community_id=None):
                 h.run(identity=None, record=community, user=user, uow=uow)
 
         uow.commit()
+
+
+def _rescore_batch(documents):
+    """Percolate a batch of record documents and re-moderate the matched ones."""
+    matched = 0
+    record_cls = records_service.record_cls
+    for document, queries in zip(documents, percolate_documents(record_cls, documents)):
+        owner = document.get("parent", {}).get("access", {}).get("owned_by", {})
+        if not queries or owner.get("user") is None:
+            continue
+        matched += 1
+        run_moderation_handlers.delay(user_id=owner["user"], record_id=document["uuid"])
+    return matched
+
+
+@shared_task(ignore_result=True)
+def rescore_records(start, end, batch_size=None):
+    """Re-score the records created in a date range against the moderation queries.
+
+    Records are percolated in batches, and the moderation handlers are run again
+    for the records matching at least one active moderation query.
+    """
+    batch_size = batch_size or current_app.config["MODERATION_RESCORE_BATCH_SIZE"]
+    search = (
+        RecordsSearchV2(index=records_service.record_cls.index._name)
+        .filter("range", created={"gte": start, "lt": end})
+        .filter("term", deletion_status="P")
+    )
+
+    total = matched = 0
+    batch = []
+    for hit in search.scan():
+        batch.append(hit.to_dict())
+        if len(batch) >= batch_size:
+            total += len(batch)
+            matched += _rescore_batch(batch)
+            batch = []
+    if batch:
+        total += len(batch)
+        matched += _rescore_batch(batch)
+
+    current_app.logger.info(
+        "Moderation re-scoring finished",
+        extra={"start": start, "end": end, "total": total, "matched": matched},
+    )
+    return total, matched
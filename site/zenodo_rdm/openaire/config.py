@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """OpenAire related configs."""
 
+from datetime import timedelta
+
 OPENAIRE_API_URL = "http://dev.openaire.research-infrastructures.eu/is/mvc/api"
 """OpenAIRE API endpoint."""
 
@@ -17,3 +19,27 @@ OPENAIRE_PORTAL_URL = "https://explore.openaire.eu"
 
 OPENAIRE_DIRECT_INDEXING_ENABLED = False
 """Enable sending published records for direct indexing at OpenAIRE."""
+
+OPENAIRE_VOCABULARY_CACHE_TTL = 60 * 60
+"""Seconds the resource type vocabulary is cached in each process (0 disables)."""
+
+OPENAIRE_REFEED_BATCH_SIZE = 200
+"""Number of records read and serialized at once by the bulk re-feed."""
+
+OPENAIRE_REFEED_MIN_CONCURRENCY = 2
+"""Minimum number of requests in flight during the bulk re-feed."""
+
+OPENAIRE_REFEED_MAX_CONCURRENCY = 16
+"""Maximum number of requests in flight (and pooled connections) of the re-feed."""
+
+OPENAIRE_REFEED_MAX_ATTEMPTS = 3
+"""Attempts per record when OpenAIRE throttles or fails during the re-feed."""
+
+OPENAIRE_FAILURES_BACKOFF = timedelta(hours=1)
+"""Delay before the first retry of a failed operation, doubled on each attempt."""
+
+OPENAIRE_FAILURES_MAX_BACKOFF = timedelta(days=1)
+"""Maximum delay between the retries of a failed operation."""
+
+OPENAIRE_FAILURES_PAGE_SIZE = 1000
+"""Number of due failures claimed at once by ``retry_openaire_failures``."""
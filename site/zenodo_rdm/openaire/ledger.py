@@ -0,0 +1,182 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Ledger of the failed OpenAIRE operations.
+
+The failures are kept in a Redis sorted set scored by the time of their next
+retry, next to a hash with the details of each failure (number of attempts,
+last error, ...). Adding and removing a failure is ``O(log n)``, and the due
+failures are read in pages without scanning the cache keyspace.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+from invenio_cache import current_cache
+
+LEDGER_KEY = "openaire:failures"
+"""Sorted set of record ids, scored by the timestamp of their next retry."""
+
+DETAILS_KEY = "openaire:failures:details"
+"""Hash of record ids to the JSON details of their last failure."""
+
+_LEGACY_KEY_PREFIX = "openaire_direct_index:"
+
+_CLAIM_SCRIPT = """
+local record_ids = redis.call(
+    "ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2]
+)
+if #record_ids == 0 then
+    return record_ids
+end
+local details = redis.call("HMGET", KEYS[2], unpack(record_ids))
+local now, base, maximum = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+for i, record_id in ipairs(record_ids) do
+    local attempts = 1
+    if details[i] then
+        attempts = cjson.decode(details[i])["attempts"]
+    end
+    local backoff = math.min(base * 2 ^ (attempts - 1), maximum)
+    redis.call("ZADD", KEYS[1], "XX", now + backoff, record_id)
+end
+return record_ids
+"""
+"""Read a page of due failures and push them back by their backoff, atomically."""
+
+
+def _client():
+    cache = current_cache.cache
+    return cache._write_client, cache.key_prefix
+
+
+def _backoff(attempts):
+    """Seconds to wait before retrying a failure, doubling with each attempt."""
+    base = current_app.config["OPENAIRE_FAILURES_BACKOFF"].total_seconds()
+    maximum = current_app.config["OPENAIRE_FAILURES_MAX_BACKOFF"].total_seconds()
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def record_failure(record_id, operation=None, error=None, retry_at=None):
+    """Add a failed operation on a record, or increase its attempts.
+
+    :param operation: The failed operation, i.e. ``"index"`` or ``"delete"``.
+        Defaults to the operation of the previous failure.
+    :param error: The exception that caused the failure.
+    :param retry_at: Timestamp of the next retry, defaults to the backoff.
+    """
+    client, prefix = _client()
+    details = get_failure(record_id) or {"attempts": 0, "first_failed": None}
+    now = time.time()
+    attempts = details["attempts"] + 1
+    next_retry = retry_at if retry_at is not None else now + _backoff(attempts)
+    details.update(
+        {
+            "operation": operation or details.get("operation"),
+            "attempts": attempts,
+            "error": type(error).__name__ if error else None,
+            "first_failed": details["first_failed"] or _isoformat(now),
+            "last_failed": _isoformat(now),
+            "next_retry": _isoformat(next_retry),
+        }
+    )
+    pipe = client.pipeline()
+    pipe.zadd(prefix + LEDGER_KEY, {record_id: next_retry})
+    pipe.hset(prefix + DETAILS_KEY, record_id, json.dumps(details))
+    pipe.execute()
+
+
+def clear_failure(record_id):
+    """Remove a record from the ledger, e.g. after a successful operation."""
+    client, prefix = _client()
+    pipe = client.pipeline()
+    pipe.zrem(prefix + LEDGER_KEY, record_id)
+    pipe.hdel(prefix + DETAILS_KEY, record_id)
+    pipe.execute()
+
+
+def get_failure(record_id):
+    """Get the details of the failure of a record, if any."""
+    client, prefix = _client()
+    details = client.hget(prefix + DETAILS_KEY, record_id)
+    return json.loads(details) if details else None
+
+
+def count_failures():
+    """Number of failures in the ledger."""
+    client, prefix = _client()
+    return client.zcard(prefix + LEDGER_KEY)
+
+
+def list_failures(offset=0, limit=100):
+    """List the failures ordered by their next retry, with their details."""
+    client, prefix = _client()
+    record_ids = [
+        record_id.decode()
+        for record_id in client.zrange(prefix + LEDGER_KEY, offset, offset + limit - 1)
+    ]
+    if not record_ids:
+        return []
+    details = client.hmget(prefix + DETAILS_KEY, record_ids)
+    return [
+        {"record_id": record_id, **(json.loads(value) if value else {})}
+        for record_id, value in zip(record_ids, details)
+    ]
+
+
+def claim_due_failures(limit, due_before=None):
+    """Claim a page of failures that are due for a retry.
+
+    The claimed failures are pushed back by their backoff in the same atomic
+    script, so that neither the next page nor a concurrent claim return them
+    again while their retry is running. The retry either clears the failure or
+    records it again with one more attempt.
+
+    :param due_before: Only claim failures due before this timestamp.
+    """
+    client, prefix = _client()
+    now = time.time()
+    claim = client.register_script(_CLAIM_SCRIPT)
+    record_ids = claim(
+        keys=[prefix + LEDGER_KEY, prefix + DETAILS_KEY],
+        args=[
+            due_before or now,
+            limit,
+            now,
+            current_app.config["OPENAIRE_FAILURES_BACKOFF"].total_seconds(),
+            current_app.config["OPENAIRE_FAILURES_MAX_BACKOFF"].total_seconds(),
+        ],
+    )
+    return [record_id.decode() for record_id in record_ids]
+
+
+def iter_due_failures(page_size=None):
+    """Claim the failures that are due for a retry, page by page."""
+    page_size = page_size or current_app.config["OPENAIRE_FAILURES_PAGE_SIZE"]
+    # Failures claimed (and so pushed back) during the drain are not due again
+    due_before = time.time()
+    while True:
+        record_ids = claim_due_failures(page_size, due_before=due_before)
+        yield from record_ids
+        if len(record_ids) < page_size:
+            return
+
+
+def import_legacy_failures():
+    """Move the failures stored as ``openaire_direct_index:<id>`` cache keys.
+
+    Returns the number of imported failures.
+    """
+    client, prefix = _client()
+    imported = 0
+    for key in client.scan_iter(prefix + _LEGACY_KEY_PREFIX + "*", count=1000):
+        record_id = key.decode().split(_LEGACY_KEY_PREFIX)[1]
+        if get_failure(record_id) is None:
+            record_failure(record_id, "index", retry_at=time.time())
+        client.delete(key)
+        imported += 1
+    return imported
@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Bulk re-feed of published records to OpenAIRE.
+
+Unlike ``openaire_direct_index``, which reads, serializes and sends one record per
+task over a new session, the re-feed pages through the records index in batches,
+resolves each batch with a single ``read_many`` and sends the serialized records
+concurrently over one keep-alive connection pool. The number of requests in
+flight adapts to the responses of OpenAIRE, and the progress is checkpointed in
+the cache after every batch so that an interrupted re-feed can be resumed.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
+from invenio_rdm_records.proxies import current_rdm_records_service as records_service
+from invenio_search.api import RecordsSearchV2
+from requests.adapters import HTTPAdapter
+
+from .ledger import clear_failure, record_failure
+from .serializers import OpenAIREV1Serializer
+from .serializers.schema import add_openaire_types
+from .utils import openaire_request_factory
+
+CHECKPOINT_CACHE_KEY = "openaire_refeed:checkpoint"
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+SENT, REJECTED, FAILED = "sent", "rejected", "failed"
+
+
+class AdaptiveLimiter:
+    """Limit the requests in flight, adapting to the responses (AIMD).
+
+    The limit grows by one for every window of successful requests, and is halved
+    when OpenAIRE throttles or fails a request.
+    """
+
+    def __init__(self, minimum, maximum):
+        """Constructor."""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(minimum)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, success):
+        """Free a slot, adjusting the limit to the outcome of the request."""
+        with self._condition:
+            self._in_flight -= 1
+            if success:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            else:
+                self.limit = max(self.minimum, self.limit / 2)
+            self._condition.notify_all()
+
+
+def _retry_after(response, attempt):
+    """Seconds to wait before retrying a throttled or failed request."""
+    header = response.headers.get("Retry-After") if response is not None else None
+    if header and header.isdigit():
+        return min(int(header), 60)
+    return min(2**attempt, 30)
+
+
+class OpenAIRERefeeder:
+    """Send the serialized records to OpenAIRE over a pooled session."""
+
+    def __init__(self, min_concurrency, max_concurrency, max_attempts, timeout=30):
+        """Constructor."""
+        base_url = current_app.config["OPENAIRE_API_URL"]
+        beta_base_url = current_app.config.get("OPENAIRE_API_URL_BETA")
+        self.url = f"{base_url}/results/feedObject"
+        self.beta_url = f"{beta_base_url}/results/feedObject" if beta_base_url else None
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.limiter = AdaptiveLimiter(min_concurrency, max_concurrency)
+        self.session = openaire_request_factory()
+        # One pool sized for the maximum concurrency, so connections are reused
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def _post(self, url, data):
+        self.limiter.acquire()
+        success = False
+        try:
+            res = self.session.post(url, json=data, timeout=self.timeout)
+            success = res.status_code not in RETRYABLE_STATUS_CODES
+            return res
+        finally:
+            self.limiter.release(success)
+
+    def send(self, data):
+        """Send one serialized record, returning its outcome and the response."""
+        res = None
+        for attempt in range(self.max_attempts):
+            try:
+                res = self._post(self.url, data)
+            except Exception:
+                res = None
+            else:
+                # 400/413 are deterministic rejections, retrying never succeeds.
+                if res.status_code in (400, 413):
+                    return REJECTED, res
+                if res.ok:
+                    break
+                if res.status_code not in RETRYABLE_STATUS_CODES:
+                    return FAILED, res
+            if attempt + 1 < self.max_attempts:
+                time.sleep(_retry_after(res, attempt))
+        else:
+            return FAILED, res
+
+        if self.beta_url:
+            # Beta is best-effort, its outcome is ignored.
+            try:
+                self._post(self.beta_url, data)
+            except Exception:
+                pass
+        return SENT, res
+
+    def send_many(self, records):
+        """Send ``(record_id, data)`` pairs, yielding ``(record_id, outcome, res)``."""
+        futures = [
+            (record_id, self.executor.submit(self.send, data))
+            for record_id, data in records
+        ]
+        for record_id, future in futures:
+            yield (record_id, *future.result())
+
+    def close(self):
+        """Wait for the pending requests and close the connections."""
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+
+def _iter_record_ids(batch_size, search_after=None):
+    """Yield batches of published record ids, with the sort value after each."""
+    search = (
+        RecordsSearchV2(index=records_service.record_cls.index._name)
+        .filter("term", deletion_status="P")
+        .source(["id", "uuid"])
+        .sort("uuid")
+        .extra(size=batch_size)
+    )
+    while True:
+        page = search.extra(search_after=search_after) if search_after else search
+        hits = list(page.execute())
+        if not hits:
+            return
+        search_after = list(hits[-1].meta.sort)
+        yield [hit.id for hit in hits], search_after
+
+
+def _serialize_batch(serializer, record_ids):
+    """Read a batch of records, yielding the serialized OpenAIRE ones."""
+    for record in records_service.read_many(system_identity, record_ids).hits:
+        try:
+            # The types are added once, for the check and for the serialization
+            data = add_openaire_types(record)
+            if not data or not data["_openaire_type"]:
+                continue
+            yield record["id"], serializer.dump_obj(data)
+        except Exception:
+            current_app.logger.exception(
+                "OpenAIRE re-feed could not serialize record %(record_id)s.",
+                {"record_id": record["id"]},
+                extra={"record_id": record["id"]},
+            )
+
+
+def get_refeed_checkpoint():
+    """Get the checkpoint of the last (possibly interrupted) re-feed."""
+    return current_cache.get(CHECKPOINT_CACHE_KEY)
+
+
+def refeed_records(resume=True, batch_size=None, max_records=None):
+    """Re-feed all published OpenAIRE records to OpenAIRE.
+
+    Records that fail are added to the failures ledger, so that
+    ``retry_openaire_failures`` picks them up. Returns the checkpoint
+    with the counts of the run.
+
+    :param resume: Continue from the checkpoint of an interrupted run.
+    :param batch_size: Number of records read and serialized at once.
+    :param max_records: Stop after this number of records (e.g. for a test run).
+    """
+    config = current_app.config
+    batch_size = batch_size or config["OPENAIRE_REFEED_BATCH_SIZE"]
+    checkpoint = get_refeed_checkpoint() if resume else None
+    # Only an interrupted run is resumed, a finished one starts over
+    if not checkpoint or checkpoint.get("finished"):
+        checkpoint = {
+            "search_after": None,
+            "started": datetime.now().isoformat(),
+            "processed": 0,
+            "sent": 0,
+            "skipped": 0,
+            "rejected": 0,
+            "failed": 0,
+            "finished": None,
+        }
+
+    serializer = OpenAIREV1Serializer()
+    refeeder = OpenAIRERefeeder(
+        config["OPENAIRE_REFEED_MIN_CONCURRENCY"],
+        config["OPENAIRE_REFEED_MAX_CONCURRENCY"],
+        config["OPENAIRE_REFEED_MAX_ATTEMPTS"],
+    )
+    try:
+        for record_ids, search_after in _iter_record_ids(
+            batch_size, checkpoint["search_after"]
+        ):
+            records = list(_serialize_batch(serializer, record_ids))
+            for record_id, outcome, res in refeeder.send_many(records):
+                if outcome == FAILED:
+                    record_failure(record_id, "index")
+                else:
+                    clear_failure(record_id)
+                if outcome == REJECTED:
+                    ctx = {"record_id": record_id, "status_code": res.status_code}
+                    current_app.logger.warning(
+                        "OpenAIRE rejected record %(record_id)s for direct indexing (HTTP %(status_code)s).",
+                        ctx,
+                        extra={**ctx, "openaire_response": res.text},
+                    )
+                checkpoint[outcome] += 1
+
+            checkpoint["processed"] += len(record_ids)
+            checkpoint["skipped"] += len(record_ids) - len(records)
+            checkpoint["search_after"] = search_after
+            current_cache.set(CHECKPOINT_CACHE_KEY, checkpoint, timeout=0)
+            current_app.logger.info(
+                "OpenAIRE re-feed progress.",
+                extra={**checkpoint, "concurrency": int(refeeder.limiter.limit)},
+            )
+            if max_records and checkpoint["processed"] >= max_records:
+                return checkpoint
+    finally:
+        refeeder.close()
+
+    checkpoint["finished"] = datetime.now().isoformat()
+    current_cache.set(CHECKPOINT_CACHE_KEY, checkpoint, timeout=0)
+    return checkpoint
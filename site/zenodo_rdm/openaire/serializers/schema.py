@@ -4,18 +4,44 @@
 
 from urllib.parse import quote_plus
 
-from invenio_access.permissions import system_identity
-from invenio_communities.proxies import current_communities
 from marshmallow import Schema, fields, missing, pre_dump
 from zenodo_legacy.funders import FUNDER_ACRONYMS, FUNDER_ROR_TO_DOI
 
 from zenodo_rdm.openaire.utils import (
+    get_record_communities,
     get_resource_type_vocabulary,
     openaire_datasource_id,
     openaire_original_id,
+    openaire_type,
 )
 
 
+def add_openaire_types(data):
+    """Add the OpenAIRE types and the communities of a record to its data.
+
+    Reads the resource type vocabulary and the communities of the record once,
+    for the fields of ``OpenAIRESchema``. Returns ``None`` if the record has no
+    resource type. The returned ``_openaire_type`` is ``None`` for the records
+    that are not sent to OpenAIRE, which can be checked before dumping them.
+    """
+    resource_type = data.get("metadata", {}).get("resource_type", {}).get("id")
+    if not resource_type:
+        return None
+
+    oatype = get_resource_type_vocabulary(resource_type)
+    communities = get_record_communities(data)
+
+    # Oatype is a dictionary
+    data = {
+        **data,
+        "type": oatype["props"]["openaire_type"],
+        "resourceType": oatype["props"]["openaire_resourceType"],
+        "_communities": communities,
+    }
+    data["_openaire_type"] = openaire_type(data, communities=communities)
+    return data
+
+
 class OpenAIRESchema(Schema):
     """Schema for records in OpenAIRE-JSON.
 
@@ -52,18 +78,15 @@ class OpenAIRESchema(Schema):
     def add_oatypes(self, data, **kwargs):
         """Add oatype once to the record.
 
-        It is added on ``pre_dump`` since it requires the vocabulary to be read.
+        It is added on ``pre_dump`` since it requires the vocabulary to be read. The
+        record's communities and OpenAIRE type are computed once here as well, so
+        that the fields below don't read them again. Records already passed through
+        ``add_openaire_types`` are dumped as they are.
         """
-        resource_type = data.get("metadata", {}).get("resource_type", {}).get("id")
-        if not resource_type:
-            return missing
-
-        oatype = get_resource_type_vocabulary(resource_type)
-
-        # Oatype is a dictionary
-        data["type"] = oatype["props"]["openaire_type"]
-        data["resourceType"] = oatype["props"]["openaire_resourceType"]
-        return data
+        if "_openaire_type" in data:
+            return data
+        data = add_openaire_types(data)
+        return missing if data is None else data
 
     def get_type(self, obj):
         """Get OpenAIRE type."""
@@ -94,21 +117,19 @@ class OpenAIRESchema(Schema):
 
         if oatype:
             # ID value is stored in a tuple on position 1
-            return openaire_original_id(obj)[1]
+            return openaire_original_id(obj, oatype=obj["_openaire_type"])[1]
 
         return missing
 
     def get_datasource_id(self, obj):
         """Get OpenAIRE datasource identifier."""
-        return openaire_datasource_id(obj) or missing
+        return openaire_datasource_id(obj, oatype=obj["_openaire_type"]) or missing
 
     def get_communities(self, obj):
         """Get record's communities."""
         result = []
-        comm_service = current_communities.service
-        community_ids = obj.get("parent", {}).get("communities", {}).get("ids", [])
-        communities = comm_service.read_many(system_identity, community_ids)
-        for comm in communities:
+        # Read on ``pre_dump``
+        for comm in obj["_communities"]:
             result.append(comm["links"]["self_html"])
         return result or missing
 
@@ -2,19 +2,20 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """OpenAIRE celery tasks."""
 
-from datetime import datetime
 from functools import wraps
 
 from celery import shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
-from invenio_cache import current_cache
 from invenio_rdm_records.proxies import current_rdm_records_service as records_service
 from werkzeug.local import LocalProxy
 
 from .errors import OpenAIREInvalidRecordError, OpenAIRERequestError
+from .ledger import clear_failure, iter_due_failures, record_failure
+from .refeed import refeed_records
 from .serializers import OpenAIREV1Serializer
-from .utils import get_openaire_id, openaire_request_factory, openaire_type
+from .serializers.schema import add_openaire_types
+from .utils import get_openaire_id, openaire_request_factory
 
 is_openaire_enabled = LocalProxy(
     lambda: current_app.config["OPENAIRE_DIRECT_INDEXING_ENABLED"]
@@ -36,6 +37,11 @@ def execute_if_openaire_enabled():
     return decorator
 
 
+def _is_last_attempt(task, retry):
+    """Check if a failed task will not be retried anymore by Celery."""
+    return not retry or task.request.retries >= task.max_retries
+
+
 @shared_task(
     ignore_result=True,
     max_retries=6,
@@ -53,12 +59,13 @@ def openaire_direct_index(record_id, retry=True):
         record = records_service.read(system_identity, record_id)
 
         # Bail out if not an OpenAIRE record.
-        if not (openaire_type(record.data)):
+        data = add_openaire_types(record.data)
+        if not data or not data["_openaire_type"]:
             return
 
         # Serialize record for OpenAIRE indexing
         serializer = OpenAIREV1Serializer()
-        serialized_record = serializer.dump_obj(record.data)
+        serialized_record = serializer.dump_obj(data)
 
         # Build the request
         base_url = current_app.config["OPENAIRE_API_URL"]
@@ -87,10 +94,10 @@ def openaire_direct_index(record_id, retry=True):
                     extra=ctx,
                 )
 
-        current_cache.delete(f"openaire_direct_index:{record_id}")
+        clear_failure(record_id)
     except OpenAIREInvalidRecordError as exc:
-        # Deterministic rejection: don't retry, drop from the failures cache.
-        current_cache.delete(f"openaire_direct_index:{record_id}")
+        # Deterministic rejection: don't retry, drop from the failures ledger.
+        clear_failure(record_id)
         ctx = {"record_id": record_id, "status_code": exc.status_code}
         current_app.logger.warning(
             "OpenAIRE rejected record %(record_id)s for direct indexing (HTTP %(status_code)s).",
@@ -98,9 +105,9 @@ def openaire_direct_index(record_id, retry=True):
             extra={**ctx, "openaire_response": str(exc)},
         )
     except Exception as exc:
-        current_cache.set(
-            f"openaire_direct_index:{record_id}", datetime.now(), timeout=-1
-        )
+        # Celery retries first, the ledger takes over once it gives up
+        if _is_last_attempt(openaire_direct_index, retry):
+            record_failure(record_id, "index", error=exc)
         current_app.logger.exception(
             "OpenAIRE direct indexing failed for record %(record_id)s.",
             {"record_id": record_id},
@@ -149,13 +156,13 @@ def openaire_delete(record_id=None, retry=True):
                     extra=ctx,
                 )
 
-        # Remove from failures cache
-        current_cache.delete(f"openaire_direct_index:{record_id}")
+        # Remove from failures ledger
+        clear_failure(record_id)
 
     except Exception as exc:
-        current_cache.set(
-            f"openaire_direct_index:{record_id}", datetime.now(), timeout=-1
-        )
+        # Celery retries first, the ledger takes over once it gives up
+        if _is_last_attempt(openaire_delete, retry):
+            record_failure(record_id, "delete", error=exc)
         current_app.logger.exception(
             "OpenAIRE deletion failed for record %(record_id)s.",
             {"record_id": record_id},
@@ -170,15 +177,9 @@ def openaire_delete(record_id=None, retry=True):
 @shared_task
 @execute_if_openaire_enabled()
 def retry_openaire_failures():
-    """Retries failed OpenAIRE indexing/deletion operations."""
-    cache = current_cache.cache
-    failed_records = cache._write_client.scan_iter(
-        cache.key_prefix + "openaire_direct_index:*",
-        count=1000,
-    )
-    for key in failed_records:
+    """Retries the failed OpenAIRE indexing/deletion operations that are due."""
+    for record_id in iter_due_failures():
         try:
-            record_id = key.decode().split("openaire_direct_index:")[1]
             record = records_service.read(
                 system_identity, record_id, include_deleted=True
             )
@@ -189,9 +190,18 @@ def retry_openaire_failures():
                 openaire_delete.delay(record_id, retry=False)
             else:
                 openaire_direct_index.delay(record_id, retry=False)
-        except Exception:
+        except Exception as exc:
             # Keep going if one record fails, but log so it stays visible.
+            record_failure(record_id, error=exc)
             current_app.logger.exception(
-                "Could not reschedule OpenAIRE retry for cached failure."
+                "Could not reschedule OpenAIRE retry for record %(record_id)s.",
+                {"record_id": record_id},
+                extra={"record_id": record_id},
             )
-            continue
+
+
+@shared_task(ignore_result=True)
+@execute_if_openaire_enabled()
+def openaire_refeed(resume=True, batch_size=None, max_records=None):
+    """Re-feed all published records to OpenAIRE in bulk."""
+    return refeed_records(resume=resume, batch_size=batch_size, max_records=max_records)
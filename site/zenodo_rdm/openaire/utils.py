@@ -3,7 +3,9 @@
 """OpenAire related helpers."""
 
 import hashlib
+import time
 import urllib
+from functools import lru_cache
 
 from flask import current_app
 from invenio_access.permissions import system_identity
@@ -31,16 +33,45 @@ OA_SOFTWARE = "software"
 OA_OTHER = "other"
 
 
-def get_resource_type_vocabulary(resource_type):
-    """Returns the matching openaire type for the given resource type."""
-    vocab = vocab_service.read(
+def _read_resource_type_vocabulary(resource_type):
+    return vocab_service.read(
         system_identity, ("resourcetypes", resource_type), expand=True
     ).to_dict()
-    return vocab
 
 
-def openaire_type(record):
-    """Get the OpenAIRE type of a record."""
+@lru_cache(maxsize=256)
+def _cached_resource_type_vocabulary(resource_type, ttl_bucket):
+    # ``ttl_bucket`` changes every TTL period, expiring the cached entries
+    return _read_resource_type_vocabulary(resource_type)
+
+
+def get_resource_type_vocabulary(resource_type):
+    """Returns the matching openaire type for the given resource type.
+
+    Resource types rarely change, so they are cached in the process for
+    ``OPENAIRE_VOCABULARY_CACHE_TTL`` seconds. The returned dictionary is shared
+    and must not be modified.
+    """
+    ttl = current_app.config["OPENAIRE_VOCABULARY_CACHE_TTL"]
+    if not ttl:
+        return _read_resource_type_vocabulary(resource_type)
+    return _cached_resource_type_vocabulary(resource_type, int(time.monotonic() // ttl))
+
+
+def get_record_communities(record):
+    """Read the communities of a record."""
+    community_ids = record.get("parent", {}).get("communities", {}).get("ids", [])
+    if not community_ids:
+        return []
+    comm_service = current_communities.service
+    return list(comm_service.read_many(system_identity, community_ids))
+
+
+def openaire_type(record, communities=None):
+    """Get the OpenAIRE type of a record.
+
+    :param communities: The already read communities of the record, if available.
+    """
     metadata = record.get("metadata", {})
     resource_type = metadata.get("resource_type", {}).get("id")
     rt = get_resource_type_vocabulary(resource_type)
@@ -49,7 +80,7 @@ def openaire_type(record):
 
     oatype = rt["props"]["openaire_type"]
 
-    if is_openaire_publication(record, oatype):
+    if is_openaire_publication(record, oatype, communities=communities):
         return OA_PUBLICATION
     elif oatype == OA_DATASET:
         return OA_DATASET
@@ -61,7 +92,7 @@ def openaire_type(record):
     return None
 
 
-def is_openaire_publication(record, oatype):
+def is_openaire_publication(record, oatype, communities=None):
     """Determine if record is a publication for OpenAIRE.
 
     Is is a publication if, apart from the being a publication, one of the following criteria is met:
@@ -80,16 +111,9 @@ def is_openaire_publication(record, oatype):
     has_grants = record.get("metadata", {}).get("funding")
 
     # Compute communities to determine whether record belongs to "ecfunded" community.
-    comm_service = current_communities.service
-    community_ids = record.get("parent", {}).get("communities", {}).get("ids", [])
-    is_ecfunded = False
-
-    if community_ids:
-        communities = comm_service.read_many(system_identity, community_ids)
-        for comm in communities:
-            if comm["slug"] == "ecfunded":
-                is_ecfunded = True
-                break
+    if communities is None:
+        communities = get_record_communities(record)
+    is_ecfunded = any(comm["slug"] == "ecfunded" for comm in communities)
 
     is_open = rights["record"] == "public" and rights["files"] == "public"
     if has_grants or is_ecfunded or is_open:
@@ -98,9 +122,16 @@ def is_openaire_publication(record, oatype):
     return False
 
 
-def openaire_original_id(record):
-    """Original original identifier."""
-    oatype = openaire_type(record)
+_UNSET = object()
+
+
+def openaire_original_id(record, oatype=_UNSET):
+    """Original original identifier.
+
+    :param oatype: The already computed OpenAIRE type of the record, if available.
+    """
+    if oatype is _UNSET:
+        oatype = openaire_type(record)
     prefix = OPENAIRE_NAMESPACE_PREFIXES.get(oatype)
 
     value = None
@@ -113,9 +144,14 @@ def openaire_original_id(record):
     return prefix, value
 
 
-def openaire_datasource_id(record):
-    """Get OpenAIRE datasource identifier."""
-    return OPENAIRE_ZENODO_IDS.get(openaire_type(record))
+def openaire_datasource_id(record, oatype=_UNSET):
+    """Get OpenAIRE datasource identifier.
+
+    :param oatype: The already computed OpenAIRE type of the record, if available.
+    """
+    if oatype is _UNSET:
+        oatype = openaire_type(record)
+    return OPENAIRE_ZENODO_IDS.get(oatype)
 
 
 def get_openaire_id(record):
@@ -2,7 +2,11 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Sitemap sections for ZenodoRDM using invenio-sitemap."""
 
+from datetime import datetime, timezone
+
+from flask import current_app
 from invenio_base import invenio_url_for
+from invenio_cache import current_cache
 from invenio_communities.proxies import current_communities
 from invenio_rdm_records.proxies import current_rdm_records_service
 from invenio_search.api import RecordsSearchV2
@@ -10,19 +14,106 @@ from invenio_sitemap import SitemapSection, format_to_w3c
 
 
 class RecordsSection(SitemapSection):
-    """Defines the Sitemap entries for Records."""
+    """Defines the Sitemap entries for Records.
 
-    def iter_entities(self):
-        """Iterate over objects."""
+    Records are split into fixed-size shards of ``pid.pk`` ranges, which are kept in
+    the cache between builds. Each build only rescans the shards containing records
+    updated since the previous build. Shards are scanned and stored one at a time,
+    so that a build only holds the entries of a single shard in memory.
+    """
+
+    cache_prefix = "zenodo_sitemap_records"
+
+    @property
+    def _state_key(self):
+        return f"{self.cache_prefix}:state"
+
+    def _shard_key(self, shard):
+        return f"{self.cache_prefix}:shard:{shard}"
+
+    def _search(self):
+        return RecordsSearchV2(index=current_rdm_records_service.record_cls.index._name)
+
+    def _published_search(self):
         return (
-            RecordsSearchV2(index=current_rdm_records_service.record_cls.index._name)
+            self._search()
             .filter("term", **{"parent.is_verified": True})
             .filter("term", deletion_status="P")
-            .sort({"updated": "desc"})
-            .params(preserve_order=True)
+        )
+
+    def _scan_shard(self, shard_size, shard):
+        """Scan the sitemap entries of a shard, using an unordered scroll."""
+        pk_range = {"gte": shard * shard_size, "lt": (shard + 1) * shard_size}
+        search = (
+            self._published_search()
+            .filter("range", **{"pid.pk": pk_range})
             .source(["id", "updated"])
-            .scan()
         )
+        return [{"id": hit.id, "updated": hit.updated} for hit in search.scan()]
+
+    def _last_shard(self, shard_size):
+        """Get the shard of the highest ``pid.pk``, or ``None`` without records."""
+        search = self._published_search()
+        search.aggs.metric("max_pk", "max", field="pid.pk")
+        result = search[:0].execute().aggregations.to_dict()
+        max_pk = result.get("max_pk", {}).get("value")
+        return None if max_pk is None else int(max_pk) // shard_size
+
+    def _touched_shards(self, shard_size, since):
+        """Get the shards of the records updated (or deleted) since a date."""
+        search = (
+            self._search().filter("range", updated={"gte": since}).source(["pid.pk"])
+        )
+        return {hit.pid.pk // shard_size for hit in search.scan()}
+
+    def _update_shards(self):
+        """Rescan the outdated shards, returning the list of all shards."""
+        shard_size = current_app.config["ZENODO_SITEMAP_RECORDS_SHARD_SIZE"]
+        overlap = current_app.config["ZENODO_SITEMAP_RECORDS_HWM_OVERLAP"]
+        state = current_cache.get(self._state_key)
+        build_start = datetime.now(timezone.utc)
+
+        if state and state["shard_size"] == shard_size:
+            since = datetime.fromisoformat(state["hwm"]) - overlap
+            to_scan = sorted(self._touched_shards(shard_size, since.isoformat()))
+            shards = set(state["shards"])
+            previous_shards = set()
+        else:
+            last_shard = self._last_shard(shard_size)
+            to_scan = range(last_shard + 1) if last_shard is not None else []
+            shards = set()
+            # Shards of a previous shard size, removed once the build is done
+            previous_shards = set(state["shards"]) if state else set()
+
+        for shard in to_scan:
+            shard_entries = self._scan_shard(shard_size, shard)
+            if shard_entries:
+                current_cache.set(self._shard_key(shard), shard_entries, timeout=0)
+                shards.add(shard)
+            else:
+                current_cache.delete(self._shard_key(shard))
+                shards.discard(shard)
+
+        # The state is written last, so that an interrupted build is redone
+        shards = sorted(shards)
+        current_cache.set(
+            self._state_key,
+            {
+                "hwm": build_start.isoformat(),
+                "shard_size": shard_size,
+                "shards": shards,
+            },
+            timeout=0,
+        )
+        stale_shards = previous_shards.difference(shards)
+        if stale_shards:
+            current_cache.delete_many(*[self._shard_key(s) for s in stale_shards])
+        return shards
+
+    def iter_entities(self):
+        """Iterate over objects."""
+        for shard in self._update_shards():
+            yield from current_cache.get(self._shard_key(shard)) or []
 
     def to_dict(self, entity):
         """To dict used in sitemap."""
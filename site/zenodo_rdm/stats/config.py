@@ -7,6 +7,7 @@ STATS_PIWIK_EXPORTER = {
     "url": "https://analytics.openaire.eu/piwik.php",
     "token_auth": "api-token",
     "chunk_size": 50,  # [max piwik payload size = 64k] / [max querystring size = 750]
+    "max_in_flight": 4,  # chunks being sent while the next ones are built
 }
 
 STATS_PIWIK_EXPORT_ENABLED = False
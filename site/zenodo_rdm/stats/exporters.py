@@ -3,24 +3,35 @@
 """ZenodoRDM stats exporters."""
 
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode, urlsplit, urlunsplit
 
 import requests
 from dateutil.parser import parse as dateutil_parse
 from flask import current_app, url_for
 from invenio_cache import current_cache
-from invenio_pidstore.errors import PIDDeletedError
 from invenio_search import current_search_client
 from invenio_search.utils import build_alias_name
 from opensearch_dsl import Search
+from requests.adapters import HTTPAdapter
 
 from zenodo_rdm.stats.errors import PiwikExportRequestError
-from zenodo_rdm.stats.utils import chunkify, fetch_record
+from zenodo_rdm.stats.utils import chunkify, fetch_records
 
 
 class PiwikExporter:
     """Events exporter."""
 
+    RECORDS_CACHE_SIZE = 100_000
+    """Maximum number of resolved records kept between the chunks of a run."""
+
+    _PID_PLACEHOLDER = "0PIDVALUE0"
+
+    def __init__(self):
+        """Constructor."""
+        self._records_cache = {}
+
     def run(self, start_date=None, end_date=None, update_bookmark=True):
         """Run export job."""
         if start_date is None:
@@ -47,95 +58,164 @@ class PiwikExporter:
             .scan()
         )
 
-        url = current_app.config["STATS_PIWIK_EXPORTER"].get("url", None)
-        token_auth = current_app.config["STATS_PIWIK_EXPORTER"].get("token_auth", None)
-        chunk_size = current_app.config["STATS_PIWIK_EXPORTER"].get("chunk_size", 0)
+        self.export(events, update_bookmark=update_bookmark)
+
+    def export(self, events, update_bookmark=True):
+        """Export a stream of events, pipelining the requests to Piwik.
+
+        The chunks of events are built while up to ``max_in_flight`` previous chunks
+        are being sent. The responses are acknowledged in order, so the bookmark
+        only advances past chunks that were all accepted.
+        """
+        config = current_app.config["STATS_PIWIK_EXPORTER"]
+        url = config.get("url", None)
+        token_auth = config.get("token_auth", None)
+        chunk_size = config.get("chunk_size", 0)
+        max_in_flight = config.get("max_in_flight", 1) or 1
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_in_flight)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        in_flight = deque()
+        with session, ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            try:
+                for event_chunk in chunkify(events, chunk_size):
+                    query_strings = self._build_query_strings(event_chunk)
+
+                    # Check and bail if the bookmark has progressed, e.g. from
+                    # another duplicate task or manual run of the exporter.
+                    bookmark = current_cache.get("piwik_export:bookmark")
+                    if bookmark and event_chunk[-1].timestamp < bookmark:
+                        break
+
+                    payload = {"requests": query_strings, "token_auth": token_auth}
+                    future = executor.submit(self._post, session, url, payload)
+                    in_flight.append((event_chunk, future))
+
+                    # Acknowledge the finished chunks, waiting if the window is full
+                    while in_flight and (
+                        in_flight[0][1].done() or len(in_flight) >= max_in_flight
+                    ):
+                        self._acknowledge(*in_flight.popleft(), update_bookmark)
+
+                while in_flight:
+                    self._acknowledge(*in_flight.popleft(), update_bookmark)
+            finally:
+                # Don't send the chunks after a failed one
+                for _, future in in_flight:
+                    future.cancel()
+
+    @staticmethod
+    def _post(session, url, payload):
+        """Send a chunk, returning the response content if it succeeded."""
+        res = session.post(url, json=payload, timeout=60)
+
+        # Failure: not 200 or not "success"
+        content = res.json() if res.ok else None
+        if res.status_code == 200 and content.get("status") == "success":
+            return content
+        return None
+
+    def _acknowledge(self, event_chunk, future, update_bookmark):
+        """Handle the response of a chunk, advancing the bookmark past it."""
+        content = future.result()
+        if content is None:
+            msg = "Invalid events in Piwik export request."
+            info = {
+                "begin_event_timestamp": event_chunk[0].timestamp,
+                "end_event_timestamp": event_chunk[-1].timestamp,
+            }
+            raise PiwikExportRequestError(msg, export_info=info)
+
+        if content.get("invalid") != 0:
+            msg = "Invalid events in Piwik export request."
+            info = {
+                "begin_event_timestamp": event_chunk[0].timestamp,
+                "end_event_timestamp": event_chunk[-1].timestamp,
+                "invalid_events": content.get("invalid"),
+            }
+            current_app.logger.warning(msg, extra=info)
+        elif update_bookmark is True:
+            current_cache.set(
+                "piwik_export:bookmark", event_chunk[-1].timestamp, timeout=-1
+            )
 
-        for event_chunk in chunkify(events, chunk_size):
-            query_strings = []
-            for event in event_chunk:
-                if "recid" not in event:
-                    continue
-                try:
-                    query_string = self._build_query_string(event)
-                    query_strings.append(query_string)
-                except PIDDeletedError:
-                    pass
-
-            # Check and bail if the bookmark has progressed, e.g. from another
-            # duplicate task or manual run of the exporter.
-            bookmark = current_cache.get("piwik_export:bookmark")
-            if event_chunk[-1].timestamp < bookmark:
-                return
+    def _resolve_records(self, recids):
+        """Resolve the records of a chunk, reusing the ones of previous chunks."""
+        cache = self._records_cache
+        missing = {recid for recid in recids if recid not in cache}
+        if missing:
+            if len(cache) + len(missing) > self.RECORDS_CACHE_SIZE:
+                cache.clear()
+            records = fetch_records(missing)
+            # Deleted and missing records are cached as ``None`` and skipped
+            cache.update({recid: records.get(recid) for recid in missing})
+        return {recid: cache[recid] for recid in recids}
+
+    def _build_query_strings(self, events):
+        """Build the query strings of a chunk of events.
+
+        The records of the chunk are resolved at once, and the URLs are built in a
+        single request context from templates generated by ``url_for``.
+        """
+        events = [event for event in events if "recid" in event]
+        records = self._resolve_records({event.recid for event in events})
 
-            payload = {"requests": query_strings, "token_auth": token_auth}
-            res = requests.post(url, json=payload, timeout=60)
-
-            # Failure: not 200 or not "success"
-            content = res.json() if res.ok else None
-            if res.status_code == 200 and content.get("status") == "success":
-                if content.get("invalid") != 0:
-                    msg = "Invalid events in Piwik export request."
-                    info = {
-                        "begin_event_timestamp": event_chunk[0].timestamp,
-                        "end_event_timestamp": event_chunk[-1].timestamp,
-                        "invalid_events": content.get("invalid"),
-                    }
-                    current_app.logger.warning(msg, extra=info)
-                elif update_bookmark is True:
-                    current_cache.set(
-                        "piwik_export:bookmark", event_chunk[-1].timestamp, timeout=-1
-                    )
-            else:
-                msg = "Invalid events in Piwik export request."
-                info = {
-                    "begin_event_timestamp": event_chunk[0].timestamp,
-                    "end_event_timestamp": event_chunk[-1].timestamp,
-                }
-                raise PiwikExportRequestError(msg, export_info=info)
-
-    def _build_query_string(self, event):
         siteurl = current_app.config["SITE_UI_URL"]
+        id_site = current_app.config["STATS_PIWIK_EXPORTER"].get("id_site", None)
+        query_strings = []
         with current_app.test_request_context(base_url=siteurl):
-            id_site = current_app.config["STATS_PIWIK_EXPORTER"].get("id_site", None)
-            url = url_for(
+            record_url = url_for(
                 "invenio_app_rdm_records.record_detail",
-                pid_value=event.recid,
+                pid_value=self._PID_PLACEHOLDER,
                 scheme="https",
                 _external=True,
             )
-            visitor_id = event.visitor_id[0:16]
-            record = fetch_record(event.recid)
-            oai, action_name = record["oai_id"], record["title"]
-            cvar = json.dumps({"1": ["oaipmhID", oai]})
-            urlref = None
-            if event.referrer:
-                try:
-                    scheme, netloc, path, _, _ = urlsplit(event.referrer)
-                    urlref = urlunsplit((scheme, netloc, path, None, None))
-                except Exception:
-                    pass
-
-            params = dict(
-                idsite=id_site,
-                rec=1,
-                url=url,
-                _id=visitor_id,
-                cid=visitor_id,
-                cvar=cvar,
-                cdt=event.timestamp,
-                urlref=urlref,
-                action_name=action_name,
+            for event in events:
+                record = records.get(event.recid)
+                if record is None:
+                    continue
+                url = record_url.replace(self._PID_PLACEHOLDER, str(event.recid))
+                query_string = self._build_query_string(event, record, url, id_site)
+                query_strings.append(query_string)
+        return query_strings
+
+    def _build_query_string(self, event, record, url, id_site):
+        visitor_id = event.visitor_id[0:16]
+        oai, action_name = record["oai_id"], record["title"]
+        cvar = json.dumps({"1": ["oaipmhID", oai]})
+        urlref = None
+        if event.referrer:
+            try:
+                scheme, netloc, path, _, _ = urlsplit(event.referrer)
+                urlref = urlunsplit((scheme, netloc, path, None, None))
+            except Exception:
+                pass
+
+        params = dict(
+            idsite=id_site,
+            rec=1,
+            url=url,
+            _id=visitor_id,
+            cid=visitor_id,
+            cvar=cvar,
+            cdt=event.timestamp,
+            urlref=urlref,
+            action_name=action_name,
+        )
+
+        event_dict = event.to_dict()
+        if event_dict.get("country"):
+            params["country"] = event.country.lower()
+        if event_dict.get("file_key"):
+            # File keys need the quoting of the route converter, so no template
+            params["url"] = url_for(
+                "invenio_app_rdm_records.record_file_download",
+                pid_value=event.recid,
+                filename=event.file_key,
             )
+            params["download"] = params["url"]
 
-            if event.to_dict().get("country"):
-                params["country"] = event.country.lower()
-            if event.to_dict().get("file_key"):
-                params["url"] = url_for(
-                    "invenio_app_rdm_records.record_file_download",
-                    pid_value=event.recid,
-                    filename=event.file_key,
-                )
-                params["download"] = params["url"]
-
-            return "?{}".format(urlencode(params, "utf-8"))
+        return "?{}".format(urlencode(params, "utf-8"))
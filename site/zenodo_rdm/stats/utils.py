@@ -3,8 +3,9 @@
 """Statistics utilities."""
 
 import itertools
-from functools import lru_cache
 
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_rdm_records.proxies import current_rdm_records_service
 
 
@@ -18,11 +19,32 @@ def chunkify(iterable, n):
         yield chunk
 
 
-@lru_cache(maxsize=1024)
-def fetch_record(recid):
-    """Cached record fetch."""
-    record = current_rdm_records_service.record_cls.pid.resolve(recid)
+def fetch_records(recids):
+    """Fetch the OAI identifier and title of published records in one query.
+
+    Returns a dictionary of ``recid`` to ``{"oai_id", "title"}``. Records that are
+    deleted or that do not exist are left out.
+    """
+    model_cls = current_rdm_records_service.record_cls.model_cls
+    rows = (
+        db.session.query(
+            PersistentIdentifier.pid_value,
+            model_cls.json["oai"]["identifier"].as_string(),
+            model_cls.json["metadata"]["title"].as_string(),
+        )
+        .join(model_cls, PersistentIdentifier.object_uuid == model_cls.id)
+        .filter(
+            PersistentIdentifier.pid_type == "recid",
+            PersistentIdentifier.pid_value.in_(list(recids)),
+            PersistentIdentifier.object_type == "rec",
+            PersistentIdentifier.status == PIDStatus.REGISTERED,
+            model_cls.is_deleted.isnot(True),
+        )
+    )
     return {
-        "oai_id": record.get("oai", {}).get("identifier"),
-        "title": record.get("metadata", {}).get("title")[:150],  # max 150 characters
+        recid: {
+            "oai_id": oai_id,
+            "title": (title or "")[:150],  # max 150 characters
+        }
+        for recid, oai_id, title in rows
     }
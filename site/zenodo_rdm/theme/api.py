@@ -6,28 +6,25 @@
 from flask import current_app
 from flask_principal import AnonymousIdentity
 from invenio_access.permissions import any_user
-from invenio_cache import current_cache
 from invenio_communities.proxies import current_communities
 from invenio_rdm_records.proxies import current_rdm_records
 from invenio_rdm_records.resources.serializers import UIJSONSerializer
 from invenio_search.api import dsl
 
+from .cache import StaleWhileRevalidateCache
+
 
 def cache_key(name):
-    """Build a deploy-aware frontpage cache key."""
-    timestamp = current_app.config.get("IMAGE_BUILD_TIMESTAMP", "")
-    return f"frontpage:{timestamp}:{name}"
+    """Build a frontpage cache key."""
+    return f"frontpage:{name}"
 
 
-def recent_uploads(refresh_cache=False):
-    """Return cached recent upload records."""
-    key = cache_key("recent-uploads")
+def _build_version():
+    """Version of the cached values, so that they are refreshed after a deploy."""
+    return current_app.config.get("IMAGE_BUILD_TIMESTAMP", "")
 
-    if not refresh_cache:
-        records = current_cache.get(key)
-        if records is not None:
-            return records
 
+def _recent_uploads():
     identity = AnonymousIdentity()
     identity.provides.add(any_user)
     search_kwargs = {
@@ -48,25 +45,10 @@ def recent_uploads(refresh_cache=False):
     )
 
     serializer = UIJSONSerializer()
-    records = [serializer.dump_obj(record) for record in recent_records]
-
-    current_cache.set(
-        key,
-        records,
-        timeout=current_app.config["ZENODO_FRONTPAGE_CACHE_TIMEOUT"],
-    )
-    return records
+    return [serializer.dump_obj(record) for record in recent_records]
 
 
-def featured_communities(refresh_cache=False):
-    """Return cached featured communities."""
-    key = cache_key("featured-communities")
-
-    if not refresh_cache:
-        communities = current_cache.get(key)
-        if communities is not None:
-            return communities
-
+def _featured_communities():
     identity = AnonymousIdentity()
     identity.provides.add(any_user)
     communities = current_communities.service.featured_search(
@@ -74,11 +56,35 @@ def featured_communities(refresh_cache=False):
         params=None,
         search_preference=None,
     )
-    communities = list(communities)
+    return list(communities)
 
-    current_cache.set(
-        key,
-        communities,
-        timeout=current_app.config["ZENODO_FRONTPAGE_CACHE_TIMEOUT"],
-    )
-    return communities
+
+recent_uploads_cache = StaleWhileRevalidateCache(
+    cache_key("recent-uploads"),
+    _recent_uploads,
+    soft_timeout="ZENODO_FRONTPAGE_CACHE_SOFT_TIMEOUT",
+    hard_timeout="ZENODO_FRONTPAGE_CACHE_TIMEOUT",
+    version=_build_version,
+)
+
+featured_communities_cache = StaleWhileRevalidateCache(
+    cache_key("featured-communities"),
+    _featured_communities,
+    soft_timeout="ZENODO_FRONTPAGE_CACHE_SOFT_TIMEOUT",
+    hard_timeout="ZENODO_FRONTPAGE_CACHE_TIMEOUT",
+    version=_build_version,
+)
+
+
+def recent_uploads(refresh_cache=False):
+    """Return cached recent upload records."""
+    if refresh_cache:
+        return recent_uploads_cache.refresh()
+    return recent_uploads_cache.get()
+
+
+def featured_communities(refresh_cache=False):
+    """Return cached featured communities."""
+    if refresh_cache:
+        return featured_communities_cache.refresh()
+    return featured_communities_cache.get()
@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: 2025 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Stale-while-revalidate cache."""
+
+import time
+import uuid
+
+from flask import current_app
+from invenio_cache import current_cache
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+"""Delete the lock only if it still holds the token of the caller."""
+
+
+def _client():
+    cache = current_cache.cache
+    return cache._write_client, cache.key_prefix
+
+
+class StaleWhileRevalidateCache:
+    """Cache of a computed value, refreshed by a single worker.
+
+    A cached value is fresh for ``soft_timeout`` seconds. After that it is still
+    served, while one worker (the one taking the lock in Redis) recomputes it
+    in a background task, until it expires after ``hard_timeout`` seconds. A value
+    computed for another ``version``, e.g. before a deploy, is served as stale.
+
+    On a miss, only the worker holding the lock computes the value, and the others
+    wait up to ``wait_timeout`` seconds for it.
+
+    Timeouts can be given in seconds, or as the name of a config variable.
+    """
+
+    registry = {}
+    """Caches by name, for the background refresh task."""
+
+    def __init__(
+        self,
+        name,
+        compute,
+        soft_timeout,
+        hard_timeout,
+        version=None,
+        lock_timeout=60,
+        wait_timeout=5,
+    ):
+        """Constructor."""
+        self.name = name
+        self.compute = compute
+        self.version = version
+        self._soft_timeout = soft_timeout
+        self._hard_timeout = hard_timeout
+        self._lock_timeout = lock_timeout
+        self._wait_timeout = wait_timeout
+        self.registry[name] = self
+
+    @staticmethod
+    def _seconds(value):
+        return current_app.config[value] if isinstance(value, str) else value
+
+    @property
+    def key(self):
+        """Cache key of the value."""
+        return self.name
+
+    @property
+    def lock_key(self):
+        """Cache key of the refresh lock."""
+        return f"{self.name}:lock"
+
+    def _current_version(self):
+        return self.version() if self.version else None
+
+    def _is_fresh(self, entry):
+        return (
+            entry["version"] == self._current_version()
+            and time.time() < entry["fresh_until"]
+        )
+
+    def _acquire_lock(self):
+        """Take the refresh lock, returning its token or ``None`` if already taken.
+
+        The token is unique to the caller, so that a lock which expired and was
+        taken by another worker is not released by the previous holder.
+        """
+        client, prefix = _client()
+        token = uuid.uuid4().hex
+        acquired = client.set(
+            prefix + self.lock_key,
+            token,
+            nx=True,
+            ex=self._seconds(self._lock_timeout),
+        )
+        return token if acquired else None
+
+    def _release_lock(self, token):
+        """Release the refresh lock, if it is still held with ``token``."""
+        client, prefix = _client()
+        client.eval(_RELEASE_LOCK_SCRIPT, 1, prefix + self.lock_key, token)
+
+    def is_locked(self):
+        """Whether a worker is refreshing the value."""
+        client, prefix = _client()
+        return bool(client.exists(prefix + self.lock_key))
+
+    def _revalidate(self):
+        """Send the background refresh, if no other worker is refreshing."""
+        lock_token = self._acquire_lock()
+        if lock_token is None:
+            return
+        # Imported here since the tasks module imports the caches
+        from .tasks import refresh_cache
+
+        try:
+            refresh_cache.delay(self.name, lock_token=lock_token)
+        except Exception:
+            self._release_lock(lock_token)
+            current_app.logger.exception(
+                "Could not send the refresh of cache %(name)s.", {"name": self.name}
+            )
+
+    def refresh(self, lock_token=None):
+        """Compute and cache the value.
+
+        With ``lock_token``, the refresh lock taken with it is released once done.
+        Callers that did not acquire the lock, e.g. the warmup, leave it as is.
+        """
+        try:
+            value = self.compute()
+            entry = {
+                "value": value,
+                "version": self._current_version(),
+                "fresh_until": time.time() + self._seconds(self._soft_timeout),
+            }
+            timeout = self._seconds(self._hard_timeout)
+            current_cache.set(self.key, entry, timeout=timeout)
+            return value
+        finally:
+            if lock_token is not None:
+                self._release_lock(lock_token)
+
+    def _wait_for_value(self):
+        deadline = time.monotonic() + self._seconds(self._wait_timeout)
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            entry = current_cache.get(self.key)
+            if entry is not None:
+                return entry
+        return None
+
+    def get(self):
+        """Get the value, computing it only on a miss."""
+        entry = current_cache.get(self.key)
+        if entry is not None:
+            if not self._is_fresh(entry):
+                self._revalidate()
+            return entry["value"]
+
+        lock_token = self._acquire_lock()
+        if lock_token is not None:
+            return self.refresh(lock_token=lock_token)
+        entry = self._wait_for_value()
+        if entry is not None:
+            return entry["value"]
+        # The worker holding the lock is too slow, don't fail the request
+        return self.compute()
@@ -6,6 +6,7 @@
 from celery import shared_task
 
 from .api import featured_communities, recent_uploads
+from .cache import StaleWhileRevalidateCache
 
 
 @shared_task(ignore_result=True)
@@ -13,3 +14,10 @@ def warm_frontpage_cache():
     """Warm the frontpage data cache."""
     recent_uploads(refresh_cache=True)
     featured_communities(refresh_cache=True)
+
+
+@shared_task(ignore_result=True)
+def refresh_cache(name, lock_token=None):
+    """Refresh a stale-while-revalidate cache in the background."""
+    # The lock was acquired by the worker that sent the refresh
+    StaleWhileRevalidateCache.registry[name].refresh(lock_token=lock_token)